@@ -20,7 +20,9 @@ import numpy as np
 import io
 
 # Import project modules
-from core.unified_processor import get_processor, ProcessingStatus
+from core.unified_processor import ProcessingStatus
+from core.warmup import start_warmup
+from core.pacing import PACING_MODES
 from modules.logger import EventLogger
 from config import settings
 
@@ -251,6 +253,7 @@ def init_session_state():
         'video_path': None,
         'processing': False,
         'refresh_counter': 0,
+        'pacing_mode': settings.PACING_MODE,
         'preview_refresh_rate': 0.2  # 5 FPS preview (changed from 0.5)
     }
     
@@ -271,15 +274,30 @@ def initialize_logger():
 
 def initialize_processor():
     """Initialize unified video processor (Gold Standard Architecture)"""
+    if not st.session_state.logger_initialized:
+        initialize_logger()
+        st.session_state.logger_initialized = True
+    
     if st.session_state.processor is None:
-        # New UnifiedVideoProcessor handles all specialists internally
-        processor = get_processor()
-        st.session_state.processor = processor
-        st.session_state.detectors_loaded = True  # Always true with new architecture
-        
-        if not st.session_state.logger_initialized:
-            initialize_logger()
-            st.session_state.logger_initialized = True
+        # Models load + warm up on a background thread (shared by all sessions);
+        # the page renders a "models loading" state until they are ready
+        warmup = start_warmup()
+        if warmup.ready:
+            # New UnifiedVideoProcessor handles all specialists internally
+            st.session_state.processor = warmup.result
+            st.session_state.detectors_loaded = True
+        elif warmup.error:
+            st.error(f"Failed to load models: {warmup.error}")
+        else:
+            render_warmup_status()
+
+@st.fragment(run_every=1.0)
+def render_warmup_status():
+    """Poll the background warm-up without blocking the page (only this fragment reruns)"""
+    warmup = start_warmup()
+    if warmup.ready or warmup.error:
+        st.rerun()  # Whole app: picks up the processor (or shows the error)
+    st.info("⏳ Models loading... the dashboard is usable, processing starts once they are ready.")
 
 # ==================== DATA LOADING ====================
 def load_events():
@@ -360,6 +378,24 @@ def render_monitoring_tab():
                     st.success(f"✅ Video loaded: {uploaded_file.name}")
                     st.info(f"📊 Total Frames: {status.total_frames} | FPS: {status.fps:.1f}")
         
+        # Pacing
+        pacing_labels = {
+            "realtime": "Real-time (30 FPS)",
+            "source-fps": "Source FPS",
+            "max": "Max throughput (no throttling)"
+        }
+        pacing = st.selectbox(
+            "Processing Speed",
+            PACING_MODES,
+            index=PACING_MODES.index(st.session_state.pacing_mode),
+            format_func=lambda m: pacing_labels[m],
+            disabled=status.is_processing,
+            help="Use 'Max throughput' to re-analyse recorded footage as fast as the machine allows"
+        )
+        if pacing != st.session_state.pacing_mode and st.session_state.processor:
+            st.session_state.processor.set_pacing(pacing)
+            st.session_state.pacing_mode = pacing
+        
         # Controls
         col_btn1, col_btn2, col_btn3 = st.columns(3)
         
@@ -400,11 +436,17 @@ def render_monitoring_tab():
             with col1:
                 st.metric("Events", status.events_detected)
             with col2:
-                elapsed = time.time() - status.processing_time if status.processing_time > 0 else 0
-                st.metric("Elapsed", f"{elapsed:.1f}s")
+                st.metric("Elapsed", f"{status.processing_time:.1f}s")
             with col3:
                 remaining = (status.total_frames - status.current_frame) / max(status.fps, 1) if status.fps > 0 else 0
                 st.metric("Remaining", f"{remaining:.0f}s")
+            
+            if status.stage_latency:
+                with st.expander("⏱️ Pipeline Performance"):
+                    perf_df = pd.DataFrame(status.stage_latency).T[['p50_ms', 'p95_ms', 'p99_ms', 'count']]
+                    perf_df.columns = ['p50 (ms)', 'p95 (ms)', 'p99 (ms)', 'Samples']
+                    st.dataframe(perf_df, width='stretch')
+                    st.caption(f"Queue depths: {status.queue_depths} | Stage errors: {status.stage_errors}")
         
         preview_placeholder = st.empty()
         
@@ -653,6 +695,11 @@ def render_settings_tab():
         st.markdown(f"**Detectors**: {'✅ Loaded' if st.session_state.detectors_loaded else '❌ Not Loaded'}")
         st.markdown(f"**Logger**: {'✅ Active' if st.session_state.logger_initialized else '❌ Inactive'}")
         st.markdown(f"**Processor**: {'✅ Ready' if st.session_state.processor else '❌ Not Ready'}")
+        startup = start_warmup().report()
+        if startup["state"] == "ready":
+            st.markdown(f"**Startup**: models {startup['load_s']:.1f}s + warm-up {startup['warmup_s']:.1f}s")
+        else:
+            st.markdown(f"**Startup**: {startup['state']}")
         
         st.subheader("🗑️ Data Management")
         if st.button("Clear Event History", type="secondary"):
@@ -817,7 +864,7 @@ def main():
     with tab4:
         render_setup_tab()
     
-    # Auto-refresh
+    # Auto-refresh (the model warm-up is polled by render_warmup_status)
     if st.session_state.processing and st.session_state.processor:
         status = st.session_state.processor.get_status()
         if status.is_processing:
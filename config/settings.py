@@ -12,6 +12,137 @@ YOLO_MODEL_PATH = "yolo11n.pt"
 YOLO_CONF_THRESHOLD = 0.3      # Lowered from 0.5 to catch far objects
 YOLO_INFERENCE_SIZE = 1280     # Increased from default 640 to catch small/far objects
 
+# Model backends (core/model_backend.py): "torch", "onnx" or "openvino".
+# .pt weights are exported once and cached by weights hash; torch is the fallback.
+MODEL_BACKEND = "torch"
+MODEL_INT8 = False             # INT8 quantisation, calibrated on frames from MODEL_CALIBRATION_SOURCE
+MODEL_CALIBRATION_SOURCE = None  # Video path to sample calibration frames from
+MODEL_CALIBRATION_FRAMES = 64
+MODEL_AUTO_EXPORT = True       # Export on first load when no cached artefact exists
+MODEL_CACHE_DIR = os.path.join(DATA_DIR, "model_cache")
+BACKGROUND_WARMUP = True       # Load + warm up models in a background thread (core/warmup.py)
+
+# Tiled inference (core/tiling.py): instead of a full YOLO_INFERENCE_SIZE pass,
+# run the frame at near_size plus overlapping tiles over the far field at the
+# resolution a YOLO_INFERENCE_SIZE pass would give it (at YOLO_CONF_THRESHOLD).
+# Opt-in: it changes detection cost and results. Off, the base model runs one
+# 640 pass at conf 0.4.
+TILED_INFERENCE = False
+TILING = {
+    "far_field": (0.15, 0.2, 0.85, 0.55),  # Normalised x1, y1, x2, y2 (towards the horizon)
+    "tile_size": 640,
+    "overlap": 0.2,
+    "near_size": 640,
+    "merge_threshold": 0.6,                # Intersection-over-smaller for cross-tile NMS (same class only)
+}
+
+# Tracker (core/tracking.py): "deepsort" (CNN appearance embedding, CPU-heavy) or
+# "bytetrack" (vectorised Kalman + IoU, high/low-confidence two-stage matching).
+# Low-confidence matching only sees detections above YOLO_CONF_THRESHOLD.
+TRACKER = "deepsort"
+CAMERA_TRACKERS = {}           # camera_id -> tracker name, e.g. {"CAM_02": "bytetrack"}
+TRACKER_MAX_AGE = 30           # Frames a lost track is kept
+TRACKER_N_INIT = 3             # Consecutive hits before a track is confirmed
+
+# Vehicle registry (core/vehicle_registry.py): slot-indexed columns, grown x2 when full
+REGISTRY_CAPACITY = 256        # Initial vehicle slots
+TRAJECTORY_LENGTH = 30         # Centroids kept per vehicle (ring buffer read by specialists)
+
+# Registry rule engine (core/rules.py): only vehicles a specialist updated
+# (speed / wrong-way / emergency) or whose alert cooldown ran out are evaluated.
+# Highest priority first; a matching "override" rule suppresses lower ones.
+RULE_SPEED_LIMIT = 80          # km/h above which the registry flags a vehicle as overspeeding
+RULES = [
+    {"name": "emergency", "event": "EMERGENCY_VEHICLE", "severity": "CRITICAL",
+     "when": ["emergency"], "priority": 100, "override": True,
+     "description": "Priority: {emergency_type} detected. Allowing passage.",
+     "metadata": ["speed", "wrong_way", "track_id"]},
+    {"name": "wrong_way", "event": "WRONG_WAY", "severity": "CRITICAL",
+     "when": ["wrong_way"], "priority": 50,
+     "description": "Vehicle {track_id} wrong way in {lane}",
+     "metadata": ["track_id", "lane"]},
+    {"name": "overspeed", "event": "OVERSPEED", "severity": "WARNING",
+     "when": ["overspeeding"], "priority": 10,
+     "description": "Vehicle {track_id} Speeding: {speed:.1f} km/h",
+     "metadata": ["track_id", "speed"]},
+]
+
+# Pipeline (decode -> detect -> track -> analyze -> sink)
+PIPELINE_QUEUE_SIZE = 4        # Max packets buffered between two stages (backpressure)
+CHUNK_SEGMENT_TIMEOUT = 4 * 3600  # Seconds a parallel-analysis segment (main.py --workers) may run
+
+# Annotated-frame ring buffer read by previews and recorders (hard memory cap)
+FRAME_RING_MAX_MB = 64         # ~10 frames at 1080p
+FRAME_RING_SLOTS = 8           # Upper bound on frames kept (at least 2)
+
+# Checkpoint / resume of long runs (core/checkpoint.py, main.py --resume)
+CHECKPOINTS = True             # Periodically save processing state for main.py runs
+CHECKPOINT_INTERVAL = 900      # Frames between checkpoints (~30 s of 30 fps video)
+CHECKPOINT_DIR = os.path.join(DATA_DIR, "checkpoints")
+CHECKPOINT_PUBLISHED_SYNC = 1.0  # Min seconds between writes of the published-events mark (off the sink thread)
+
+# Pacing: "realtime" (30 fps), "source-fps" (CAP_PROP_FPS) or "max" (no throttling)
+PACING_MODE = "realtime"
+
+# Processing clock (core/clock.py): "video" = frame timestamps of the file,
+# "wall" = time.time(), "auto" = video for files, wall for cameras / streams.
+# Video time makes speeds, cooldowns and expiry independent of PACING_MODE.
+CLOCK_MODE = "auto"
+
+# Adaptive frame stride: when inference can't keep up with the pacing FPS,
+# run the base model every k-th frame and let the tracker predict the rest.
+# Opt-in: predicted frames change detection / event output.
+ADAPTIVE_STRIDE = False
+MAX_FRAME_STRIDE = 4
+
+# Motion gate (core/motion_gate.py): skip base detection on static / duplicate
+# frames and only age the tracks. Opt-in: gated frames also skip the
+# pixel-based specialists (emergency, ReID, pothole).
+MOTION_GATE = False
+MOTION_GATE_MIN_CHANGED = 0.0005  # Fraction of thumbnail pixels that must change to run detection
+MOTION_GATE_PIXEL_DELTA = 12   # Grey levels (0-255) for a 160px-wide thumbnail pixel to count as changed
+MOTION_GATE_MAX_SKIP = 10      # Run detection at least every N frames (kept below TRACKER_MAX_AGE)
+
+# Specialist scheduling (core/specialist_scheduler.py)
+# every_n: cadence in frames | budget_ms: amortised per-frame budget (0 = unlimited)
+# priority: higher runs first and is shed last under overload
+# needs_pixels: False = may also run on tracker-predicted frames
+SPECIALIST_POLICIES = {
+    "wrong_way": {"every_n": 1, "budget_ms": 0,  "priority": 100, "needs_pixels": False},
+    "speed":     {"every_n": 1, "budget_ms": 0,  "priority": 90,  "needs_pixels": False},
+    "emergency": {"every_n": 1, "budget_ms": 40, "priority": 80},
+    "reid":      {"every_n": 1, "budget_ms": 15, "priority": 30},
+    "pothole":   {"every_n": 5, "budget_ms": 30, "priority": 10},
+}
+SPECIALIST_SHED_BACKLOG = 2    # Shed low-priority specialists once this many frames wait for analysis
+
+# Process-pool execution of CPU-heavy specialists (escapes the GIL).
+# Listed specialists run in their own worker process; frames go through shared memory.
+# Workers see no registry state: trajectory readers (wrong_way) always stay in-process.
+# Frames are submitted ahead of analysis, up to PROCESS_POOL_SLOTS in flight.
+PROCESS_POOL_SPECIALISTS = []  # e.g. ["emergency", "reid", "pothole"]
+PROCESS_POOL_SLOTS = 2         # Shared-memory frame slots (= frames in flight)
+PROCESS_POOL_TIMEOUT = 10.0    # Seconds to wait for a worker's result before giving up on it
+PROCESS_POOL_START_METHOD = "spawn"
+
+# Micro-batched base inference (offline / throughput mode)
+BATCH_INFERENCE = False        # Run consecutive frames through the base model as one batch
+BASE_BATCH_SIZE = 8            # Frames per batch
+BASE_BATCH_MAX_WAIT = 0.05     # Seconds to wait for a batch to fill before running it
+
+# Region-of-interest inference (core/roi.py), per camera: "base" for the base
+# model, otherwise a specialist name (currently "pothole"). A region is a polygon
+# of normalised (x, y) vertices or "road" (RoadAnalytics lane area); models
+# without an entry see the full frame. "padding" / "mask" apply to the camera.
+ROI_REGIONS = {
+    # "CAM_01": {"base": [(0, 0.3), (1, 0.3), (1, 1), (0, 1)], "pothole": "road", "padding": 0.05},
+}
+
+# Multi-camera (StreamManager): one base model shared by all streams
+STREAM_MAX_BATCH = 16          # Max frames (across cameras) per shared inference call
+STREAM_MAX_WAIT = 0.01         # Seconds to wait for other cameras' frames before running
+INFERENCE_WORKERS = 1          # Threads serving the shared base model
+
 # Lane boundaries (x‑coordinates). Empty list means auto‑split into two equal lanes.
 LANE_BOUNDARIES = []  # e.g. [300, 600] for three‑lane road
 
@@ -4,9 +4,10 @@ Allows old test scripts to work with refactored specialists by providing
 a YOLO + Tracker layer that feeds into VehicleRegistry.
 """
 import cv2
-from ultralytics import YOLO
-from deep_sort_realtime.deepsort_tracker import DeepSort
 from core.vehicle_registry import VehicleRegistry
+from core.detection import VehicleDetector
+from core.model_registry import get_model
+from core.tracking import build_tracker
 from config import settings
 
 class StandaloneAdapter:
@@ -14,31 +15,37 @@ class StandaloneAdapter:
     Adapter that runs YOLO + Tracking for standalone specialist tests.
     Feeds results into VehicleRegistry so specialists can work unchanged.
     """
-    def __init__(self, model_path="yolo11n.pt"):
-        self.model = YOLO(model_path)
-        self.tracker = DeepSort(max_age=30, n_init=3)
+    def __init__(self, model_path="yolo11n.pt", tracker=None):
+        self.model = get_model(model_path)
+        self.tracker = build_tracker(tracker)  # None = settings.TRACKER
         self.registry = VehicleRegistry()
         self.vehicle_classes = [2, 3, 5, 7]  # car, motorcycle, bus, truck
+        self.detector = VehicleDetector(self.model, classes=self.vehicle_classes)
         
     def process_frame(self, frame):
         """
         Process frame through YOLO + Tracker, update Registry.
         Returns: (frame, tracks, registry)
         """
-        # Run YOLO
-        results = self.model(frame, classes=self.vehicle_classes, verbose=False, conf=0.4)[0]
-        
-        # Format detections for tracker
-        detections = []
-        for box in results.boxes:
-            x1, y1, x2, y2 = map(int, box.xyxy[0])
-            w, h = x2 - x1, y2 - y1
-            conf = float(box.conf[0])
-            cls = int(box.cls[0])
-            detections.append(([x1, y1, w, h], conf, cls))
-        
-        # Update tracker
-        tracks = self.tracker.update_tracks(detections, frame=frame)
+        return self.process_batch([frame])[0]
+    
+    def process_batch(self, frames):
+        """
+        Run YOLO once over a batch of consecutive frames, then feed the
+        per-frame detections to the tracker in order.
+        Returns: list of (frame, tracks, registry), one per input frame.
+        Tracks are TrackView snapshots since the tracker mutates its own
+        Track objects on every update.
+        """
+        outputs = []
+        for frame, detections in zip(frames, self.detector.detect_batch(frames)):
+            tracks = self._track(frame, detections)
+            outputs.append((frame, tracks, self.registry))
+        return outputs
+    
+    def _track(self, frame, detections):
+        # Update tracker (returns TrackView snapshots)
+        tracks = self.tracker.update(detections, frame=frame)
         
         # Update registry
         for track in tracks:
@@ -53,4 +60,4 @@ class StandaloneAdapter:
             # Update vehicle state in registry
             self.registry.update_vehicle(track_id, [x1, y1, w, h])
         
-        return frame, tracks, self.registry
+        return tracks
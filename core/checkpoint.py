@@ -0,0 +1,152 @@
+"""
+Checkpoint / Resume of Long Runs
+Every CHECKPOINT_INTERVAL frames the processor snapshots its running state:
+- frame index and event count
+- tracker state (BaseTracker.get_state: tracks with their Kalman state,
+  next id, appearance gallery)
+- VehicleRegistry columns (VehicleRegistry.get_state: live rows, trajectories)
+- specialist state (BaseSpecialist.get_state: speed timings, wrong-way
+  history, ReID gallery, ...)
+
+The tracker is snapshotted by the track stage and the rest by the analyze
+stage on the same frame, so the checkpoint is consistent even though the
+stages run concurrently. The sink writes it (atomically: temp file + rename)
+only after that frame's events were published, so a checkpoint never claims
+events that were not sent.
+
+Events published after the last checkpoint are tracked in a small sidecar
+file (highest frame with published events and the event count through it); on
+resume, frames up to that one are re-processed to rebuild state but their
+events are not published (or counted) again. The sidecar is written by a
+background thread, at most every CHECKPOINT_PUBLISHED_SYNC seconds and only
+with the latest mark, so the sink never waits on the disk; a crash may repeat
+the events of that last window.
+"""
+import hashlib
+import os
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from config import settings
+
+
+@dataclass
+class Checkpoint:
+    source: str
+    camera_id: str
+    frame_id: int                 # Last fully processed frame (resume decodes frame_id + 1)
+    saved_at: float = 0.0         # Wall clock; wall-clock timers are shifted by the downtime
+    clock_origin: Optional[float] = None  # Video-time origin (core/clock.py); kept on resume, no shift
+    events_detected: int = 0
+    tracker: Dict = field(default_factory=dict)
+    registry: Dict = field(default_factory=dict)
+    specialists: Dict[str, Dict] = field(default_factory=dict)
+
+
+def checkpoint_path(source: str, camera_id: str, directory: Optional[str] = None) -> str:
+    """One checkpoint file per (source, camera)."""
+    directory = directory or settings.CHECKPOINT_DIR
+    key = hashlib.sha1(os.path.abspath(source).encode()).hexdigest()[:10]
+    stem = os.path.splitext(os.path.basename(source))[0]
+    return os.path.join(directory, f"{camera_id}-{stem}-{key}.ckpt")
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class Checkpointer:
+    def __init__(self, path: str, interval: int = 900, sync_interval: Optional[float] = None):
+        self.path = path
+        self.interval = max(1, interval)
+        self.sync_interval = settings.CHECKPOINT_PUBLISHED_SYNC if sync_interval is None else sync_interval
+        self.saves = 0
+        self.last_save_seconds = 0.0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Published-events sidecar: latest mark, written by a background thread
+        self._marked: Optional[Tuple[int, int]] = None
+        self._mark_lock = threading.Lock()
+        self._io_lock = threading.Lock()  # Sidecar writes vs clear()
+        self._wake = threading.Event()
+        self._writer = None
+
+    @property
+    def published_path(self) -> str:
+        return f"{self.path}.published"
+
+    def due(self, frame_id: int) -> bool:
+        return frame_id % self.interval == 0
+
+    def save(self, checkpoint: Checkpoint):
+        start = time.perf_counter()
+        checkpoint.saved_at = time.time()
+        _atomic_write(self.path, pickle.dumps(checkpoint, protocol=pickle.HIGHEST_PROTOCOL))
+        self.saves += 1
+        self.last_save_seconds = time.perf_counter() - start
+
+    def load(self) -> Optional[Checkpoint]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                return pickle.load(f)
+        except Exception as e:
+            print(f"[ERROR] Checkpoint: could not read {self.path}: {e}")
+            return None
+
+    def mark_published(self, frame_id: int, events_detected: int):
+        """
+        Record that events up to frame_id (events_detected in total) have been
+        published. Never blocks on I/O: the background writer persists it.
+        """
+        with self._mark_lock:
+            self._marked = (frame_id, events_detected)
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="checkpoint-published", daemon=True)
+            self._writer.start()
+        self._wake.set()
+
+    def _write_loop(self):
+        while True:
+            self._wake.wait()
+            self._wake.clear()
+            self.flush()
+            time.sleep(self.sync_interval)  # Rate limit: later marks coalesce meanwhile
+
+    def flush(self):
+        """Write the latest published mark now (e.g. before exiting)."""
+        with self._io_lock:
+            with self._mark_lock:
+                marked, self._marked = self._marked, None
+            if marked is None:
+                return
+            try:
+                _atomic_write(self.published_path, f"{marked[0]} {marked[1]}".encode())
+            except OSError as e:
+                print(f"[ERROR] Checkpoint: could not write {self.published_path}: {e}")
+
+    def published(self) -> Tuple[int, Optional[int]]:
+        """(frame_id, events_detected) of the last persisted mark; (0, None) if none"""
+        try:
+            with open(self.published_path) as f:
+                fields = f.read().split()
+            return int(fields[0]), int(fields[1]) if len(fields) > 1 else None
+        except (OSError, ValueError, IndexError):
+            return 0, None
+
+    def clear(self):
+        """Drop the checkpoint (the run completed; nothing to resume)."""
+        with self._mark_lock:
+            self._marked = None
+        with self._io_lock:
+            for path in (self.path, self.published_path):
+                if os.path.exists(path):
+                    os.remove(path)
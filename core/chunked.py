@@ -0,0 +1,245 @@
+"""
+Parallel Chunked Analysis of a Single Video File
+For overnight re-analysis of long recordings: the file is split into time
+segments, each analysed by its own worker process (max pacing), and the
+events each segment published on its event bus (the rule events a
+single-process run publishes) are merged into one stream (written to
+events.jsonl by main.py through the usual EventLogger).
+
+Segment i owns frames [b_i, b_i+1) but starts decoding `overlap` frames
+earlier so its tracker and specialists are warmed up when it reaches b_i.
+That warm-up window is also covered by segment i-1, which lets us:
+- stitch tracks: local track IDs of segment i are matched to segment i-1's
+  global IDs by box IoU over the shared window
+- de-duplicate events: events in the warm-up window are dropped (segment i-1
+  owns them), as are repeats of an event for the same global track shortly
+  after the boundary
+"""
+import json
+import multiprocessing as mp
+import os
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+TRACK_ID_KEYS = ("track_id", "vehicle_id")
+
+
+@dataclass
+class SegmentResult:
+    index: int
+    start: int                      # First owned frame index (0-based)
+    end: int                        # One past the last owned frame index
+    events: List = field(default_factory=list)
+    # frame_id -> [(track_id, ltrb)] for the head and tail overlap windows
+    head_tracks: Dict[int, List[Tuple]] = field(default_factory=dict)
+    tail_tracks: Dict[int, List[Tuple]] = field(default_factory=dict)
+    error: Optional[str] = None     # Set when the segment failed or timed out (its events are missing)
+
+
+def plan_segments(total_frames: int, workers: int, overlap: int) -> List[Tuple[int, int, int]]:
+    """Split [0, total_frames) into (warmup_start, start, end) triples."""
+    workers = max(1, min(workers, total_frames // max(overlap * 2, 1) or 1))
+    bounds = np.linspace(0, total_frames, workers + 1).astype(int)
+    return [(max(0, int(bounds[i]) - overlap), int(bounds[i]), int(bounds[i + 1]))
+            for i in range(workers)]
+
+
+def _analyze_segment(job) -> SegmentResult:
+    """Worker process: run a full pipeline over one segment."""
+    index, source, camera_id, warmup_start, start, end, overlap, clock_origin, timeout, batch_size = job
+    from core.event_bus import bus
+    from core.unified_processor import UnifiedVideoProcessor
+
+    result = SegmentResult(index=index, start=start, end=end)
+    # Frame ids are 1-based: frame index i has id i + 1
+    head = range(warmup_start + 1, start + 1)
+    tail = range(max(start, end - overlap) + 1, end + 1)
+
+    def on_tracks(frame_id, tracks):
+        if frame_id in head or frame_id in tail:
+            boxes = [(t.track_id, tuple(t.to_ltrb())) for t in tracks if t.is_confirmed()]
+            (result.head_tracks if frame_id in head else result.tail_tracks)[frame_id] = boxes
+
+    # Only what the sink publishes (not every specialist event), as in a
+    # single-process run; this worker process has its own bus
+    bus.subscribe_all(result.events.append)
+
+    processor = UnifiedVideoProcessor(camera_id=camera_id, pacing="max", batch_size=batch_size)
+    processor.set_callbacks(track_callback=on_tracks)
+    if not processor.load_video(source, start_frame=warmup_start, end_frame=end):
+        result.error = f"could not open {source}"
+        print(f"[ERROR] Chunked: segment {index} {result.error}")
+        return result
+    # One timebase for all segments: video time then matches a single-process run
+    processor.frame_times.origin = clock_origin
+
+    print(f"[Chunked] Segment {index}: frames {start}-{end} (warm-up from {warmup_start})")
+    processor.start_processing()
+    if not processor.wait(timeout=timeout):
+        result.error = f"timed out after {timeout:.0f}s"
+        print(f"[ERROR] Chunked: segment {index} {result.error}")
+    processor.stop_processing()
+    return result
+
+
+def _iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of two (N, 4) / (M, 4) ltrb arrays."""
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-6)
+
+
+def match_tracks(previous: Dict[int, List[Tuple]], current: Dict[int, List[Tuple]],
+                 iou_threshold: float = 0.5) -> Dict:
+    """
+    Vote, frame by frame over the shared window, which track of the previous
+    segment each track of the current segment corresponds to.
+    Returns current_local_id -> previous_local_id.
+    """
+    votes = defaultdict(lambda: defaultdict(int))
+    for frame_id, cur_boxes in current.items():
+        prev_boxes = previous.get(frame_id)
+        if not prev_boxes or not cur_boxes:
+            continue
+        ious = _iou_matrix(np.array([b for _, b in cur_boxes], dtype=np.float32),
+                           np.array([b for _, b in prev_boxes], dtype=np.float32))
+        for i, (cur_id, _) in enumerate(cur_boxes):
+            j = int(np.argmax(ious[i]))
+            if ious[i, j] >= iou_threshold:
+                votes[cur_id][prev_boxes[j][0]] += 1
+
+    mapping, taken = {}, set()
+    # Most-confident pairs first so two tracks can't claim the same ID
+    ranked = sorted(((n, cur, prev) for cur, c in votes.items() for prev, n in c.items()), reverse=True)
+    for _, cur, prev in ranked:
+        if cur in mapping or prev in taken:
+            continue
+        mapping[cur] = prev
+        taken.add(prev)
+    return mapping
+
+
+def merge_segments(results: List[SegmentResult], overlap: int) -> List:
+    """Stitch track IDs across segment boundaries and de-duplicate events."""
+    results = sorted(results, key=lambda r: r.index)
+    next_global = 1
+    merged = []
+    previous_map: Dict = {}
+    previous = None
+
+    for result in results:
+        local_to_global = {}
+        if previous is not None:
+            for cur, prev in match_tracks(previous.tail_tracks, result.head_tracks).items():
+                if prev in previous_map:
+                    local_to_global[cur] = previous_map[prev]
+
+        def global_id(local):
+            nonlocal next_global
+            if local not in local_to_global:
+                local_to_global[local] = next_global
+                next_global += 1
+            return local_to_global[local]
+
+        # Events already emitted near the boundary, by (type, global track)
+        recent = {(e.event_type, _track_of(e)): e.metadata.get("frame_id", 0)
+                  for e in merged if _track_of(e) is not None
+                  and e.metadata.get("frame_id", 0) > result.start - overlap}
+
+        for event in sorted(result.events, key=lambda e: e.metadata.get("frame_id", 0)):
+            frame_id = event.metadata.get("frame_id", 0)
+            if not (result.start < frame_id <= result.end):
+                continue  # Warm-up window belongs to the previous segment
+
+            for key in TRACK_ID_KEYS:
+                if key in event.metadata:
+                    event.metadata[key] = global_id(event.metadata[key])
+
+            track = _track_of(event)
+            if track is not None and frame_id <= result.start + overlap \
+                    and (event.event_type, track) in recent:
+                continue  # Same alert already raised by the previous segment
+            merged.append(event)
+
+        # Tail tracks (for the next boundary) keyed by this segment's global IDs
+        for boxes in result.tail_tracks.values():
+            for local, _ in boxes:
+                global_id(local)
+        previous_map = local_to_global
+        previous = result
+
+    return merged
+
+
+def _track_of(event):
+    for key in TRACK_ID_KEYS:
+        if key in event.metadata:
+            return event.metadata[key]
+    return None
+
+
+def analyze_video_parallel(source: str, workers: int = None, overlap: int = 60,
+                           camera_id: str = "CAM_01", output_path: str = None,
+                           segment_timeout: float = None, batch_size: Optional[int] = None) -> List:
+    """
+    Analyse `source` with `workers` processes and return the merged events in
+    frame order. If `output_path` is given they are also appended there (JSONL).
+    batch_size: base-model micro-batch of each segment (None: settings default).
+    A segment that fails or exceeds `segment_timeout` seconds is reported and
+    merged without its (missing) events instead of blocking the merge.
+    """
+    from config import settings
+
+    segment_timeout = segment_timeout or settings.CHUNK_SEGMENT_TIMEOUT
+    cap = cv2.VideoCapture(source)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    if total_frames <= 0:
+        print(f"[ERROR] Chunked: could not determine frame count of {source}")
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    segments = plan_segments(total_frames, workers, overlap)
+    clock_origin = time.time()
+    jobs = [(i, source, camera_id, w, s, e, overlap, clock_origin, segment_timeout, batch_size)
+            for i, (w, s, e) in enumerate(segments)]
+    print(f"[Chunked] {total_frames} frames -> {len(jobs)} segments (overlap {overlap} frames)")
+
+    # Workers time out on their own; the extra margin covers a worker stuck
+    # outside the pipeline (model loading, shutdown). Leaving the block
+    # terminates any straggler.
+    deadline = time.time() + segment_timeout + 60
+    results = []
+    with mp.get_context("spawn").Pool(len(jobs)) as pool:
+        pending = [(job, pool.apply_async(_analyze_segment, (job,))) for job in jobs]
+        for job, pending_result in pending:
+            index, _, _, _, start, end = job[:6]
+            try:
+                results.append(pending_result.get(timeout=max(0.0, deadline - time.time())))
+            except Exception as e:
+                error = "timed out" if isinstance(e, mp.TimeoutError) else str(e)
+                print(f"[ERROR] Chunked: segment {index} {error}")
+                results.append(SegmentResult(index=index, start=start, end=end, error=error))
+
+    failed = [r.index for r in results if r.error]
+    if failed:
+        print(f"[ERROR] Chunked: {len(failed)} segment(s) incomplete {failed}; their events may be missing")
+
+    events = merge_segments(results, overlap)
+    if output_path:
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        with open(output_path, "a") as f:
+            for event in events:
+                f.write(json.dumps(event.to_dict()) + "\n")
+        print(f"[Chunked] Wrote {len(events)} events to {output_path}")
+    return events
@@ -0,0 +1,71 @@
+"""
+Processing Clock
+Everything that measures elapsed time during analysis (registry expiry and
+alert cooldowns, speed between the virtual-loop lines, wrong-way debounce,
+event timestamps) reads a Clock instead of time.time(), so a file processed
+at max pacing gives the same results as the same file played in real time.
+
+- Files ("video" mode): a frame's time is its position in the file
+  (CAP_PROP_POS_MSEC, or frame index / FPS when the backend reports no
+  position) plus the wall-clock time the file was opened, so timestamps
+  still read as epoch seconds.
+- Cameras / network streams ("wall" mode): time.time() at decode.
+
+Stages run concurrently, so the time travels with the FramePacket and the
+analyze stage advances the clock to it before running the registry and the
+specialists.
+"""
+import time
+from typing import Optional
+
+import cv2
+
+from config import settings
+
+LIVE_PREFIXES = ("rtsp://", "rtmp://", "http://", "https://", "udp://", "tcp://")
+
+
+def is_live(source) -> bool:
+    """Camera index or network stream (as opposed to a file)"""
+    return isinstance(source, int) or str(source).isdigit() or str(source).lower().startswith(LIVE_PREFIXES)
+
+
+def clock_mode(source, mode: Optional[str] = None) -> str:
+    """CLOCK_MODE resolved for a source: "video" or "wall" """
+    mode = mode or settings.CLOCK_MODE
+    if mode == "auto":
+        return "wall" if is_live(source) else "video"
+    return mode
+
+
+class Clock:
+    """Time of the frame being analysed (time.time() until first advanced)"""
+    def __init__(self, now: Optional[float] = None):
+        self._now = now
+
+    def now(self) -> float:
+        return time.time() if self._now is None else self._now
+
+    def advance(self, timestamp: float):
+        self._now = timestamp
+
+
+class FrameTimes:
+    """Timestamps of decoded frames (decode stage)"""
+    def __init__(self, mode: str = "wall", fps: float = 0.0, origin: Optional[float] = None):
+        self.mode = mode
+        self.fps = fps if fps and fps > 0 else 30.0
+        self.origin = time.time() if origin is None else origin  # Wall time of position 0 (video mode)
+
+    @property
+    def video(self) -> bool:
+        return self.mode == "video"
+
+    def stamp(self, cap, frame_id: int) -> float:
+        """Time of the frame just read / grabbed from cap (frame ids are 1-based)"""
+        if not self.video:
+            return time.time()
+        msec = cap.get(cv2.CAP_PROP_POS_MSEC)
+        if msec <= 0 and frame_id > 1:
+            msec = (frame_id - 1) * 1000.0 / self.fps
+        return self.origin + msec / 1000.0
@@ -0,0 +1,216 @@
+"""
+Base Vehicle Detection
+Thin layer over the base YOLO model shared by the unified processor and the
+standalone adapter. Accepts a list of frames so consecutive frames can be run
+through the model as one batch and fanned back out in order.
+SharedVehicleDetector lets several camera streams share one model and batch
+their requests together.
+Inputs are either raw frames or ModelInputs prepared by the frame's
+FrameContext (shared with the other models that run on the same frame).
+With tiling enabled a frame's input is a list of ModelInputs (low-res near
+field + high-res far-field tiles) whose boxes are merged per frame.
+"""
+import queue
+import threading
+import time
+from typing import List
+
+import numpy as np
+
+from config import settings
+from core.frame_context import ModelInput, run_model
+from core.tiling import TilingConfig, merge_boxes
+
+# COCO vehicle classes (2=Car, 3=Motorcycle, 5=Bus, 7=Truck)
+VEHICLE_CLASSES = [2, 3, 5, 7]
+
+
+def format_detections(result) -> List:
+    """Convert one YOLO result into tracker input: [[left, top, w, h], conf, detection_class]"""
+    detections = []
+    for box in result.boxes:
+        x1, y1, x2, y2 = map(int, box.xyxy[0])
+        w, h = x2 - x1, y2 - y1
+        conf = float(box.conf[0])
+        cls = int(box.cls[0])
+        detections.append([[x1, y1, w, h], conf, cls])
+    return detections
+
+
+def format_boxes(xyxy, confs, classes) -> List:
+    """Same as format_detections, for (xyxy, conf, cls) arrays from run_model()."""
+    detections = []
+    for (x1, y1, x2, y2), conf, cls in zip(xyxy.astype(int).tolist(), confs.tolist(), classes.tolist()):
+        detections.append([[x1, y1, x2 - x1, y2 - y1], conf, cls])
+    return detections
+
+
+class VehicleDetector:
+    """
+    Runs the base model over one or many frames.
+    Results are returned in the same order as the input frames.
+    """
+    def __init__(self, model, classes=None, conf=0.4, imgsz=640, tiling: TilingConfig = None):
+        self.model = model
+        self.classes = classes or VEHICLE_CLASSES
+        self.conf = conf
+        self.imgsz = imgsz
+        self.tiling = tiling
+
+    @classmethod
+    def from_settings(cls, model, **overrides) -> "VehicleDetector":
+        """
+        Detector configured from TILED_INFERENCE settings. Without tiling it
+        keeps the plain 640 / conf 0.4 pass; the YOLO_INFERENCE_SIZE and
+        YOLO_CONF_THRESHOLD far-field settings only apply through the tiles.
+        """
+        options = {}
+        if settings.TILED_INFERENCE:
+            options = dict(
+                conf=settings.YOLO_CONF_THRESHOLD,
+                imgsz=settings.YOLO_INFERENCE_SIZE,
+                tiling=TilingConfig(**settings.TILING),
+            )
+        options.update(overrides)
+        return cls(model, **options)
+
+    def prepare(self, context, box=None, mask=None):
+        """
+        Model input(s) for a frame (or a region of it), shared through its
+        FrameContext: one ModelInput at imgsz, or with tiling a list of a
+        low-res full pass plus high-res far-field tiles.
+        """
+        if not self.tiling:
+            return context.model_input(self.imgsz, box, mask)
+        inputs = [context.model_input(self.tiling.near_size, box, mask)]
+        for tile in self.tiling.tiles(context.shape, self.imgsz, box):
+            inputs.append(context.model_input(self.tiling.tile_size, tile))
+        return inputs
+
+    def detect_batch(self, frames) -> List[List]:
+        """frames: raw BGR frames, or per-frame ModelInput(s) from prepare()"""
+        if not frames:
+            return []
+        if isinstance(frames[0], (ModelInput, list)):
+            return self._detect_inputs(frames)
+        results = self.model(list(frames), classes=self.classes, verbose=False, conf=self.conf,
+                             imgsz=self.imgsz)
+        return [format_detections(r) for r in results]
+
+    def _detect_inputs(self, items) -> List[List]:
+        # Flatten every frame's inputs into one run (same-shape tiles batch together)
+        groups = [item if isinstance(item, list) else [item] for item in items]
+        flat = [model_input for group in groups for model_input in group]
+        outputs = run_model(self.model, flat, classes=self.classes, conf=self.conf)
+
+        detections, offset = [], 0
+        for group in groups:
+            parts = outputs[offset:offset + len(group)]
+            offset += len(group)
+            if len(parts) == 1:
+                detections.append(format_boxes(*parts[0]))
+                continue
+            xyxy = np.concatenate([p[0] for p in parts])
+            confs = np.concatenate([p[1] for p in parts])
+            classes = np.concatenate([p[2] for p in parts])
+            keep = merge_boxes(xyxy, confs, self.tiling.merge_threshold, classes)
+            detections.append(format_boxes(xyxy[keep], confs[keep], classes[keep]))
+        return detections
+
+    def detect(self, frame) -> List:
+        return self.detect_batch([frame])[0]
+
+
+class _InferenceRequest:
+    __slots__ = ("frames", "result", "error", "done")
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.result = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class SharedVehicleDetector:
+    """
+    One base model shared by many streams.
+    Callers block in detect_batch() while inference workers merge pending
+    requests from different cameras into a single model call (up to
+    max_batch frames, waiting at most max_wait seconds for more to arrive).
+    """
+    def __init__(self, detector: VehicleDetector, max_batch=16, max_wait=0.01, num_workers=1):
+        self.detector = detector
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.requests = queue.Queue()
+        self._stop = threading.Event()
+        self.workers = [
+            threading.Thread(target=self._worker, name=f"inference-{i}", daemon=True)
+            for i in range(max(1, num_workers))
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def prepare(self, context, box=None, mask=None) -> ModelInput:
+        return self.detector.prepare(context, box, mask)
+
+    def detect_batch(self, frames) -> List[List]:
+        if not frames:
+            return []
+        request = _InferenceRequest(list(frames))
+        self.requests.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def detect(self, frame) -> List:
+        return self.detect_batch([frame])[0]
+
+    def close(self):
+        self._stop.set()
+        for worker in self.workers:
+            worker.join(timeout=2)
+
+    def _collect(self):
+        try:
+            first = self.requests.get(timeout=0.1)
+        except queue.Empty:
+            return []
+
+        batch = [first]
+        count = len(first.frames)
+        deadline = time.time() + self.max_wait
+        while count < self.max_batch:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            count += len(request.frames)
+        return batch
+
+    def _worker(self):
+        while not self._stop.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+
+            frames = [f for request in batch for f in request.frames]
+            try:
+                results = self.detector.detect_batch(frames)
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+                    request.done.set()
+                continue
+
+            # Fan results back out to each caller, in order
+            offset = 0
+            for request in batch:
+                request.result = results[offset:offset + len(request.frames)]
+                offset += len(request.frames)
+                request.done.set()
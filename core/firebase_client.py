@@ -1,20 +1,19 @@
 """
 Firebase Firestore client for storing traffic safety events.
 """
+import importlib.util
 import logging
 import os
 from typing import Dict, Any, Optional
 
-# Firebase Admin SDK
-try:
-    import firebase_admin
-    from firebase_admin import credentials, firestore
-    FIREBASE_AVAILABLE = True
-except ImportError:
-    FIREBASE_AVAILABLE = False
+# Firebase Admin SDK (imported on initialize_firebase(): it is slow to import
+# and not needed until events are actually sent)
+FIREBASE_AVAILABLE = importlib.util.find_spec("firebase_admin") is not None
+if not FIREBASE_AVAILABLE:
     logging.warning(
         "firebase-admin not installed. Run: pip install firebase-admin"
     )
+firebase_admin = credentials = firestore = None
 
 from config import settings
 
@@ -27,7 +26,7 @@ _initialized = False
 
 def initialize_firebase():
     """Initialize Firebase client (call once at startup)."""
-    global _db, _initialized
+    global _db, _initialized, firebase_admin, credentials, firestore
     
     if _initialized:
         return
@@ -48,6 +47,9 @@ def initialize_firebase():
         return
     
     try:
+        import firebase_admin
+        from firebase_admin import credentials, firestore
+        
         # Initialize Firebase app (only once)
         if not firebase_admin._apps:
             cred = credentials.Certificate(firebase_creds)
@@ -0,0 +1,133 @@
+"""
+Shared Per-Frame Preprocessing
+Every model and colour analysis used to redo its own work on the same frame:
+each YOLO call letterboxed, normalised and tensorised its input, and the
+emergency and ReID specialists converted overlapping crops to HSV.
+
+A FrameContext is created once per decoded frame and travels with it through
+the pipeline. It computes, lazily and at most once per frame:
+- the HSV image (crops are views into it)
+- model inputs: letterboxed, normalised BCHW tensors per (size, region)
+and run_model() runs a YOLO model on such inputs and maps the boxes back to
+full-frame coordinates.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class ModelInput:
+    """A letterboxed, normalised (1, 3, H, W) tensor plus the mapping back to the frame."""
+    __slots__ = ("tensor", "scale", "pad", "offset")
+
+    def __init__(self, tensor, scale: float, pad: Tuple[int, int], offset: Tuple[int, int]):
+        self.tensor = tensor
+        self.scale = scale
+        self.pad = pad          # (left, top) padding added by the letterbox
+        self.offset = offset    # (x, y) of the region crop inside the frame
+
+    @property
+    def shape(self):
+        return tuple(self.tensor.shape[2:])
+
+    def to_frame(self, xyxy: np.ndarray) -> np.ndarray:
+        """Map (N, 4) boxes from tensor coordinates to full-frame coordinates."""
+        px, py = self.pad
+        ox, oy = self.offset
+        out = (xyxy - [px, py, px, py]) / self.scale
+        return out + [ox, oy, ox, oy]
+
+
+class FrameContext:
+    def __init__(self, frame: np.ndarray, frame_id: int = 0):
+        self.frame = frame
+        self.frame_id = frame_id
+        self._hsv = None
+        self._inputs: Dict[Tuple, ModelInput] = {}
+        self._masks: Dict[int, np.ndarray] = {}  # Masks keyed by id() in _inputs (kept alive: ids stay unique)
+
+    @property
+    def shape(self):
+        return self.frame.shape
+
+    # --- Colour ------------------------------------------------------------
+
+    @property
+    def hsv(self) -> np.ndarray:
+        """Whole-frame HSV, converted on first use."""
+        if self._hsv is None:
+            self._hsv = cv2.cvtColor(self.frame, cv2.COLOR_BGR2HSV)
+        return self._hsv
+
+    def crop(self, x1: int, y1: int, x2: int, y2: int) -> np.ndarray:
+        return self.frame[y1:y2, x1:x2]
+
+    def hsv_crop(self, x1: int, y1: int, x2: int, y2: int) -> np.ndarray:
+        return self.hsv[y1:y2, x1:x2]
+
+    # --- Model inputs ------------------------------------------------------
+
+    def model_input(self, size: int, box: Optional[Tuple[int, int, int, int]] = None,
+                    mask: Optional[np.ndarray] = None, stride: int = 32) -> ModelInput:
+        """
+        Letterbox the frame (or the `box` crop of it) so its long side is
+        `size`, padding the short side to a multiple of `stride`, and convert
+        it to a normalised RGB tensor. Cached per (size, box, stride, mask):
+        masks are compared by identity (each ROI builds its mask once).
+        """
+        key = (size, box, stride, None if mask is None else id(mask))
+        cached = self._inputs.get(key)
+        if cached is not None:
+            return cached
+
+        x1, y1 = (box[0], box[1]) if box else (0, 0)
+        image = self.crop(*box) if box else self.frame
+        if mask is not None:
+            image = cv2.bitwise_and(image, image, mask=mask)
+
+        h, w = image.shape[:2]
+        scale = min(size / h, size / w)
+        new_w, new_h = max(1, round(w * scale)), max(1, round(h * scale))
+        target_w = int(np.ceil(new_w / stride) * stride)
+        target_h = int(np.ceil(new_h / stride) * stride)
+        if (new_w, new_h) != (w, h):
+            image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+        left, top = (target_w - new_w) // 2, (target_h - new_h) // 2
+        image = cv2.copyMakeBorder(image, top, target_h - new_h - top, left, target_w - new_w - left,
+                                   cv2.BORDER_CONSTANT, value=(114, 114, 114))
+
+        import torch  # Only needed once a model actually runs
+        chw = np.ascontiguousarray(image[..., ::-1].transpose(2, 0, 1))  # BGR HWC -> RGB CHW
+        tensor = torch.from_numpy(chw).unsqueeze(0).float().div_(255.0)
+
+        model_input = ModelInput(tensor, scale, (left, top), (x1, y1))
+        self._inputs[key] = model_input
+        if mask is not None:
+            self._masks[id(mask)] = mask
+        return model_input
+
+
+def run_model(model, inputs: List[ModelInput], **kwargs) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Run a YOLO model on prepared inputs. Inputs of the same shape are stacked
+    into one batch. Returns, per input and in order, (xyxy, conf, cls) arrays
+    with boxes in full-frame coordinates.
+    """
+    import torch
+
+    outputs: List = [None] * len(inputs)
+    groups: Dict[Tuple, List[int]] = {}
+    for i, model_input in enumerate(inputs):
+        groups.setdefault(model_input.shape, []).append(i)
+
+    for indices in groups.values():
+        batch = torch.cat([inputs[i].tensor for i in indices])
+        results = model(batch, verbose=False, **kwargs)
+        for i, result in zip(indices, results):
+            boxes = result.boxes
+            xyxy = boxes.xyxy.cpu().numpy()
+            outputs[i] = (inputs[i].to_frame(xyxy) if len(xyxy) else xyxy.reshape(0, 4),
+                          boxes.conf.cpu().numpy(),
+                          boxes.cls.cpu().numpy().astype(int))
+    return outputs
@@ -0,0 +1,153 @@
+"""
+Shared-Memory Frame Ring Buffer
+Fixed-size, preallocated ring of annotated frames with sequence numbers, used
+instead of an unbounded-in-practice frame queue for previews and sinks.
+
+- Memory is capped: the ring holds at most `max_bytes` of frames (and at
+  least 2 slots), allocated once per frame shape.
+- The writer never blocks and never drops silently: the oldest slot is
+  overwritten and readers can see from the sequence numbers what they missed.
+- Readers get zero-copy views: `latest()` for previews, `since(seq)` for
+  recorders that want every frame. A view stays valid until the writer wraps
+  around to its slot; `is_valid(seq)` tells whether that has happened.
+- The buffer lives in shared memory, so another process can `attach()` to it
+  by name and read the same way.
+- Each frame can carry a small in-process payload (e.g. its deferred overlay
+  draw commands), returned by `meta(seq)`.
+
+Layout: [int64 seq per slot][frame slot 0][frame slot 1]...
+A slot's seq is set to -1 while it is being written (seqlock style).
+"""
+import atexit
+import threading
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+_SEQ_DTYPE = np.dtype(np.int64)
+
+
+class FrameRing:
+    def __init__(self, max_bytes: int, max_slots: int = 8):
+        self.max_bytes = max_bytes
+        self.max_slots = max(2, max_slots)
+        self.shape: Optional[Tuple[int, ...]] = None
+        self.dtype = np.dtype(np.uint8)
+        self.slots = 0
+        self.head = 0                       # Sequence number of the newest frame (0 = none yet)
+        self._shm: Optional[shared_memory.SharedMemory] = None
+        self._owner = True
+        self._seqs = None
+        self._frames = None
+        self._meta: List = []
+        self._lock = threading.Lock()
+        atexit.register(self.close)
+
+    # --- Allocation -------------------------------------------------------
+
+    def _allocate(self, shape, dtype):
+        self._release()
+        frame_bytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        self.slots = max(2, min(self.max_slots, self.max_bytes // max(frame_bytes, 1)))
+        self.shape, self.dtype = tuple(shape), np.dtype(dtype)
+        header = self.slots * _SEQ_DTYPE.itemsize
+        self._shm = shared_memory.SharedMemory(create=True, size=header + self.slots * frame_bytes)
+        self._map(header)
+        self._seqs[:] = 0
+        self._meta = [None] * self.slots
+        self.head = 0
+
+    def _map(self, header):
+        self._seqs = np.ndarray((self.slots,), dtype=_SEQ_DTYPE, buffer=self._shm.buf)
+        self._frames = np.ndarray((self.slots,) + self.shape, dtype=self.dtype,
+                                  buffer=self._shm.buf, offset=header)
+
+    @classmethod
+    def attach(cls, name: str, shape, slots: int, dtype=np.uint8) -> "FrameRing":
+        """Read-only view of a ring created by another process."""
+        ring = cls(max_bytes=0, max_slots=slots)
+        ring._owner = False
+        ring.shape, ring.dtype, ring.slots = tuple(shape), np.dtype(dtype), slots
+        ring._shm = shared_memory.SharedMemory(name=name)
+        ring._map(slots * _SEQ_DTYPE.itemsize)
+        ring.head = int(ring._seqs.max())
+        return ring
+
+    @property
+    def name(self) -> Optional[str]:
+        return self._shm.name if self._shm else None
+
+    @property
+    def nbytes(self) -> int:
+        return self._shm.size if self._shm else 0
+
+    # --- Writer -----------------------------------------------------------
+
+    def write(self, frame: np.ndarray, meta=None) -> int:
+        """Copy `frame` into the next slot and return its sequence number."""
+        with self._lock:
+            if self._frames is None or frame.shape != self.shape or frame.dtype != self.dtype:
+                self._allocate(frame.shape, frame.dtype)
+            seq = self.head + 1
+            slot = seq % self.slots
+            self._seqs[slot] = -1
+            self._frames[slot][...] = frame
+            self._meta[slot] = meta
+            self._seqs[slot] = seq
+            self.head = seq
+            return seq
+
+    # --- Readers ----------------------------------------------------------
+
+    def _refresh_head(self):
+        if not self._owner and self._seqs is not None:
+            self.head = int(self._seqs.max())
+
+    def latest(self) -> Tuple[int, Optional[np.ndarray]]:
+        """(seq, view) of the newest frame, or (0, None) if nothing was written yet."""
+        self._refresh_head()
+        seq = self.head
+        if seq == 0 or self._frames is None:
+            return 0, None
+        return seq, self._frames[seq % self.slots]
+
+    def since(self, seq: int) -> List[Tuple[int, np.ndarray]]:
+        """
+        Frames newer than `seq`, oldest first. Frames already overwritten are
+        skipped; the caller sees the gap in the returned sequence numbers.
+        """
+        self._refresh_head()
+        if self._frames is None:
+            return []
+        oldest = max(seq + 1, self.head - self.slots + 2, 1)  # Keep clear of the slot being written next
+        return [(s, self._frames[s % self.slots]) for s in range(oldest, self.head + 1)
+                if self._seqs[s % self.slots] == s]
+
+    def meta(self, seq: int):
+        """Payload written with frame `seq` (None if overwritten or attached)."""
+        if not self._meta or not self.is_valid(seq):
+            return None
+        return self._meta[seq % self.slots]
+
+    def is_valid(self, seq: int) -> bool:
+        """True while the frame with sequence `seq` has not been overwritten."""
+        return self._frames is not None and seq > 0 and self._seqs[seq % self.slots] == seq
+
+    # --- Lifetime ---------------------------------------------------------
+
+    def _release(self):
+        self._seqs = None
+        self._frames = None
+        if self._shm is not None:
+            try:
+                self._shm.close()
+            except BufferError:
+                pass  # A reader still holds a view; the mapping goes away with it
+            if self._owner:
+                self._shm.unlink()
+            self._shm = None
+
+    def close(self):
+        with self._lock:
+            self._release()
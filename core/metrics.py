@@ -0,0 +1,112 @@
+"""
+Pipeline Instrumentation
+Rolling FPS, per-stage latency percentiles and drop counters for the unified
+processor, so bottlenecks can be found on a production box without attaching
+a profiler.
+"""
+import threading
+import time
+from collections import deque, defaultdict
+from contextlib import contextmanager
+from typing import Dict
+
+
+def percentile(sorted_values, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * (len(sorted_values) - 1)))))
+    return sorted_values[k]
+
+
+class LatencyWindow:
+    """Last N latency samples (milliseconds) of one stage."""
+    def __init__(self, window: int = 300):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, seconds: float):
+        self.samples.append(seconds * 1000.0)
+        self.count += 1
+
+    def summary(self) -> Dict[str, float]:
+        values = sorted(self.samples)
+        return {
+            "p50_ms": round(percentile(values, 50), 2),
+            "p95_ms": round(percentile(values, 95), 2),
+            "p99_ms": round(percentile(values, 99), 2),
+            "mean_ms": round(sum(values) / len(values), 2) if values else 0.0,
+            "count": self.count,
+        }
+
+
+class RateMeter:
+    """Events per second over a sliding time window."""
+    def __init__(self, window_seconds: float = 5.0):
+        self.window_seconds = window_seconds
+        self.ticks = deque()
+
+    def tick(self, now: float = None):
+        now = now or time.time()
+        self.ticks.append(now)
+        while self.ticks and now - self.ticks[0] > self.window_seconds:
+            self.ticks.popleft()
+
+    def rate(self) -> float:
+        if len(self.ticks) < 2:
+            return 0.0
+        span = self.ticks[-1] - self.ticks[0]
+        return (len(self.ticks) - 1) / span if span > 0 else 0.0
+
+
+class PipelineMetrics:
+    """
+    Thread-safe collector shared by all pipeline stages.
+    Stage names are free-form, e.g. "decode", "base_inference",
+    "specialist.speed", "rule_engine", "dispatch".
+    """
+    def __init__(self, window: int = 300, fps_window_seconds: float = 5.0):
+        self._lock = threading.Lock()
+        self._window = window
+        self.latency: Dict[str, LatencyWindow] = {}
+        self.fps = RateMeter(fps_window_seconds)
+        self.counters: Dict[str, int] = defaultdict(int)
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            if stage not in self.latency:
+                self.latency[stage] = LatencyWindow(self._window)
+            self.latency[stage].add(seconds)
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def frame_done(self):
+        with self._lock:
+            self.fps.tick()
+
+    def count(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def current_fps(self) -> float:
+        with self._lock:
+            return self.fps.rate()
+
+    def stage_summary(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {stage: w.summary() for stage, w in self.latency.items()}
+
+    def snapshot(self) -> Dict:
+        """Machine-readable view of everything collected so far."""
+        with self._lock:
+            return {
+                "fps": round(self.fps.rate(), 2),
+                "stages": {stage: w.summary() for stage, w in self.latency.items()},
+                "counters": dict(self.counters),
+            }
@@ -0,0 +1,189 @@
+"""
+Model Backends
+All YOLO models load through load_model(), which can swap PyTorch eager
+execution for an optimised CPU runtime:
+- "torch":    ultralytics.YOLO(path) as before
+- "onnx":     ONNX Runtime (optionally INT8, static quantisation)
+- "openvino": OpenVINO IR (optionally INT8 via NNCF)
+
+Each .pt is exported once, with dynamic input shapes so tiles, crops and
+batches of any size still work. The artefact is cached under MODEL_CACHE_DIR,
+keyed by the weights' content hash, so retrained weights are re-exported
+automatically and stale exports of the same model are pruned. INT8
+calibration uses frames sampled from MODEL_CALIBRATION_SOURCE. Any failure
+(runtime not installed, export error) falls back to PyTorch.
+"""
+import hashlib
+import os
+import shutil
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from config import settings
+
+BACKENDS = ("torch", "onnx", "openvino")
+
+_hash_cache: Dict[Tuple[str, float, int], str] = {}
+
+
+def weights_hash(path: str) -> str:
+    """SHA-256 of a weights file (memoised on path, mtime and size)."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+    if key not in _hash_cache:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        _hash_cache[key] = digest.hexdigest()
+    return _hash_cache[key]
+
+
+def artefact_path(path: str, backend: str, int8: bool, cache_dir: Optional[str] = None) -> str:
+    """Cache location of the exported model for these weights."""
+    cache_dir = cache_dir or settings.MODEL_CACHE_DIR
+    stem = os.path.splitext(os.path.basename(path))[0]
+    suffix = "-int8" if int8 else ""
+    name = f"{stem}-{weights_hash(path)[:12]}{suffix}"
+    if backend == "onnx":
+        return os.path.join(cache_dir, "onnx", f"{name}.onnx")
+    return os.path.join(cache_dir, "openvino", f"{name}_openvino_model")
+
+
+def _prune_stale(path: str, current: str):
+    """Remove exports of the same model made from older weights."""
+    folder = os.path.dirname(current)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    current_hash = weights_hash(path)[:12]
+    for entry in os.listdir(folder):
+        full = os.path.join(folder, entry)
+        if full == current or not entry.startswith(f"{stem}-"):
+            continue
+        # Only prune entries that look like ours: <stem>-<12 hex>[...], other hash
+        tag = entry[len(stem) + 1:len(stem) + 13]
+        if tag != current_hash and len(tag) == 12 and all(c in "0123456789abcdef" for c in tag):
+            if os.path.isdir(full):
+                shutil.rmtree(full, ignore_errors=True)
+            else:
+                os.remove(full)
+
+
+def sample_frames(source: str, count: int) -> List[np.ndarray]:
+    """`count` frames spread evenly over a video (for INT8 calibration / benchmarks)."""
+    cap = cv2.VideoCapture(source)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    frames = []
+    for index in np.linspace(0, max(total - 1, 0), count).astype(int):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, int(index))
+        ret, frame = cap.read()
+        if ret:
+            frames.append(frame)
+    cap.release()
+    return frames
+
+
+def _calibration_dataset(model, frames: List[np.ndarray], folder: str) -> str:
+    """Write frames as an image-only YOLO dataset; returns its data.yaml."""
+    import yaml
+
+    images = os.path.join(folder, "images")
+    os.makedirs(images, exist_ok=True)
+    for i, frame in enumerate(frames):
+        cv2.imwrite(os.path.join(images, f"{i:04d}.jpg"), frame)
+    data_yaml = os.path.join(folder, "data.yaml")
+    with open(data_yaml, "w") as f:
+        yaml.dump({"path": folder, "train": "images", "val": "images", "names": dict(model.names)}, f)
+    return data_yaml
+
+
+def _quantize_onnx(fp32_path: str, int8_path: str, frames: List[np.ndarray], imgsz: int):
+    """Static INT8 quantisation of an ONNX model, calibrated on letterboxed frames."""
+    import onnxruntime as ort
+    from onnxruntime.quantization import CalibrationDataReader, QuantFormat, QuantType, quantize_static
+    from core.frame_context import FrameContext
+
+    input_name = ort.InferenceSession(fp32_path, providers=["CPUExecutionProvider"]).get_inputs()[0].name
+
+    class _Reader(CalibrationDataReader):
+        def __init__(self):
+            self._batches = iter(
+                {input_name: FrameContext(frame).model_input(imgsz).tensor.numpy()} for frame in frames
+            )
+
+        def get_next(self):
+            return next(self._batches, None)
+
+    quantize_static(fp32_path, int8_path, _Reader(), quant_format=QuantFormat.QDQ,
+                    activation_type=QuantType.QUInt8, weight_type=QuantType.QInt8)
+
+
+def export_model(path: str, backend: str, int8: bool = False,
+                 calibration_frames: Optional[List[np.ndarray]] = None, imgsz: int = 640) -> str:
+    """Export `path` to `backend` into the cache (if not already there). Returns the artefact path."""
+    from ultralytics import YOLO
+
+    target = artefact_path(path, backend, int8)
+    if os.path.exists(target):
+        return target
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    if int8 and not calibration_frames:
+        raise ValueError("INT8 export needs calibration frames (set MODEL_CALIBRATION_SOURCE)")
+
+    print(f"[ModelBackend] Exporting {path} -> {backend}{' INT8' if int8 else ''} (one-off)...")
+    model = YOLO(path)
+    work_dir = target + ".tmp"
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        if backend == "onnx":
+            exported = model.export(format="onnx", dynamic=True, imgsz=imgsz)
+            if int8:
+                _quantize_onnx(exported, target, calibration_frames, imgsz)
+                os.remove(exported)
+            else:
+                shutil.move(exported, target)
+        else:
+            options = {}
+            if int8:
+                options = {"int8": True, "data": _calibration_dataset(model, calibration_frames, work_dir)}
+            exported = model.export(format="openvino", dynamic=True, imgsz=imgsz, **options)
+            shutil.move(exported, target)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    _prune_stale(path, target)
+    return target
+
+
+def load_model(path: str, backend: Optional[str] = None, int8: Optional[bool] = None,
+               task: str = "detect"):
+    """
+    Load a YOLO model on the configured backend (MODEL_BACKEND / MODEL_INT8),
+    exporting it first if needed. Falls back to PyTorch on any failure.
+    """
+    from ultralytics import YOLO
+
+    backend = backend or settings.MODEL_BACKEND
+    int8 = settings.MODEL_INT8 if int8 is None else int8
+    if backend == "torch" or not path.endswith(".pt") or not os.path.exists(path):
+        return YOLO(path)
+    if backend not in BACKENDS:
+        print(f"[ERROR] ModelBackend: unknown backend '{backend}', using torch")
+        return YOLO(path)
+
+    try:
+        target = artefact_path(path, backend, int8)
+        if not os.path.exists(target):
+            if not settings.MODEL_AUTO_EXPORT:
+                print(f"[ModelBackend] No {backend} export for {path}; using torch")
+                return YOLO(path)
+            frames = None
+            if int8 and settings.MODEL_CALIBRATION_SOURCE:
+                frames = sample_frames(settings.MODEL_CALIBRATION_SOURCE, settings.MODEL_CALIBRATION_FRAMES)
+            target = export_model(path, backend, int8, frames)
+        print(f"[ModelBackend] {os.path.basename(path)} -> {backend}{' INT8' if int8 else ''}")
+        return YOLO(target, task=task)
+    except Exception as e:
+        print(f"[ERROR] ModelBackend: {backend} unavailable for {path} ({e}); using torch")
+        return YOLO(path)
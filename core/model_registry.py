@@ -0,0 +1,126 @@
+"""
+Process-wide Model Registry
+Every weights file is loaded once per process (on first use, through the
+configured backend) and the same instance is handed to every consumer: the
+base detector, specialists that fall back to the base weights, adapters and
+legacy wrappers.
+
+Ultralytics predictors are not thread-safe, so a shared model serialises
+calls with its own lock (cross-camera batching of the base model happens one
+level up, in SharedVehicleDetector).
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config import settings
+from core.model_backend import load_model
+
+
+class SharedModel:
+    """One loaded model shared by many callers; calls are serialised."""
+    def __init__(self, key: Tuple, path: str, backend: str, model, load_seconds: float):
+        self.key = key
+        self.path = path
+        self.backend = backend
+        self.model = model
+        self.load_seconds = load_seconds
+        self.calls = 0
+        self.warm = False
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            return self.model(*args, **kwargs)
+
+    def predict(self, *args, **kwargs):
+        with self._lock:
+            self.calls += 1
+            return self.model.predict(*args, **kwargs)
+
+    def __getattr__(self, name):
+        # names, task, export(), ... of the underlying YOLO object
+        return getattr(self.model, name)
+
+    def memory_bytes(self) -> int:
+        """Parameter + buffer bytes for PyTorch models, artefact size for exported ones."""
+        module = getattr(self.model, "model", None)
+        if hasattr(module, "parameters"):
+            tensors = list(module.parameters()) + list(module.buffers())
+            return sum(t.numel() * t.element_size() for t in tensors)
+        source = getattr(self.model, "ckpt_path", None) or self.path
+        if os.path.isdir(source):
+            return sum(os.path.getsize(os.path.join(root, f))
+                       for root, _, files in os.walk(source) for f in files)
+        return os.path.getsize(source) if os.path.exists(source) else 0
+
+
+class ModelRegistry:
+    def __init__(self):
+        self._models: Dict[Tuple, SharedModel] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: str, backend: Optional[str] = None, int8: Optional[bool] = None,
+            task: str = "detect") -> SharedModel:
+        """The shared instance of `path`, loading it on first use."""
+        backend = backend or settings.MODEL_BACKEND
+        int8 = settings.MODEL_INT8 if int8 is None else int8
+        key = (os.path.abspath(path) if os.path.exists(path) else path, backend, int8)
+        with self._lock:
+            if key not in self._models:
+                start = time.perf_counter()
+                model = load_model(path, backend=backend, int8=int8, task=task)
+                self._models[key] = SharedModel(key, path, backend, model, time.perf_counter() - start)
+                print(f"[ModelRegistry] Loaded {path} ({backend}{', int8' if int8 else ''})")
+            return self._models[key]
+
+    def warm_up(self, imgsz: int = 640) -> float:
+        """
+        One dummy inference through every loaded model that has not run yet
+        (first calls pay for predictor setup, graph compilation and memory
+        allocation). Returns the seconds spent.
+        """
+        import numpy as np
+
+        with self._lock:
+            models = [m for m in self._models.values() if not m.warm]
+        start = time.perf_counter()
+        dummy = np.zeros((imgsz, imgsz, 3), dtype=np.uint8)
+        for model in models:
+            try:
+                model(dummy, verbose=False)
+            except Exception as e:
+                print(f"[ERROR] ModelRegistry: warm-up of {model.path} failed: {e}")
+            model.warm = True
+        return time.perf_counter() - start
+
+    def report(self) -> List[Dict]:
+        """Loaded models with backend, memory footprint, load time and call count."""
+        with self._lock:
+            models = list(self._models.values())
+        return [{
+            "path": m.path,
+            "backend": m.backend,
+            "int8": m.key[2],
+            "memory_mb": round(m.memory_bytes() / (1024 * 1024), 1),
+            "load_seconds": round(m.load_seconds, 2),
+            "calls": m.calls,
+        } for m in models]
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+
+_registry = ModelRegistry()
+
+
+def get_model_registry() -> ModelRegistry:
+    return _registry
+
+
+def get_model(path: str, **kwargs) -> SharedModel:
+    """Shorthand for get_model_registry().get(path, ...)"""
+    return _registry.get(path, **kwargs)
@@ -0,0 +1,89 @@
+"""
+Deferred Overlay Rendering
+Specialists describe what they want drawn (boxes, labels, lines, trajectories)
+as lightweight draw commands instead of calling cv2 on the live frame. The
+commands travel with the frame and are rendered only when a consumer (the
+dashboard preview, an output video) asks for an annotated frame, so headless
+runs pay nothing for visualisation.
+
+Commands are plain tuples, so they pickle cheaply out of worker processes.
+"""
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+
+
+class Overlay:
+    def __init__(self, commands: Optional[List[Tuple]] = None):
+        self.commands: List[Tuple] = commands if commands is not None else []
+        self._target = None
+
+    @classmethod
+    def immediate(cls, frame) -> "Overlay":
+        """
+        Overlay that draws straight onto `frame` (standalone specialist use,
+        where there is no renderer downstream).
+        """
+        overlay = cls()
+        overlay._target = frame
+        return overlay
+
+    def _add(self, command: Tuple):
+        if self._target is not None:
+            _draw(self._target, command)
+        else:
+            self.commands.append(command)
+
+    # --- Primitives -------------------------------------------------------
+
+    def rect(self, p1, p2, color, thickness: int = 2):
+        self._add(("rect", tuple(map(int, p1)), tuple(map(int, p2)), color, thickness))
+
+    def text(self, text: str, org, color, scale: float = 0.6, thickness: int = 2):
+        self._add(("text", text, tuple(map(int, org)), color, scale, thickness))
+
+    def line(self, p1, p2, color, thickness: int = 2):
+        self._add(("line", tuple(map(int, p1)), tuple(map(int, p2)), color, thickness))
+
+    def polyline(self, points, color, thickness: int = 2, closed: bool = False):
+        self._add(("polyline", [tuple(map(int, p)) for p in points], color, thickness, closed))
+
+    def extend(self, commands: List[Tuple]):
+        for command in commands:
+            self._add(command)
+
+    def __len__(self):
+        return len(self.commands)
+
+    def render(self, frame):
+        """Draw all recorded commands onto `frame` (in place) and return it."""
+        for command in self.commands:
+            _draw(frame, command)
+        return frame
+
+
+def _draw(frame, command: Tuple):
+    kind = command[0]
+    if kind == "rect":
+        _, p1, p2, color, thickness = command
+        cv2.rectangle(frame, p1, p2, color, thickness)
+    elif kind == "text":
+        _, text, org, color, scale, thickness = command
+        cv2.putText(frame, text, org, FONT, scale, color, thickness)
+    elif kind == "line":
+        _, p1, p2, color, thickness = command
+        cv2.line(frame, p1, p2, color, thickness)
+    elif kind == "polyline":
+        _, points, color, thickness, closed = command
+        cv2.polylines(frame, [np.array(points, dtype=np.int32)], closed, color, thickness)
+
+
+def render(frame, commands: List[Tuple]):
+    """Draw `commands` onto a copy of `frame`; the source frame is left untouched."""
+    annotated = frame.copy()
+    for command in commands:
+        _draw(annotated, command)
+    return annotated
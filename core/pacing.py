@@ -0,0 +1,51 @@
+"""
+Pacing Policies
+Decides how fast the decode stage pulls frames from the source.
+- realtime:   fixed 30 fps (live preview behaviour)
+- source-fps: the source's own frame rate (CAP_PROP_FPS)
+- max:        no throttling, for batch re-analysis of recorded video
+"""
+import time
+from typing import Optional
+
+PACING_MODES = ("realtime", "source-fps", "max")
+REALTIME_FPS = 30.0
+
+
+class Pacer:
+    def __init__(self, mode: str = "realtime", source_fps: Optional[float] = None):
+        if mode not in PACING_MODES:
+            raise ValueError(f"Unknown pacing mode '{mode}'. Expected one of {PACING_MODES}")
+        self.mode = mode
+        self.source_fps = source_fps
+        self._next_time = None
+
+    @property
+    def target_fps(self) -> Optional[float]:
+        """Frames per second we aim for, or None when unthrottled."""
+        if self.mode == "realtime":
+            return REALTIME_FPS
+        if self.mode == "source-fps":
+            # Some containers report 0 / NaN; fall back to realtime
+            if self.source_fps and self.source_fps == self.source_fps and self.source_fps > 0:
+                return float(self.source_fps)
+            return REALTIME_FPS
+        return None
+
+    def wait(self):
+        """Sleep until the next frame slot is due."""
+        fps = self.target_fps
+        if fps is None:
+            return
+
+        interval = 1.0 / fps
+        now = time.time()
+        if self._next_time is None or now - self._next_time > interval:
+            # First frame, or we fell behind: don't try to catch up in a burst
+            self._next_time = now
+        else:
+            time.sleep(max(0, self._next_time - now))
+        self._next_time += interval
+
+    def reset(self):
+        self._next_time = None
@@ -0,0 +1,327 @@
+"""
+Staged Pipeline Primitives
+Each stage runs on its own worker thread and hands packets downstream through
+a bounded queue, so throughput is limited by the slowest stage rather than the
+sum of all stages. A full queue blocks the producer (backpressure) and a single
+FIFO worker per stage keeps frame order intact.
+"""
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Sentinel pushed through the stages once the source is exhausted
+END_OF_STREAM = object()
+
+
+@dataclass
+class FramePacket:
+    """Unit of work flowing through the pipeline (one per decoded frame)."""
+    frame_id: int
+    frame: Any = None
+    decoded_at: float = 0.0  # perf_counter() when the frame left the decoder
+    timestamp: float = 0.0  # Clock time of the frame (video time for files, see core/clock.py)
+    run_detection: bool = True  # False: no base inference, tracker predicts only
+    gated: Optional[str] = None  # Motion gate verdict ("static" / "duplicate") if detection was skipped
+    detections: List = field(default_factory=list)
+    tracks: List = field(default_factory=list)
+    events: List = field(default_factory=list)
+    publish: List = field(default_factory=list)  # Events to dispatch on the bus
+    overlay: List = field(default_factory=list)  # Deferred draw commands (core.overlay)
+    context: Any = None  # FrameContext: preprocessing shared by every model (None if not decoded)
+    snapshot: Any = None  # TrackSnapshot of the confirmed tracks (what specialists receive)
+    plan: Optional[List[str]] = None  # Specialists scheduled for this frame (None: not planned yet)
+    ticket: Any = None  # SpecialistProcessPool ticket of the pooled specialists in `plan`
+    checkpoint: Any = None  # core.checkpoint.Checkpoint being filled in on checkpoint frames
+
+
+class TrackView:
+    """
+    Immutable snapshot of a tracker track.
+    The tracker keeps mutating its Track objects on the next update, so the
+    tracking stage hands downstream stages a frozen copy instead.
+    Mirrors the subset of the DeepSort Track API used by the specialists.
+    """
+    __slots__ = ("track_id", "ltrb", "det_class", "det_conf", "confirmed")
+
+    def __init__(self, track_id, ltrb, det_class=None, det_conf=None, confirmed=True):
+        self.track_id = track_id
+        self.ltrb = ltrb
+        self.det_class = det_class
+        self.det_conf = det_conf
+        self.confirmed = confirmed
+
+    @classmethod
+    def from_track(cls, track):
+        return cls(
+            track_id=track.track_id,
+            ltrb=tuple(float(v) for v in track.to_ltrb()),
+            det_class=getattr(track, "det_class", None),
+            det_conf=getattr(track, "det_conf", None),
+            confirmed=track.is_confirmed(),
+        )
+
+    def is_confirmed(self):
+        return self.confirmed
+
+    def to_ltrb(self):
+        return self.ltrb
+
+
+class TrackSnapshot:
+    """
+    Columnar geometry of one frame's confirmed tracks, built once per frame and
+    shared by the registry update and every specialist (row i of each array
+    belongs to ids[i]):
+    - ltrb:       (N, 4) float boxes
+    - boxes:      (N, 4) int boxes (truncated, as map(int, ltrb))
+    - centroids:  (N, 2) int ((x1 + x2) // 2, (y1 + y2) // 2)
+    - sizes:      (N, 2) int (w, h)
+    - det_class:  (N,) int, -1 if unknown | det_conf: (N,) float, NaN if unknown
+    `total` counts all tracks, tentative ones included.
+    """
+    __slots__ = ("ids", "ltrb", "boxes", "centroids", "sizes", "det_class", "det_conf", "total")
+
+    def __init__(self, ids: List, ltrb, det_class=None, det_conf=None, total: Optional[int] = None):
+        self.ids = list(ids)
+        self.ltrb = np.asarray(ltrb, dtype=np.float32).reshape(-1, 4)
+        self.boxes = self.ltrb.astype(np.int32)
+        self.centroids = (self.boxes[:, :2] + self.boxes[:, 2:]) // 2
+        self.sizes = self.boxes[:, 2:] - self.boxes[:, :2]
+        n = len(self.ids)
+        self.det_class = np.full(n, -1, dtype=np.int32) if det_class is None else np.asarray(det_class)
+        self.det_conf = np.full(n, np.nan, dtype=np.float32) if det_conf is None else np.asarray(det_conf)
+        self.total = n if total is None else total
+
+    @classmethod
+    def from_tracks(cls, tracks) -> "TrackSnapshot":
+        """Snapshot of the confirmed tracks in a Track / TrackView list (a snapshot passes through)."""
+        if isinstance(tracks, cls):
+            return tracks
+        tracks = list(tracks or [])
+        confirmed = [t for t in tracks if t.is_confirmed()]
+        return cls(
+            ids=[t.track_id for t in confirmed],
+            ltrb=[tuple(t.to_ltrb()) for t in confirmed],
+            det_class=[-1 if getattr(t, "det_class", None) is None else t.det_class for t in confirmed],
+            det_conf=[np.nan if getattr(t, "det_conf", None) is None else t.det_conf for t in confirmed],
+            total=len(tracks),
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def clipped(self, width: int, height: int) -> np.ndarray:
+        """int boxes clipped to the frame"""
+        return np.clip(self.boxes, 0, [width, height, width, height])
+
+    def views(self) -> List[TrackView]:
+        """Back to per-track objects (for code written against the Track API)"""
+        return [TrackView(i, tuple(box), c if c >= 0 else None, None if np.isnan(p) else float(p))
+                for i, box, c, p in zip(self.ids, self.ltrb.tolist(), self.det_class.tolist(),
+                                        self.det_conf.tolist())]
+
+
+class Stage:
+    """
+    A single pipeline stage.
+    - Source stage (no inbox): `handler()` is called repeatedly and returns the
+      next packet, or None once the source is exhausted.
+    - Other stages: `handler(packet)` returns the packet to forward, or None to
+      drop it.
+    - Batched stages (batch_size set): up to `batch_size` packets are collected,
+      waiting at most `max_wait` seconds after the first one, and
+      `handler(packets)` returns the list of packets to forward in order.
+    """
+    def __init__(self, name: str, handler: Callable, inbox: Optional[queue.Queue],
+                 outbox: Optional[queue.Queue], stop_event: threading.Event,
+                 poll_interval: float = 0.1, batch_size: Optional[int] = None,
+                 max_wait: float = 0.0):
+        self.name = name
+        self.handler = handler
+        self.inbox = inbox
+        self.outbox = outbox
+        self.stop_event = stop_event
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.errors = 0  # Packets dropped because the handler raised
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self._run, name=f"stage-{self.name}", daemon=True)
+        self.thread.start()
+
+    def join(self, timeout=None):
+        if self.thread:
+            self.thread.join(timeout=timeout)
+
+    def _get(self):
+        """Blocking get that still honours the stop event."""
+        while not self.stop_event.is_set():
+            try:
+                return self.inbox.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+        return END_OF_STREAM
+
+    def _put(self, item):
+        """Blocking put (backpressure) that still honours the stop event."""
+        if self.outbox is None:
+            return True
+        while not self.stop_event.is_set():
+            try:
+                self.outbox.put(item, timeout=self.poll_interval)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get_batch(self):
+        """
+        Collect up to batch_size packets.
+        Returns (packets, ended) where ended means END_OF_STREAM was consumed.
+        """
+        first = self._get()
+        if first is END_OF_STREAM:
+            return [], True
+
+        batch = [first]
+        deadline = time.time() + self.max_wait
+        while len(batch) < self.batch_size and not self.stop_event.is_set():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            try:
+                item = self.inbox.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is END_OF_STREAM:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _run_batched(self):
+        ended = False
+        while not ended and not self.stop_event.is_set():
+            batch, ended = self._get_batch()
+            if not batch:
+                continue
+
+            try:
+                results = self.handler(batch)
+            except Exception as e:
+                print(f"[ERROR] Pipeline stage '{self.name}': {e}")
+                self.errors += len(batch)
+                continue
+
+            for result in results or []:
+                if result is not None and not self._put(result):
+                    ended = True
+                    break
+
+        self._finish()
+
+    def _finish(self):
+        # Propagate end-of-stream so downstream stages exit. A full outbox
+        # drains as long as the consumer runs, so keep retrying: a lost
+        # sentinel would leave every downstream stage waiting forever. Once
+        # stopping, downstream stages exit on the stop event by themselves.
+        if self.outbox is None:
+            return
+        while True:
+            try:
+                self.outbox.put(END_OF_STREAM, timeout=self.poll_interval)
+                return
+            except queue.Full:
+                if self.stop_event.is_set():
+                    return
+
+    def _run(self):
+        if self.batch_size is not None and self.inbox is not None:
+            return self._run_batched()
+
+        while not self.stop_event.is_set():
+            if self.inbox is None:
+                item = None
+            else:
+                item = self._get()
+                if item is END_OF_STREAM:
+                    break
+
+            try:
+                result = self.handler() if self.inbox is None else self.handler(item)
+            except Exception as e:
+                print(f"[ERROR] Pipeline stage '{self.name}': {e}")
+                self.errors += 1
+                continue
+
+            if result is None:
+                if self.inbox is None:
+                    break  # Source exhausted
+                continue
+
+            if not self._put(result):
+                break
+
+        self._finish()
+
+
+class Pipeline:
+    """
+    Linear chain of stages connected by bounded queues.
+    The first stage is the source, the last one is the sink.
+    Each entry is (name, handler) or (name, handler, stage_options), where
+    stage_options are passed to Stage (e.g. batch_size, max_wait).
+    """
+    def __init__(self, stages: List[Tuple], queue_size: int = 4,
+                 on_complete: Optional[Callable[[], None]] = None):
+        self.stop_event = threading.Event()
+        self.queues: Dict[str, queue.Queue] = {}
+        self.stages: List[Stage] = []
+        self.on_complete = on_complete
+
+        inbox = None
+        for index, spec in enumerate(stages):
+            name, handler = spec[0], spec[1]
+            options = spec[2] if len(spec) > 2 else {}
+            is_last = index == len(stages) - 1
+            outbox = None if is_last else queue.Queue(maxsize=queue_size)
+            if outbox is not None:
+                self.queues[name] = outbox
+            self.stages.append(Stage(name, handler, inbox, outbox, self.stop_event, **options))
+            inbox = outbox
+
+        self._watcher = None
+
+    def start(self):
+        self.stop_event.clear()
+        for stage in self.stages:
+            stage.start()
+        self._watcher = threading.Thread(target=self._watch, name="pipeline-watch", daemon=True)
+        self._watcher.start()
+
+    def _watch(self):
+        # The sink finishing means every packet has been drained (or we stopped)
+        self.stages[-1].join()
+        if self.on_complete:
+            self.on_complete()
+
+    def stop(self, timeout: float = 2.0):
+        self.stop_event.set()
+        for stage in self.stages:
+            stage.join(timeout=timeout)
+
+    def is_running(self) -> bool:
+        return any(stage.thread and stage.thread.is_alive() for stage in self.stages)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Current number of packets waiting after each stage."""
+        return {name: q.qsize() for name, q in self.queues.items()}
+
+    def error_counts(self) -> Dict[str, int]:
+        """Packets dropped by each stage because its handler raised."""
+        return {stage.name: stage.errors for stage in self.stages}
@@ -0,0 +1,291 @@
+"""
+Specialist Process Pool
+Runs CPU-heavy specialists (emergency, ReID, pothole) in worker processes so
+they are not bound by the GIL of the main pipeline.
+
+- One worker process per specialist keeps that specialist's state (e.g. the
+  ReID gallery) and sees frames strictly in order.
+- Frames are written once into a shared-memory slot; workers map the slot by
+  name instead of receiving a pickled copy.
+- Registry calls made inside a worker are recorded and replayed on the main
+  VehicleRegistry, in frame order, together with the returned Events and
+  overlay draw commands.
+- Several frames can be in flight (one per slot): submit the next frame
+  before collecting the current one so workers never wait on the main thread.
+  A slot is reused only once every worker it was sent to has answered (or
+  exited), even if collect() gave up on it, so a frame is never overwritten
+  mid-read; slots are only resized while none is in flight.
+- Workers only see the registry clock, not its state: specialists that read
+  trajectories (USES_TRAJECTORY) cannot be pooled.
+"""
+import atexit
+import multiprocessing as mp
+import queue
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.clock import Clock
+
+
+class RecordingRegistry:
+    """Stand-in registry for workers: records mutating calls for replay."""
+    def __init__(self, clock=None):
+        self.ops: List[Tuple[str, tuple]] = []
+        self.vehicles = {}
+        self.clock = clock or Clock()
+
+    def update_vehicle(self, *args):
+        self.ops.append(("update_vehicle", args))
+
+    def mark_emergency(self, *args):
+        self.ops.append(("mark_emergency", args))
+
+    def update_speed(self, *args):
+        self.ops.append(("update_speed", args))
+
+    def update_wrong_way(self, *args):
+        self.ops.append(("update_wrong_way", args))
+
+    def trajectory(self, track_id):
+        raise NotImplementedError("trajectories are not available in worker processes")
+
+
+def replay_registry_ops(registry, ops):
+    for method, args in ops:
+        getattr(registry, method)(*args)
+
+
+def _worker_main(name, options, tasks, results):
+    """Worker process entry point: owns one specialist instance."""
+    from detectors.factory import build_specialist
+    from core.overlay import Overlay
+    from core.frame_context import FrameContext
+
+    try:
+        specialist = build_specialist(name, **options)
+    except Exception as e:
+        results.put(("__init__", name, [], [], [], 0.0, f"failed to build: {e}"))
+        return
+
+    attached: Dict[str, shared_memory.SharedMemory] = {}
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        if task[0] == "__forget__":
+            specialist.forget(task[1])
+            continue
+
+        seq, frame_id, shm_name, shape, dtype, tracks, timestamp = task
+        frame = None
+        if shm_name is not None:
+            if shm_name not in attached:
+                attached[shm_name] = shared_memory.SharedMemory(name=shm_name)
+            # Read-only view: specialists emit draw commands instead of drawing
+            frame = np.ndarray(shape, dtype=np.dtype(dtype), buffer=attached[shm_name].buf)
+            frame.flags.writeable = False
+
+        registry = RecordingRegistry(Clock(timestamp))
+        overlay = Overlay()
+        start = time.perf_counter()
+        error = None
+        events = []
+        try:
+            context = FrameContext(frame, frame_id) if frame is not None else None
+            events = specialist.process(frame, frame_id, registry=registry, tracks=tracks,
+                                        overlay=overlay, context=context) or []
+        except Exception as e:
+            error = str(e)
+        results.put((seq, name, events, registry.ops, overlay.commands,
+                     time.perf_counter() - start, error))
+
+    for shm in attached.values():
+        shm.close()
+
+
+class SpecialistProcessPool:
+    def __init__(self, names: List[str], slots: int = 2, timeout: float = 10.0,
+                 start_method: str = "spawn", options: Optional[Dict[str, dict]] = None):
+        """options: name -> constructor kwargs (must be picklable)"""
+        self.names = list(names)
+        options = options or {}
+        self.timeout = timeout
+        self._ctx = mp.get_context(start_method)
+        self._results = self._ctx.Queue()
+        self._tasks = {}
+        self._workers = {}
+        for name in self.names:
+            self._tasks[name] = self._ctx.Queue()
+            worker = self._ctx.Process(
+                target=_worker_main, args=(name, options.get(name, {}), self._tasks[name], self._results),
+                name=f"specialist-{name}", daemon=True
+            )
+            worker.start()
+            self._workers[name] = worker
+
+        self._num_slots = max(1, slots)
+        self._slots: List[shared_memory.SharedMemory] = []
+        self._slot_bytes = 0
+        self._seq = 0  # Submission number: matches results to tickets across runs
+        # Slot ownership and results, guarded by _cond. A slot is free again
+        # only once every worker it was sent to has answered (or died), so a
+        # frame is never overwritten while a worker may still be reading it.
+        self._cond = threading.Condition()
+        self._free = list(range(self._num_slots))
+        self._inflight: Dict[int, dict] = {}  # seq -> {"slot": index or None, "pending": names}
+        self._done: Dict[int, Dict[str, tuple]] = {}  # Results waiting for their collect()
+        self._abandoned = set()  # Tickets given up on (timeout / reset): results are dropped
+        self._failed = set()  # Workers whose specialist could not be built
+        self._closed = threading.Event()
+        self._reader = threading.Thread(target=self._read_results, name="specialist-results", daemon=True)
+        self._reader.start()
+        atexit.register(self.close)
+
+    def reset(self):
+        """Give up on frames still in flight (e.g. a stopped run); their slots free up as results arrive"""
+        with self._cond:
+            self._abandoned.update(self._inflight)
+            self._done = {}
+
+    def _read_results(self):
+        """Background thread: route worker results to their tickets"""
+        while not self._closed.is_set():
+            try:
+                result = self._results.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            seq, name, events, ops, commands, seconds, error = result
+            with self._cond:
+                if seq == "__init__":
+                    print(f"[ERROR] SpecialistProcessPool: {name} {error}")
+                    self._failed.add(name)
+                    for entry_seq in list(self._inflight):
+                        self._resolve(entry_seq, name)
+                elif seq in self._inflight:
+                    if seq not in self._abandoned:
+                        self._done.setdefault(seq, {})[name] = (events, ops, commands, seconds, error)
+                    self._resolve(seq, name)
+                self._cond.notify_all()
+
+    def _resolve(self, seq: int, name: str):
+        """One worker is done with a ticket (answered or gone); free its slot once all are. Holds _cond."""
+        entry = self._inflight[seq]
+        entry["pending"].discard(name)
+        if entry["pending"]:
+            return
+        del self._inflight[seq]
+        if entry["slot"] is not None:
+            self._free.append(entry["slot"])
+        if seq in self._abandoned:
+            self._abandoned.discard(seq)
+            self._done.pop(seq, None)
+
+    def _reap_dead_workers(self):
+        """Resolve tickets waiting on workers that exited. Holds _cond."""
+        for name, worker in self._workers.items():
+            if name not in self._failed and not worker.is_alive():
+                print(f"[ERROR] SpecialistProcessPool: worker {name} exited")
+                self._failed.add(name)
+        for seq in list(self._inflight):
+            for name in self._inflight[seq]["pending"] & self._failed:
+                self._resolve(seq, name)
+
+    def _wait(self, predicate, timeout: float) -> bool:
+        """Wait on _cond for predicate(), checking for dead workers meanwhile. Holds _cond."""
+        deadline = time.time() + timeout
+        self._reap_dead_workers()
+        while not predicate():
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return False
+            self._cond.wait(timeout=min(remaining, 0.5))
+            self._reap_dead_workers()
+        return True
+
+    def _ensure_slots(self, nbytes: int):
+        """(Re)allocate shared-memory slots large enough for one frame (only while all are free)."""
+        if nbytes <= self._slot_bytes:
+            return
+        self._release_slots()
+        self._slots = [shared_memory.SharedMemory(create=True, size=nbytes)
+                       for _ in range(self._num_slots)]
+        self._slot_bytes = nbytes
+
+    def _release_slots(self):
+        for shm in self._slots:
+            shm.close()
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass  # Already removed (e.g. by the resource tracker of an exited worker)
+        self._slots = []
+        self._slot_bytes = 0
+
+    def submit(self, frame, frame_id: int, tracks, names: List[str],
+               timestamp: Optional[float] = None) -> Tuple[int, int, List[str]]:
+        """
+        Hand one frame to the given pooled specialists. Returns a ticket for collect().
+        Blocks while every shared-memory slot holds a frame some worker has not
+        answered yet (and, to grow the slots, until none does).
+        timestamp: the frame's clock time (core/clock.py), seen by workers as registry.clock
+        """
+        names = [name for name in names if name not in self._failed]
+        with self._cond:
+            self._seq += 1
+            seq = self._seq
+            slot = None
+            if frame is not None and names:
+                grow = frame.nbytes > self._slot_bytes
+                ready = (lambda: len(self._free) == self._num_slots) if grow else (lambda: bool(self._free))
+                if not self._wait(ready, self.timeout):
+                    print(f"[ERROR] SpecialistProcessPool: no free frame slot for frame {frame_id}, skipping it")
+                    return seq, frame_id, []
+                self._ensure_slots(frame.nbytes)
+                slot = self._free.pop(0)
+            if names:
+                self._inflight[seq] = {"slot": slot, "pending": set(names)}
+
+        shm_name, shape, dtype = None, None, None
+        if slot is not None:
+            shm = self._slots[slot]
+            np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)[...] = frame
+            shm_name, shape, dtype = shm.name, frame.shape, frame.dtype.str
+
+        for name in names:
+            self._tasks[name].put((seq, frame_id, shm_name, shape, dtype, tracks, timestamp))
+        return seq, frame_id, names
+
+    def collect(self, ticket) -> Dict[str, tuple]:
+        """
+        Wait for every result of a submitted frame.
+        Returns name -> (events, registry_ops, overlay_commands, seconds, error).
+        On timeout the frame is abandoned: its slot stays reserved until the
+        slow workers answer, and their late results are dropped.
+        """
+        seq, frame_id, names = ticket
+        with self._cond:
+            if not self._wait(lambda: seq not in self._inflight, self.timeout):
+                pending = sorted(self._inflight[seq]["pending"])
+                print(f"[ERROR] SpecialistProcessPool: timed out waiting for {pending} on frame {frame_id}")
+                self._abandoned.add(seq)
+            return self._done.pop(seq, {})
+
+    def forget(self, track_ids: List):
+        """Forward the registry's expired track ids to every worker's specialist"""
+        for name in self.names:
+            self._tasks[name].put(("__forget__", list(track_ids)))
+
+    def close(self):
+        for name, worker in self._workers.items():
+            if worker.is_alive():
+                self._tasks[name].put(None)
+        for worker in self._workers.values():
+            worker.join(timeout=2)
+        self._workers = {}
+        self._closed.set()
+        self._reader.join(timeout=2)
+        self._release_slots()
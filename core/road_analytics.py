@@ -14,6 +14,7 @@ class RoadAnalytics:
         self.lane_lines = []
         self.center_polyline = [] 
         self.smoothed_polyline = [] # Weighted average for stability
+        self.road_polygon = [] # Lane area around the center polyline (for ROI cropping)
         self.frame_count = 0
         self.src_points = np.array(settings.SPEED_SOURCE_POINTS, dtype=np.float32)
 
@@ -110,6 +111,8 @@ class RoadAnalytics:
                 left_edge.append((lx, cy))
                 right_edge.append((rx, cy))
             
+            self.road_polygon = left_edge + right_edge[::-1]
+            
             bl = left_edge[0]
             br = right_edge[0]
             tl = left_edge[-1]
@@ -122,3 +125,6 @@ class RoadAnalytics:
     
     def get_lane_polyline(self):
         return self.center_polyline
+    
+    def get_road_polygon(self):
+        return self.road_polygon
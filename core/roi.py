@@ -0,0 +1,83 @@
+"""
+Region-of-Interest Inference
+Models only need to see the part of the frame they care about: the base
+model the carriageway, the pothole model the road surface. A RegionOfInterest
+gives the bounding box (and optional mask) of its polygon for each frame; the
+frame's FrameContext crops to it before inference and maps the resulting boxes
+back to full-frame coordinates.
+
+A region is either a fixed polygon in normalised (x, y) frame coordinates or
+"road", which follows the lane polyline estimated by RoadAnalytics. Until
+the road has been found the full frame is used.
+"""
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import cv2
+import numpy as np
+
+from core.road_analytics import RoadAnalytics
+
+Polygon = Sequence[Tuple[float, float]]
+
+
+class RegionOfInterest:
+    def __init__(self, polygon: Union[Polygon, str], padding: float = 0.05, mask: bool = False):
+        """
+        Args:
+            polygon: Normalised (x, y) vertices, or "road" for the RoadAnalytics lane area
+            padding: Margin added around the polygon's bounding box (fraction of frame size)
+            mask: Also blank out pixels outside the polygon (costs one copy of the crop)
+        """
+        self.padding = padding
+        self.mask = mask
+        self.analytics = RoadAnalytics() if polygon == "road" else None
+        self.polygon = None if self.analytics else np.array(polygon, dtype=np.float32)
+        self._mask_cache: Dict[Tuple, np.ndarray] = {}
+
+    def _pixel_polygon(self, height: int, width: int) -> Optional[np.ndarray]:
+        if self.analytics is not None:
+            road = self.analytics.get_road_polygon()
+            return np.array(road, dtype=np.int32) if len(road) >= 3 else None
+        return (self.polygon * [width, height]).astype(np.int32)
+
+    def bounds(self, height: int, width: int) -> Tuple[int, int, int, int]:
+        """(x1, y1, x2, y2) crop of the region, padded and clipped to the frame."""
+        polygon = self._pixel_polygon(height, width)
+        if polygon is None:
+            return 0, 0, width, height
+        pad_x, pad_y = int(width * self.padding), int(height * self.padding)
+        x1, y1 = polygon.min(axis=0) - (pad_x, pad_y)
+        x2, y2 = polygon.max(axis=0) + (pad_x, pad_y)
+        return max(0, int(x1)), max(0, int(y1)), min(width, int(x2)), min(height, int(y2))
+
+    def region(self, frame) -> Tuple[Tuple[int, int, int, int], Optional[np.ndarray]]:
+        """(crop box, mask or None) of the region for this frame."""
+        if self.analytics is not None:
+            self.analytics.analyze(frame)  # Re-estimates the road every 30 frames
+        height, width = frame.shape[:2]
+        box = self.bounds(height, width)
+        return box, self._crop_mask(height, width, box) if self.mask else None
+
+    def _crop_mask(self, height, width, box) -> np.ndarray:
+        polygon = self._pixel_polygon(height, width)
+        key = (height, width, box) if self.analytics is None else None
+        if key is not None and key in self._mask_cache:
+            return self._mask_cache[key]
+        x1, y1, x2, y2 = box
+        mask = np.full((y2 - y1, x2 - x1), 255, dtype=np.uint8)
+        if polygon is not None:
+            mask[:] = 0
+            cv2.fillPoly(mask, [polygon - (x1, y1)], 255)
+        if key is not None:
+            self._mask_cache[key] = mask
+        return mask
+
+
+def build_regions(config: Dict) -> Dict[str, RegionOfInterest]:
+    """model name -> RegionOfInterest for one camera's ROI_REGIONS entry."""
+    padding = config.get("padding", 0.05)
+    mask = config.get("mask", False)
+    return {
+        name: RegionOfInterest(polygon, padding=padding, mask=mask)
+        for name, polygon in config.items() if name not in ("padding", "mask")
+    }
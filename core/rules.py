@@ -0,0 +1,90 @@
+"""
+Registry Rule Engine
+Rules are declared in settings.RULES and compiled once into a lookup table:
+a vehicle's flag bits (emergency / wrong-way / overspeeding) index the table
+directly and give the rules that fire, highest priority first. An "override"
+rule that matches suppresses every lower-priority rule (the emergency rule:
+an emergency vehicle only ever produces EMERGENCY_VEHICLE).
+
+Rule fields:
+- name, event, severity
+- when:        flag names that must all be set
+- priority:    higher fires first
+- override:    suppress lower-priority rules when this one matches
+- description: str.format template over the vehicle fields below
+- metadata:    vehicle fields copied into the event metadata
+
+Vehicle fields: track_id, speed, lane, emergency_type, wrong_way.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Sequence, Tuple
+
+# Bits of the registry's `flags` column
+EMERGENCY = 1
+WRONG_WAY = 2
+OVERSPEEDING = 4
+FLAGS = {"emergency": EMERGENCY, "wrong_way": WRONG_WAY, "overspeeding": OVERSPEEDING}
+
+
+@dataclass(frozen=True)
+class Rule:
+    name: str
+    event: str
+    severity: str
+    mask: int
+    description: str
+    metadata: Tuple[str, ...] = ()
+    priority: int = 0
+    override: bool = False
+
+    @classmethod
+    def from_dict(cls, spec: Dict) -> "Rule":
+        unknown = [flag for flag in spec.get("when", []) if flag not in FLAGS]
+        if unknown:
+            raise ValueError(f"Rule '{spec.get('name')}': unknown flags {unknown} (known: {list(FLAGS)})")
+        if not spec.get("when"):
+            raise ValueError(f"Rule '{spec.get('name')}': 'when' needs at least one flag")
+        mask = 0
+        for flag in spec["when"]:
+            mask |= FLAGS[flag]
+        return cls(
+            name=spec["name"],
+            event=spec["event"],
+            severity=spec.get("severity", "WARNING"),
+            mask=mask,
+            description=spec.get("description", spec["event"]),
+            metadata=tuple(spec.get("metadata", ("track_id",))),
+            priority=spec.get("priority", 0),
+            override=spec.get("override", False),
+        )
+
+    def event_dict(self, fields: Dict) -> Dict:
+        return {
+            "type": self.event,
+            "severity": self.severity,
+            "description": self.description.format(**fields),
+            "metadata": {name: fields[name] for name in self.metadata},
+        }
+
+
+class RuleSet:
+    def __init__(self, rules: Sequence[Rule]):
+        self.rules = sorted(rules, key=lambda r: r.priority, reverse=True)
+        # flags value -> rules that fire for it
+        self.table: List[Tuple[Rule, ...]] = [self._resolve(flags) for flags in range(1 << len(FLAGS))]
+
+    @classmethod
+    def compile(cls, specs: Sequence[Dict]) -> "RuleSet":
+        return cls([Rule.from_dict(spec) for spec in specs])
+
+    def _resolve(self, flags: int) -> Tuple[Rule, ...]:
+        fired = []
+        for rule in self.rules:
+            if flags & rule.mask == rule.mask:
+                fired.append(rule)
+                if rule.override:
+                    break
+        return tuple(fired)
+
+    def match(self, flags: int) -> Tuple[Rule, ...]:
+        return self.table[flags]
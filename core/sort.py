@@ -0,0 +1,161 @@
+"""
+Vectorised SORT
+Shared tracker of the helmet-detection, triple-riding and red-light-violation
+pipelines (same API as the reference SORT implementation):
+
+    tracker = Sort(max_age=15, min_hits=3, iou_threshold=0.3)
+    tracks = tracker.update(dets)   # dets: (N, 5+) [x1, y1, x2, y2, score, ...]
+    for x1, y1, x2, y2, track_id in tracks: ...
+
+Instead of one filterpy KalmanFilter object per track, all track states are
+stacked arrays (state (N, 7): x, y, area, ratio, vx, vy, varea) and predict /
+update run as batched matrix products. The IoU matrix is built by
+broadcasting and the unmatched sets come from boolean masks.
+"""
+import numpy as np
+
+# Constant-velocity model of SORT (Bewley et al.) and its noise settings
+_F = np.eye(7)
+_F[[0, 1, 2], [4, 5, 6]] = 1
+_H = np.eye(4, 7)
+_R = np.diag([1.0, 1.0, 10.0, 10.0])
+_Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 0.0001])
+_P0 = np.diag([10.0, 10.0, 10.0, 10.0, 10000.0, 10000.0, 10000.0])
+
+
+def bbox_to_z(boxes: np.ndarray) -> np.ndarray:
+    """(N, 4) x1, y1, x2, y2 -> (N, 4) centre x, centre y, area, aspect ratio"""
+    w = boxes[:, 2] - boxes[:, 0]
+    h = boxes[:, 3] - boxes[:, 1]
+    return np.stack([boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w * h, w / np.maximum(h, 1e-6)], axis=1)
+
+
+def z_to_bbox(z: np.ndarray) -> np.ndarray:
+    w = np.sqrt(np.clip(z[:, 2] * z[:, 3], 0, None))
+    h = z[:, 2] / np.maximum(w, 1e-6)
+    return np.stack([z[:, 0] - w / 2, z[:, 1] - h / 2, z[:, 0] + w / 2, z[:, 1] + h / 2], axis=1)
+
+
+def iou_batch(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (N, 4) and (M, 4) x1, y1, x2, y2 boxes."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)))
+    xx1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    yy1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    xx2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    yy2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.maximum(0., xx2 - xx1) * np.maximum(0., yy2 - yy1)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-6)
+
+
+def associate(dets: np.ndarray, trks: np.ndarray, iou_threshold: float = 0.3):
+    """Optimal IoU assignment -> (matches (K, 2) [det, trk], unmatched dets, unmatched trks)"""
+    from scipy.optimize import linear_sum_assignment
+
+    if len(trks) == 0 or len(dets) == 0:
+        return np.empty((0, 2), dtype=int), np.arange(len(dets)), np.arange(len(trks))
+    iou = iou_batch(dets, trks)
+    rows, cols = linear_sum_assignment(-iou)
+    keep = iou[rows, cols] >= iou_threshold
+    matches = np.stack([rows[keep], cols[keep]], axis=1)
+
+    # Same order as the reference SORT (new track ids are handed out in it):
+    # unassigned detections first, then those whose best match was too weak
+    unassigned = np.ones(len(dets), dtype=bool)
+    unassigned[rows] = False
+    unmatched_dets = np.concatenate([np.flatnonzero(unassigned), rows[~keep]])
+    trk_free = np.ones(len(trks), dtype=bool)
+    trk_free[matches[:, 1]] = False
+    return matches, unmatched_dets, np.flatnonzero(trk_free)
+
+
+class Sort:
+    def __init__(self, max_age=15, min_hits=3, iou_threshold=0.3):
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.iou_threshold = iou_threshold
+        self.frame_count = 0
+        self.next_id = 0
+
+        self.x = np.zeros((0, 7))
+        self.P = np.zeros((0, 7, 7))
+        self.ids = np.zeros(0, dtype=int)
+        self.time_since_update = np.zeros(0, dtype=int)
+        self.hits = np.zeros(0, dtype=int)
+        self.hit_streak = np.zeros(0, dtype=int)
+        self.age = np.zeros(0, dtype=int)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _keep(self, mask):
+        for name in ("x", "P", "ids", "time_since_update", "hits", "hit_streak", "age"):
+            setattr(self, name, getattr(self, name)[mask])
+
+    def _predict(self) -> np.ndarray:
+        # Area velocity must not shrink the box below zero
+        self.x[self.x[:, 6] + self.x[:, 2] <= 0, 6] = 0
+        self.x = self.x @ _F.T
+        self.P = np.einsum("ij,njk,lk->nil", _F, self.P, _F) + _Q
+        self.age += 1
+        self.hit_streak[self.time_since_update > 0] = 0
+        self.time_since_update += 1
+        return z_to_bbox(self.x)
+
+    def _update(self, idx: np.ndarray, boxes: np.ndarray):
+        x, P = self.x[idx], self.P[idx]
+        S = np.einsum("ij,njk,lk->nil", _H, P, _H) + _R
+        PHt = np.einsum("nij,kj->nik", P, _H)
+        K = np.linalg.solve(S, PHt.transpose(0, 2, 1)).transpose(0, 2, 1)
+        x = x + np.einsum("nij,nj->ni", K, bbox_to_z(boxes) - x @ _H.T)
+        I_KH = np.eye(7) - np.einsum("nij,jk->nik", K, _H)
+        self.x[idx] = x
+        self.P[idx] = np.einsum("nij,njk->nik", I_KH, P)
+
+        self.time_since_update[idx] = 0
+        self.hits[idx] += 1
+        self.hit_streak[idx] += 1
+
+    def _spawn(self, boxes: np.ndarray):
+        n = len(boxes)
+        x = np.zeros((n, 7))
+        x[:, :4] = bbox_to_z(boxes)
+        self.x = np.concatenate([self.x, x])
+        self.P = np.concatenate([self.P, np.broadcast_to(_P0, (n, 7, 7))])
+        self.ids = np.concatenate([self.ids, np.arange(self.next_id, self.next_id + n)])
+        self.next_id += n
+        zeros = np.zeros(n, dtype=int)
+        self.time_since_update = np.concatenate([self.time_since_update, zeros])
+        self.hits = np.concatenate([self.hits, zeros])
+        self.hit_streak = np.concatenate([self.hit_streak, zeros])
+        self.age = np.concatenate([self.age, zeros])
+
+    def update(self, dets=np.empty((0, 5))) -> np.ndarray:
+        """
+        dets: (N, 5+) [x1, y1, x2, y2, score, ...]; call once per frame, also
+        with an empty array when nothing was detected.
+        Returns (M, 5) [x1, y1, x2, y2, track_id] of tracks matched this frame.
+        """
+        self.frame_count += 1
+        dets = np.asarray(dets, dtype=float)
+        boxes = dets[:, :4] if dets.size else np.empty((0, 4))
+
+        predicted = self._predict()
+        valid = ~np.isnan(predicted).any(axis=1)
+        if not valid.all():
+            self._keep(valid)
+            predicted = predicted[valid]
+
+        matches, unmatched_dets, _ = associate(boxes, predicted, self.iou_threshold)
+        if len(matches):
+            self._update(matches[:, 1], boxes[matches[:, 0]])
+        self._spawn(boxes[unmatched_dets])
+
+        show = (self.time_since_update < 1) & (
+            (self.hit_streak >= self.min_hits) | (self.frame_count <= self.min_hits))
+        ret = np.concatenate([z_to_bbox(self.x[show]), self.ids[show, None]], axis=1)
+
+        self._keep(self.time_since_update <= self.max_age)
+        return ret
@@ -0,0 +1,111 @@
+"""
+Specialist Scheduler
+Decides which specialists run on a given frame:
+- cadence:  run every N frames
+- budget:   a per-frame time budget; a specialist whose measured cost exceeds
+            it is thinned out so its amortised cost stays within budget
+- priority: under overload the lowest-priority work is shed first
+Skips are counted per specialist and per reason.
+plan() (offload / analyze stage), record() (analyze stage) and report() (UI)
+may run on different threads; the state is guarded by one lock.
+"""
+import math
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+
+@dataclass
+class SpecialistPolicy:
+    every_n: int = 1            # Run on every N-th frame
+    budget_ms: float = 0.0      # Amortised per-frame budget (0 = unlimited)
+    priority: int = 50          # Higher runs first and is shed last
+    needs_pixels: bool = True   # False: can run on tracker-predicted frames
+
+
+class SpecialistScheduler:
+    def __init__(self, policies: Dict[str, SpecialistPolicy], smoothing: float = 0.2):
+        self.policies = policies
+        self.smoothing = smoothing
+        self.cost_ms: Dict[str, float] = {}          # EMA of measured run time
+        self.last_run: Dict[str, int] = {}
+        self.runs: Dict[str, int] = defaultdict(int)
+        self.skipped: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, config: Dict[str, Dict]) -> "SpecialistScheduler":
+        return cls({name: SpecialistPolicy(**options) for name, options in config.items()})
+
+    def _interval(self, name: str) -> int:
+        """Effective cadence: configured every_n, stretched if over budget."""
+        policy = self.policies[name]
+        interval = max(1, policy.every_n)
+        cost = self.cost_ms.get(name)
+        if policy.budget_ms > 0 and cost and cost > policy.budget_ms:
+            interval = max(interval, math.ceil(policy.every_n * cost / policy.budget_ms))
+        return interval
+
+    def plan(self, frame_id: int, has_pixels: bool = True, overloaded: bool = False,
+             frame_budget_ms: Optional[float] = None) -> List[str]:
+        """
+        Names of the specialists to run on this frame, highest priority first.
+        When `overloaded`, specialists are shed from the lowest priority up
+        until the estimated cost fits `frame_budget_ms`.
+        """
+        with self._lock:
+            due = []
+            for name in sorted(self.policies, key=lambda n: -self.policies[n].priority):
+                policy = self.policies[name]
+                if policy.needs_pixels and not has_pixels:
+                    self.skipped[name]["no_pixels"] += 1
+                    continue
+                last = self.last_run.get(name)
+                if last is not None and frame_id - last < self._interval(name):
+                    reason = "budget" if frame_id - last >= policy.every_n else "cadence"
+                    self.skipped[name][reason] += 1
+                    continue
+                due.append(name)
+
+            if overloaded and frame_budget_ms:
+                spent = 0.0
+                kept = []
+                for name in due:
+                    spent += self.cost_ms.get(name, 0.0)
+                    if kept and spent > frame_budget_ms:
+                        self.skipped[name]["shed"] += 1
+                        continue
+                    kept.append(name)
+                due = kept
+
+            for name in due:
+                self.last_run[name] = frame_id
+                self.runs[name] += 1
+            return due
+
+    def record(self, name: str, seconds: float):
+        ms = seconds * 1000.0
+        with self._lock:
+            previous = self.cost_ms.get(name)
+            self.cost_ms[name] = ms if previous is None else previous + self.smoothing * (ms - previous)
+
+    def reset(self):
+        with self._lock:
+            self.cost_ms.clear()
+            self.last_run.clear()
+            self.runs.clear()
+            self.skipped.clear()
+
+    def report(self) -> Dict[str, Dict]:
+        """Runs, skip counts (by reason) and smoothed cost for each specialist."""
+        with self._lock:
+            return {
+                name: {
+                    "runs": self.runs.get(name, 0),
+                    "skipped": dict(self.skipped.get(name, {})),
+                    "cost_ms": round(self.cost_ms.get(name, 0.0), 2),
+                    "interval": self._interval(name),
+                }
+                for name in self.policies
+            }
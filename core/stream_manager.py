@@ -0,0 +1,83 @@
+"""
+Multi-Camera Stream Manager
+Runs many video sources in one process. Every stream keeps its own tracker,
+VehicleRegistry and specialist state, while the base YOLO weights and the
+inference workers are shared so frames from different cameras are batched
+into the same model call.
+"""
+import threading
+from typing import Dict, Optional
+from core.model_registry import get_model
+from config import settings
+from core.detection import VehicleDetector, SharedVehicleDetector
+from core.unified_processor import UnifiedVideoProcessor, ProcessingStatus
+
+
+class StreamManager:
+    def __init__(self, model_path: str = settings.YOLO_MODEL_PATH):
+        print("[StreamManager] Loading shared Base YOLO Model...")
+        self.detector = SharedVehicleDetector(
+            VehicleDetector.from_settings(get_model(model_path)),
+            max_batch=settings.STREAM_MAX_BATCH,
+            max_wait=settings.STREAM_MAX_WAIT,
+            num_workers=settings.INFERENCE_WORKERS,
+        )
+        self.streams: Dict[str, UnifiedVideoProcessor] = {}
+        self._lock = threading.Lock()
+
+    def get_or_create_stream(self, camera_id: str) -> UnifiedVideoProcessor:
+        """Return the stream for camera_id, creating an idle one if needed."""
+        with self._lock:
+            if camera_id not in self.streams:
+                self.streams[camera_id] = UnifiedVideoProcessor(
+                    camera_id=camera_id, detector=self.detector
+                )
+            return self.streams[camera_id]
+
+    def add_stream(self, camera_id: str, source, start: bool = True) -> Optional[UnifiedVideoProcessor]:
+        """Open `source` (file path, RTSP URL or device index) for camera_id."""
+        processor = self.get_or_create_stream(camera_id)
+        if processor.status.is_processing:
+            print(f"[StreamManager] {camera_id} is already running")
+            return processor
+
+        if not processor.load_video(source):
+            print(f"[ERROR] StreamManager: could not open source for {camera_id}: {source}")
+            return None
+
+        if start:
+            processor.start_processing()
+        return processor
+
+    def get_stream(self, camera_id: str) -> Optional[UnifiedVideoProcessor]:
+        return self.streams.get(camera_id)
+
+    def stop_stream(self, camera_id: str):
+        processor = self.streams.get(camera_id)
+        if processor:
+            processor.stop_processing()
+
+    def remove_stream(self, camera_id: str):
+        self.stop_stream(camera_id)
+        with self._lock:
+            self.streams.pop(camera_id, None)
+
+    def stop_all(self):
+        for camera_id in list(self.streams.keys()):
+            self.stop_stream(camera_id)
+
+    def get_status(self) -> Dict[str, ProcessingStatus]:
+        """Per-stream processing status, keyed by camera_id."""
+        return {camera_id: p.get_status() for camera_id, p in list(self.streams.items())}
+
+
+_manager_instance = None
+_manager_lock = threading.Lock()
+
+
+def get_stream_manager() -> StreamManager:
+    global _manager_instance
+    with _manager_lock:
+        if not _manager_instance:
+            _manager_instance = StreamManager()
+    return _manager_instance
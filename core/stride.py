@@ -0,0 +1,48 @@
+"""
+Adaptive Frame-Stride Scheduler
+Runs the base model only on every k-th frame when the pipeline cannot keep
+up with the target FPS. k is derived from the measured per-frame cost of the
+slowest detection-path stage; frames in between are grabbed without decoding
+and the tracker advances them on motion prediction alone.
+"""
+import math
+from typing import Dict, Optional
+
+
+class StrideScheduler:
+    def __init__(self, max_stride: int = 4, enabled: bool = True, smoothing: float = 0.2):
+        self.max_stride = max(1, max_stride)
+        self.enabled = enabled
+        self.smoothing = smoothing
+        self.stride = 1
+        self._cost: Dict[str, float] = {}  # stage -> EMA seconds per detected frame
+        self._last_detect_frame = None
+
+    def observe(self, stage: str, seconds: float):
+        """Feed the latency of a stage that only runs on detected frames."""
+        previous = self._cost.get(stage)
+        if previous is None:
+            self._cost[stage] = seconds
+        else:
+            self._cost[stage] = previous + self.smoothing * (seconds - previous)
+
+    def update(self, target_fps: Optional[float]) -> int:
+        """Recompute k for the given target FPS (None = unthrottled -> every frame)."""
+        if not self.enabled or not target_fps or not self._cost:
+            self.stride = 1
+        else:
+            # Stages run concurrently, so the slowest one bounds throughput
+            bottleneck = max(self._cost.values())
+            self.stride = max(1, min(self.max_stride, math.ceil(bottleneck * target_fps)))
+        return self.stride
+
+    def should_detect(self, frame_id: int) -> bool:
+        if self._last_detect_frame is None or frame_id - self._last_detect_frame >= self.stride:
+            self._last_detect_frame = frame_id
+            return True
+        return False
+
+    def reset(self):
+        self.stride = 1
+        self._cost.clear()
+        self._last_detect_frame = None
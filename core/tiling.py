@@ -0,0 +1,86 @@
+"""
+Tiled High-Resolution Inference
+Far-away vehicles are only a few pixels tall at the model's default input
+size. Rather than running the whole frame at YOLO_INFERENCE_SIZE, the base
+detector runs:
+- the whole frame (or its ROI) once at a low resolution for the near field
+- overlapping tiles over the far-field region only, each at the resolution a
+  full YOLO_INFERENCE_SIZE pass would give it; tiles share one shape so they
+  go through the model as one batch
+Boxes from all passes are merged with a cross-tile NMS.
+"""
+import math
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+Box = Tuple[int, int, int, int]
+
+
+@dataclass
+class TilingConfig:
+    far_field: Tuple[float, float, float, float] = (0.15, 0.2, 0.85, 0.55)  # Normalised x1, y1, x2, y2
+    tile_size: int = 640        # Model input size of one tile
+    overlap: float = 0.2        # Fraction of a tile shared with its neighbour
+    near_size: int = 640        # Model input size of the low-resolution full-frame pass
+    merge_threshold: float = 0.6  # Intersection-over-smaller above which two boxes are the same object
+
+    def tiles(self, frame_shape, hires_size: int, box: Optional[Box] = None) -> List[Box]:
+        """
+        Tile boxes (frame pixels) covering the far field, clipped to `box`.
+        Each tile spans tile_size pixels at the scale of a `hires_size` pass.
+        """
+        height, width = frame_shape[:2]
+        x1, y1, x2, y2 = box or (0, 0, width, height)
+        fx1, fy1, fx2, fy2 = self.far_field
+        x1, x2 = max(x1, int(fx1 * width)), min(x2, int(fx2 * width))
+        y1, y2 = max(y1, int(fy1 * height)), min(y2, int(fy2 * height))
+        if x2 <= x1 or y2 <= y1:
+            return []
+
+        extent = max(1, int(self.tile_size * max(height, width) / hires_size))
+        xs = _spans(x1, x2, extent, self.overlap)
+        ys = _spans(y1, y2, extent, self.overlap)
+        return [(ax, ay, bx, by) for ay, by in ys for ax, bx in xs]
+
+
+def _spans(start: int, end: int, extent: int, overlap: float) -> List[Tuple[int, int]]:
+    """Evenly spaced [a, b) windows of length `extent` covering [start, end)."""
+    length = end - start
+    if length <= extent:
+        return [(start, end)]
+    step = extent * (1.0 - overlap)
+    count = math.ceil((length - extent) / step) + 1
+    offsets = np.linspace(start, end - extent, count).astype(int)
+    return [(int(a), int(a) + extent) for a in offsets]
+
+
+def merge_boxes(xyxy: np.ndarray, confs: np.ndarray, threshold: float,
+                classes: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Greedy NMS across passes, by intersection over the smaller box: a vehicle
+    cut in half by a tile edge overlaps most of its full-frame box but has a
+    low IoU with it. With `classes`, only boxes of the same class suppress
+    each other (a motorcycle beside a bus lies inside the bus box).
+    Returns the indices to keep, highest confidence first.
+    """
+    if len(xyxy) == 0:
+        return np.zeros(0, dtype=int)
+    areas = np.clip(xyxy[:, 2] - xyxy[:, 0], 0, None) * np.clip(xyxy[:, 3] - xyxy[:, 1], 0, None)
+    order = np.argsort(-confs)
+    keep = []
+    while len(order):
+        i, rest = order[0], order[1:]
+        keep.append(i)
+        ix1 = np.maximum(xyxy[i, 0], xyxy[rest, 0])
+        iy1 = np.maximum(xyxy[i, 1], xyxy[rest, 1])
+        ix2 = np.minimum(xyxy[i, 2], xyxy[rest, 2])
+        iy2 = np.minimum(xyxy[i, 3], xyxy[rest, 3])
+        inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+        smaller = np.minimum(areas[i], areas[rest]) + 1e-6
+        distinct = inter / smaller < threshold
+        if classes is not None:
+            distinct |= classes[rest] != classes[i]
+        order = rest[distinct]
+    return np.array(keep, dtype=int)
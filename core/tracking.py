@@ -0,0 +1,303 @@
+"""
+Tracker Backends
+The processor and the standalone adapter talk to the tracker through one
+interface (update / predict / get_state / set_state, returning TrackView
+snapshots), selected per camera with TRACKER / CAMERA_TRACKERS:
+- "deepsort":  deep_sort_realtime (Kalman + CNN appearance embedding per
+               detection; robust to occlusion but often as costly as YOLO on CPU)
+- "bytetrack": motion-only, fully vectorised (ByteTrack-style): all track
+               states live in stacked NumPy arrays, Kalman predict/update is
+               batched, association is IoU-based with a first pass on
+               high-confidence detections and a second pass that lets
+               low-confidence detections keep existing tracks alive
+Detections are in tracker-input format: [[left, top, w, h], conf, class].
+"""
+import copy
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config import settings
+from core.pipeline import TrackView
+
+
+class BaseTracker(ABC):
+    @abstractmethod
+    def update(self, detections: List, frame=None) -> List[TrackView]:
+        """Associate this frame's detections; returns snapshots of the live tracks."""
+
+    @abstractmethod
+    def predict(self) -> List[TrackView]:
+        """Motion-only advance (frame not decoded / not detected)."""
+
+    @abstractmethod
+    def get_state(self) -> Dict:
+        """Copy of the running state (for checkpoints)."""
+
+    @abstractmethod
+    def set_state(self, state: Dict):
+        pass
+
+
+class DeepSortTracker(BaseTracker):
+    def __init__(self, max_age: int = 30, n_init: int = 3, **kwargs):
+        # Imported here: deep_sort_realtime pulls in torch
+        from deep_sort_realtime.deepsort_tracker import DeepSort
+        self.tracker = DeepSort(max_age=max_age, n_init=n_init, **kwargs)
+
+    def update(self, detections, frame=None):
+        return [TrackView.from_track(t) for t in self.tracker.update_tracks(detections, frame=frame)]
+
+    def predict(self):
+        self.tracker.tracker.predict()
+        return [TrackView.from_track(t) for t in self.tracker.tracker.tracks]
+
+    def get_state(self):
+        # The embedder is not state: tracks (Kalman state), next id, appearance gallery
+        inner = self.tracker.tracker
+        return copy.deepcopy({
+            "tracks": inner.tracks,
+            "next_id": inner._next_id,
+            "samples": inner.metric.samples,
+        })
+
+    def set_state(self, state):
+        inner = self.tracker.tracker
+        inner.tracks = state["tracks"]
+        inner._next_id = state["next_id"]
+        inner.metric.samples = state["samples"]
+
+
+# ==================== VECTORISED KALMAN (x, y, aspect, height) ====================
+# Constant-velocity model and noise scaling as in DeepSort / ByteTrack
+_STD_POSITION = 1.0 / 20
+_STD_VELOCITY = 1.0 / 160
+_F = np.eye(8)
+_F[:4, 4:] = np.eye(4)
+_H = np.eye(4, 8)
+
+
+def _ltwh_to_xyah(ltwh: np.ndarray) -> np.ndarray:
+    xyah = ltwh.astype(float).copy()
+    xyah[:, :2] += xyah[:, 2:] / 2
+    xyah[:, 2] /= np.maximum(xyah[:, 3], 1e-6)
+    return xyah
+
+
+def _xyah_to_ltrb(xyah: np.ndarray) -> np.ndarray:
+    w = xyah[:, 2] * xyah[:, 3]
+    h = xyah[:, 3]
+    return np.stack([xyah[:, 0] - w / 2, xyah[:, 1] - h / 2,
+                     xyah[:, 0] + w / 2, xyah[:, 1] + h / 2], axis=1)
+
+
+def _diag(std: np.ndarray) -> np.ndarray:
+    """(N, d) standard deviations -> (N, d, d) diagonal covariances"""
+    out = np.zeros(std.shape + (std.shape[1],))
+    idx = np.arange(std.shape[1])
+    out[:, idx, idx] = std ** 2
+    return out
+
+
+def kalman_initiate(xyah: np.ndarray):
+    h = xyah[:, 3]
+    mean = np.concatenate([xyah, np.zeros_like(xyah)], axis=1)
+    p, v = 2 * _STD_POSITION * h, 10 * _STD_VELOCITY * h
+    std = np.stack([p, p, np.full_like(h, 1e-2), p, v, v, np.full_like(h, 1e-5), v], axis=1)
+    return mean, _diag(std)
+
+
+def kalman_predict(mean: np.ndarray, cov: np.ndarray):
+    h = mean[:, 3]
+    p, v = _STD_POSITION * h, _STD_VELOCITY * h
+    std = np.stack([p, p, np.full_like(h, 1e-2), p, v, v, np.full_like(h, 1e-5), v], axis=1)
+    mean = mean @ _F.T
+    cov = np.einsum("ij,njk,lk->nil", _F, cov, _F) + _diag(std)
+    return mean, cov
+
+
+def kalman_update(mean: np.ndarray, cov: np.ndarray, xyah: np.ndarray):
+    h = mean[:, 3]
+    p = _STD_POSITION * h
+    R = _diag(np.stack([p, p, np.full_like(h, 1e-1), p], axis=1))
+    projected = mean @ _H.T
+    S = np.einsum("ij,njk,lk->nil", _H, cov, _H) + R
+    PHt = np.einsum("nij,kj->nik", cov, _H)                      # (N, 8, 4)
+    gain = np.linalg.solve(S, PHt.transpose(0, 2, 1)).transpose(0, 2, 1)  # P H^T S^-1 (S symmetric)
+    mean = mean + np.einsum("nij,nj->ni", gain, xyah - projected)
+    cov = cov - np.einsum("nij,njk,nlk->nil", gain, S, gain)
+    return mean, cov
+
+
+def iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (N, 4) and (M, 4) ltrb boxes."""
+    if len(a) == 0 or len(b) == 0:
+        return np.zeros((len(a), len(b)))
+    ix1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    iy1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    ix2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    iy2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(ix2 - ix1, 0, None) * np.clip(iy2 - iy1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return inter / (area_a[:, None] + area_b[None, :] - inter + 1e-9)
+
+
+def _match(iou: np.ndarray, min_iou: float):
+    """Optimal assignment on 1 - IoU; returns (matched pairs, unmatched rows, unmatched cols)."""
+    from scipy.optimize import linear_sum_assignment
+
+    rows, cols = np.arange(iou.shape[0]), np.arange(iou.shape[1])
+    if iou.size == 0:
+        return np.zeros((0, 2), dtype=int), rows, cols
+    r, c = linear_sum_assignment(-iou)
+    keep = iou[r, c] >= min_iou
+    pairs = np.stack([r[keep], c[keep]], axis=1)
+    return pairs, np.setdiff1d(rows, pairs[:, 0]), np.setdiff1d(cols, pairs[:, 1])
+
+
+class ByteTracker(BaseTracker):
+    """
+    Motion-only tracker over stacked arrays (one row per track).
+    Tracks are tentative until `n_init` consecutive hits and deleted after
+    `max_age` frames without a match (tentative ones at their first miss).
+    """
+    _ARRAYS = ("ids", "mean", "cov", "hits", "misses", "confirmed", "det_class", "det_conf")
+
+    def __init__(self, max_age: int = 30, n_init: int = 3, high_thresh: float = 0.5,
+                 new_track_thresh: float = 0.6, match_iou: float = 0.2,
+                 low_match_iou: float = 0.5, tentative_match_iou: float = 0.3):
+        self.max_age = max_age
+        self.n_init = n_init
+        self.high_thresh = high_thresh
+        self.new_track_thresh = new_track_thresh
+        self.match_iou = match_iou
+        self.low_match_iou = low_match_iou
+        self.tentative_match_iou = tentative_match_iou
+        self.next_id = 1
+        self._predicted = 0  # predict() calls since the last update()
+        self.ids = np.zeros(0, dtype=int)
+        self.mean = np.zeros((0, 8))
+        self.cov = np.zeros((0, 8, 8))
+        self.hits = np.zeros(0, dtype=int)
+        self.misses = np.zeros(0, dtype=int)       # Frames since the last match
+        self.confirmed = np.zeros(0, dtype=bool)
+        self.det_class = np.zeros(0, dtype=int)
+        self.det_conf = np.zeros(0)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _views(self) -> List[TrackView]:
+        ltrb = _xyah_to_ltrb(self.mean[:, :4])
+        return [TrackView(str(i), tuple(float(v) for v in box), int(c), float(p), bool(ok))
+                for i, box, c, p, ok in zip(self.ids, ltrb, self.det_class, self.det_conf, self.confirmed)]
+
+    def _advance(self):
+        if len(self):
+            self.mean, self.cov = kalman_predict(self.mean, self.cov)
+        self.misses += 1
+
+    def predict(self):
+        # Tracks are only deleted on update(), as in DeepSort
+        self._advance()
+        self._predicted += 1
+        return self._views()
+
+    def update(self, detections, frame=None):
+        self._advance()
+        lag, self._predicted = self._predicted + 1, 0  # Frames since the previous update
+        if detections:
+            boxes = np.array([d[0] for d in detections], dtype=float).reshape(-1, 4)
+            confs = np.array([d[1] for d in detections], dtype=float)
+            classes = np.array([d[2] for d in detections], dtype=int)
+        else:
+            boxes, confs, classes = np.zeros((0, 4)), np.zeros(0), np.zeros(0, dtype=int)
+        xyah = _ltwh_to_xyah(boxes)
+        det_ltrb = np.concatenate([boxes[:, :2], boxes[:, :2] + boxes[:, 2:]], axis=1)
+        track_ltrb = _xyah_to_ltrb(self.mean[:, :4])
+
+        high = np.flatnonzero(confs >= self.high_thresh)
+        low = np.flatnonzero(confs < self.high_thresh)
+        confirmed = np.flatnonzero(self.confirmed)
+        tentative = np.flatnonzero(~self.confirmed)
+        matches = []
+
+        # 1. High-confidence detections vs confirmed tracks (including lost ones)
+        pairs, rest_tracks, rest_high = _match(iou_matrix(track_ltrb[confirmed], det_ltrb[high]), self.match_iou)
+        matches += [(confirmed[t], high[d]) for t, d in pairs]
+        rest_tracks, rest_high = confirmed[rest_tracks], high[rest_high]
+
+        # 2. Low-confidence detections keep tracks matched on the previous update alive (occlusion, blur)
+        recent = rest_tracks[self.misses[rest_tracks] <= lag]
+        pairs, _, _ = _match(iou_matrix(track_ltrb[recent], det_ltrb[low]), self.low_match_iou)
+        matches += [(recent[t], low[d]) for t, d in pairs]
+
+        # 3. Tentative tracks vs leftover high-confidence detections
+        pairs, _, unmatched = _match(iou_matrix(track_ltrb[tentative], det_ltrb[rest_high]),
+                                     self.tentative_match_iou)
+        matches += [(tentative[t], rest_high[d]) for t, d in pairs]
+        rest_high = rest_high[unmatched]
+
+        if matches:
+            t_idx, d_idx = (np.array(v) for v in zip(*matches))
+            self.mean[t_idx], self.cov[t_idx] = kalman_update(self.mean[t_idx], self.cov[t_idx], xyah[d_idx])
+            self.hits[t_idx] += 1
+            self.misses[t_idx] = 0
+            self.det_class[t_idx] = classes[d_idx]
+            self.det_conf[t_idx] = confs[d_idx]
+            self.confirmed[t_idx] |= self.hits[t_idx] >= self.n_init
+
+        self._prune()
+        self._spawn(xyah[rest_high], confs[rest_high], classes[rest_high])
+        return self._views()
+
+    def _spawn(self, xyah, confs, classes):
+        keep = confs >= self.new_track_thresh
+        count = int(keep.sum())
+        if not count:
+            return
+        mean, cov = kalman_initiate(xyah[keep])
+        self.ids = np.concatenate([self.ids, np.arange(self.next_id, self.next_id + count)])
+        self.next_id += count
+        self.mean = np.concatenate([self.mean, mean])
+        self.cov = np.concatenate([self.cov, cov])
+        self.hits = np.concatenate([self.hits, np.ones(count, dtype=int)])
+        self.misses = np.concatenate([self.misses, np.zeros(count, dtype=int)])
+        self.confirmed = np.concatenate([self.confirmed, np.full(count, self.n_init <= 1)])
+        self.det_class = np.concatenate([self.det_class, classes[keep]])
+        self.det_conf = np.concatenate([self.det_conf, confs[keep]])
+
+    def _prune(self):
+        # Confirmed: up to max_age frames unmatched | tentative: must match every update
+        alive = np.where(self.confirmed, self.misses <= self.max_age, self.misses == 0)
+        if not alive.all():
+            for name in self._ARRAYS:
+                setattr(self, name, getattr(self, name)[alive])
+
+    def get_state(self):
+        state = {name: getattr(self, name).copy() for name in self._ARRAYS}
+        state["next_id"] = self.next_id
+        return state
+
+    def set_state(self, state):
+        for name in self._ARRAYS:
+            setattr(self, name, state[name].copy())
+        self.next_id = state["next_id"]
+
+
+TRACKERS = {
+    "deepsort": DeepSortTracker,
+    "bytetrack": ByteTracker,
+}
+
+
+def build_tracker(name: Optional[str] = None, camera_id: Optional[str] = None, **kwargs) -> BaseTracker:
+    """Tracker for `camera_id` (CAMERA_TRACKERS, else TRACKER) unless `name` is given."""
+    name = name or settings.CAMERA_TRACKERS.get(camera_id, settings.TRACKER)
+    if name not in TRACKERS:
+        raise KeyError(f"Unknown tracker '{name}'. Expected one of {list(TRACKERS)}")
+    options = {"max_age": settings.TRACKER_MAX_AGE, "n_init": settings.TRACKER_N_INIT}
+    options.update(kwargs)
+    return TRACKERS[name](**options)
@@ -3,225 +3,593 @@ Unified Video Processing Service
 Handles video processing with Optimized Architecture (Shared Detection)
 """
 import cv2
+import numpy as np
 import time
 import threading
-import queue
-from typing import List, Optional, Callable
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Callable
+from dataclasses import dataclass, field
 from core.events import Event
 from core.event_bus import bus
 from core.vehicle_registry import VehicleRegistry
+from core.pipeline import Pipeline, FramePacket, TrackSnapshot
+from core.detection import VehicleDetector
+from core.pacing import Pacer
+from core.metrics import PipelineMetrics
+from core.frame_ring import FrameRing
+from core.overlay import Overlay, render
+from core.roi import build_regions
+from core.frame_context import FrameContext
+from core.motion_gate import MotionGate
+from core.stride import StrideScheduler
+from core.specialist_scheduler import SpecialistScheduler
+from core.checkpoint import Checkpoint, Checkpointer, checkpoint_path
+from core.clock import Clock, FrameTimes, clock_mode
+from core.tracking import build_tracker
 from config import settings
-from ultralytics import YOLO
+from core.model_registry import get_model, get_model_registry
 
 # Detectors
-from detectors.speed_specialist import SpeedSpecialist
-from detectors.wrong_way_specialist import WrongWaySpecialist
-from detectors.emergency_specialist import EmergencySpecialist
-from detectors.reid_specialist import ReIDSpecialist
-from detectors.pothole_specialist import PotholeSpecialist
-from detectors.base_specialist import BaseSpecialist
-
-# Tracker
-# Using a simple SORT/DeepSort wrapper logic here for demonstration 
-# or importing existing tracking logic if available.
-# To allow "One Frame One Detection", we integrate tracking here.
-from deep_sort_realtime.deepsort_tracker import DeepSort
+from detectors.factory import SPECIALIST_PATHS, build_specialist, specialist_class
+from core.process_pool import SpecialistProcessPool, replay_registry_ops
 
 @dataclass
 class ProcessingStatus:
     is_processing: bool = False
     current_frame: int = 0
     total_frames: int = 0
-    fps: float = 30.0
+    fps: float = 0.0                # Rolling throughput (frames/s leaving the sink)
     events_detected: int = 0
-    processing_time: float = 0.0
+    processing_time: float = 0.0    # Seconds since processing started
     last_update: float = 0.0
+    stage_latency: Dict[str, Dict[str, float]] = field(default_factory=dict)  # stage -> p50/p95/p99 (ms)
+    queue_depths: Dict[str, int] = field(default_factory=dict)
+    stage_errors: int = 0           # Packets lost because a stage handler raised
 
 class UnifiedVideoProcessor:
-    def __init__(self):
+    def __init__(self, camera_id: str = "CAM_01", detector=None, batch_size: Optional[int] = None,
+                 pacing: Optional[str] = None):
+        """
+        Args:
+            camera_id: Stamped on every event produced by this stream
+            detector: Shared base detector (e.g. from StreamManager). When None,
+                      the processor loads its own base YOLO model.
+            batch_size: Frames per base-inference batch (None = from settings)
+            pacing: "realtime", "source-fps" or "max" (None = from settings)
+        """
+        self.camera_id = camera_id
         self.status = ProcessingStatus()
-        self.registry = VehicleRegistry()
+        # Video time for files, wall time for live sources (core/clock.py)
+        self.clock = Clock()
+        self.frame_times = FrameTimes()
+        self.registry = VehicleRegistry(clock=self.clock)
         
         # 1. Base Detector (YOLO) - The "Eye"
-        print("[Processor] Loading Base YOLO Model...")
-        self.base_model = YOLO("yolo11n.pt") 
+        if detector is None:
+            print("[Processor] Loading Base YOLO Model...")
+            self.base_model = get_model(settings.YOLO_MODEL_PATH)
+            detector = VehicleDetector.from_settings(self.base_model)
+        self.detector = detector
         
-        # 2. Base Tracker
-        self.tracker = DeepSort(max_age=30, n_init=3)
+        # Micro-batching of base inference (offline / throughput mode)
+        if batch_size is None:
+            batch_size = settings.BASE_BATCH_SIZE if settings.BATCH_INFERENCE else 1
+        self.batch_size = max(1, batch_size)
+        
+        # Region-of-interest crops per model ("base" or a specialist name)
+        self.regions = build_regions(settings.ROI_REGIONS.get(camera_id, {}))
+        
+        # 2. Base Tracker (per camera: TRACKER / CAMERA_TRACKERS, see core/tracking.py)
+        # To allow "One Frame One Detection", we integrate tracking here.
+        self.tracker = build_tracker(camera_id=camera_id)
         
         # 3. Specialists
+        # Pooled specialists live in worker processes (built by the pool on
+        # first start); the rest run in-process on the analyze stage.
+        # Workers have no registry state, so trajectory readers stay in-process.
+        self.pooled_specialists = []
+        for name in settings.PROCESS_POOL_SPECIALISTS:
+            if name not in SPECIALIST_PATHS:
+                continue
+            if specialist_class(name).USES_TRAJECTORY:
+                print(f"[Processor] {name} reads registry trajectories: running it in-process, not pooled")
+                continue
+            self.pooled_specialists.append(name)
         self.specialists = {
-            "speed": SpeedSpecialist(),
-            "wrong_way": WrongWaySpecialist(),
-            "emergency": EmergencySpecialist(), 
-            "reid": ReIDSpecialist(),
-            "pothole": PotholeSpecialist()
+            name: build_specialist(name, **self._specialist_options(name))
+            for name in SPECIALIST_PATHS if name not in self.pooled_specialists
         }
+        self.process_pool = None
         
         self.cap = None
         self.stop_event = threading.Event()
-        self.frame_queue = queue.Queue(maxsize=30)
-        self.processing_thread = None
+        self.frame_ring = FrameRing(max_bytes=settings.FRAME_RING_MAX_MB * 1024 * 1024,
+                                    max_slots=settings.FRAME_RING_SLOTS)
+        self.pipeline = None
         self.stats_lock = threading.Lock()
+        self._next_frame_id = 0
+        self.pacer = Pacer(pacing or settings.PACING_MODE)
+        self.metrics = PipelineMetrics()
+        self._started_at = 0.0
+        self.stride = StrideScheduler(max_stride=settings.MAX_FRAME_STRIDE,
+                                      enabled=settings.ADAPTIVE_STRIDE)
+        self.scheduler = SpecialistScheduler.from_settings(settings.SPECIALIST_POLICIES)
+        # A gated run longer than the tracker's max age would drop every track
+        # (with adaptive stride, each gated frame may follow stride-1 predicted ones)
+        stride = settings.MAX_FRAME_STRIDE if settings.ADAPTIVE_STRIDE else 1
+        max_skip = min(settings.MOTION_GATE_MAX_SKIP, max(0, (settings.TRACKER_MAX_AGE - 1) // stride))
+        if settings.MOTION_GATE and max_skip < settings.MOTION_GATE_MAX_SKIP:
+            print(f"[Processor] MOTION_GATE_MAX_SKIP capped at {max_skip} (TRACKER_MAX_AGE={settings.TRACKER_MAX_AGE})")
+        self.gate = MotionGate(min_changed=settings.MOTION_GATE_MIN_CHANGED,
+                               pixel_delta=settings.MOTION_GATE_PIXEL_DELTA,
+                               max_skip=max_skip,
+                               enabled=settings.MOTION_GATE)
+        self.end_frame = None
+        self.source = None
+        self.checkpointer = None
+        self._replayed_through = 0  # Events of frames up to here were already published
+        self.set_callbacks()
+        
+    def _specialist_options(self, name):
+        return {"roi": self.regions[name]} if name in self.regions else {}
         
-    def load_video(self, source):
+    def load_video(self, source, start_frame: int = 0, end_frame: Optional[int] = None):
+        """
+        Open a video source. For files, [start_frame, end_frame) restricts
+        processing to a segment; frame ids stay absolute (frame index + 1).
+        """
         try:
-            if isinstance(source, str):
+            if isinstance(source, (str, int)):
+                self.source = source
+                self._replayed_through = 0
                 self.cap = cv2.VideoCapture(source)
                 if self.cap.isOpened():
                     self.status.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+                    self.pacer.source_fps = self.cap.get(cv2.CAP_PROP_FPS)
+                    self.frame_times = FrameTimes(clock_mode(source), fps=self.pacer.source_fps)
+                    if start_frame > 0:
+                        self.cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+                    self._next_frame_id = start_frame
+                    self.end_frame = end_frame
                     return True
         except Exception as e:
             print(f"[ERROR] Load Video: {e}")
         return False
     
+    def set_callbacks(self, frame_callback=None, event_callback=None, track_callback=None):
+        """
+        Optional hooks called from the sink stage, in frame order:
+            frame_callback(frame, events), event_callback(events),
+            track_callback(frame_id, tracks)
+        """
+        self.frame_callback = frame_callback
+        self.event_callback = event_callback
+        self.track_callback = track_callback
+    
+    def enable_checkpoints(self, source, interval: Optional[int] = None, path: Optional[str] = None):
+        """
+        Periodically checkpoint the running state while processing `source`
+        (see core/checkpoint.py). Returns the Checkpointer.
+        """
+        if self.pooled_specialists:
+            print(f"[Processor] Checkpoints do not include pooled specialists "
+                  f"({', '.join(self.pooled_specialists)}); they restart empty on resume")
+        self.checkpointer = Checkpointer(path or checkpoint_path(str(source), self.camera_id),
+                                         interval or settings.CHECKPOINT_INTERVAL)
+        return self.checkpointer
+    
+    def restore(self, checkpoint: Checkpoint):
+        """
+        Continue from a checkpoint: call after load_video(source,
+        start_frame=checkpoint.frame_id) and before start_processing().
+        """
+        if self.frame_times.video and checkpoint.clock_origin is not None:
+            # Same timebase as the interrupted run: video time needs no shift
+            self.frame_times.origin = checkpoint.clock_origin
+            time_shift = 0.0
+        else:
+            time_shift = time.time() - checkpoint.saved_at
+        self.tracker.set_state(checkpoint.tracker)
+        self.registry.set_state(checkpoint.registry, time_shift)
+        for name, state in checkpoint.specialists.items():
+            if name in self.specialists:
+                self.specialists[name].set_state(state, time_shift)
+        # Frames published after the checkpoint are replayed silently: their
+        # events count as already detected (the sidecar mark carries the total)
+        published_through, published_events = self.checkpointer.published() if self.checkpointer else (0, None)
+        self.status.events_detected = checkpoint.events_detected
+        if published_through > checkpoint.frame_id and published_events is not None:
+            self.status.events_detected = published_events
+        self._replayed_through = max(checkpoint.frame_id, published_through)
+        print(f"[Processor] Resumed {self.camera_id} at frame {checkpoint.frame_id + 1}"
+              f" ({len(checkpoint.registry)} vehicles)")
+    
+    def set_pacing(self, mode: str):
+        """Switch pacing policy ("realtime", "source-fps" or "max")"""
+        self.pacer = Pacer(mode, source_fps=self.pacer.source_fps)
+    
     def start_processing(self):
         if not self.cap or not self.cap.isOpened(): return False
         self.stop_event.clear()
         self.status.is_processing = True
-        self.processing_thread = threading.Thread(target=self._processing_loop, daemon=True)
-        self.processing_thread.start()
+        self.pacer.reset()
+        self.stride.reset()
+        self.scheduler.reset()
+        self.gate.reset()
+        if self.pooled_specialists and self.process_pool is None:
+            self.process_pool = SpecialistProcessPool(
+                self.pooled_specialists,
+                slots=settings.PROCESS_POOL_SLOTS,
+                timeout=settings.PROCESS_POOL_TIMEOUT,
+                start_method=settings.PROCESS_POOL_START_METHOD,
+                options={name: self._specialist_options(name) for name in self.pooled_specialists},
+            )
+        elif self.process_pool is not None:
+            self.process_pool.reset()
+        self.metrics = PipelineMetrics()
+        self._started_at = time.time()
+        
+        # decode -> base detection -> tracking -> [offload] -> specialists/rules -> sink
+        # With pooled specialists, the offload stage submits frames to the
+        # workers ahead of analysis, so they work on frame N+1 while the
+        # analyze stage finishes frame N.
+        stages = [
+            ("decode", self._decode_stage),
+            ("detect", self._detect_stage,
+             {"batch_size": self.batch_size, "max_wait": settings.BASE_BATCH_MAX_WAIT}),
+            ("track", self._track_stage),
+        ]
+        if self.process_pool is not None:
+            stages.append(("offload", self._offload_stage))
+        stages += [
+            ("analyze", self._analyze_stage),
+            ("sink", self._sink_stage),
+        ]
+        self.pipeline = Pipeline(stages, queue_size=max(settings.PIPELINE_QUEUE_SIZE, self.batch_size),
+                                 on_complete=self._on_pipeline_complete)
+        self.pipeline.start()
         return True
     
     def stop_processing(self):
         self.stop_event.set()
-        if self.processing_thread: self.processing_thread.join(timeout=2)
+        if self.pipeline: self.pipeline.stop(timeout=2)
         if self.cap: self.cap.release()
-            
-    def _processing_loop(self):
-        while not self.stop_event.is_set() and self.cap.isOpened():
+        if self.checkpointer: self.checkpointer.flush()
+        self.status.is_processing = False
+
+    def _on_pipeline_complete(self):
+        self.status.is_processing = False
+        # Ran to the end of the source: nothing left to resume
+        if self.checkpointer and not self.stop_event.is_set():
+            self.checkpointer.clear()
+    
+    def wait(self, timeout: Optional[float] = None):
+        """Block until the current run has drained (or timeout seconds pass)"""
+        deadline = None if timeout is None else time.time() + timeout
+        while self.status.is_processing:
+            if deadline is not None and time.time() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    # ==================== PIPELINE STAGES ====================
+    def _decode_stage(self):
+        """Source stage: read the next frame (None ends the stream)"""
+        if self.stop_event.is_set() or not self.cap.isOpened():
+            return None
+        
+        # FPS Control (see core/pacing.py)
+        self.pacer.wait()
+        
+        frame_id = self._next_frame_id + 1
+        if self.end_frame is not None and frame_id > self.end_frame:
+            return None
+        self.stride.update(self.pacer.target_fps)
+        run_detection = self.stride.should_detect(frame_id)
+        
+        start = time.perf_counter()
+        if run_detection:
             ret, frame = self.cap.read()
-            if not ret: break
-            
-            self.status.current_frame += 1
-            start = time.time()
-            
-            # --- LEVEL 1: BASE DETECTION (Run ONCE) ---
-            # Detect vehicles (2=Car, 3=Motorcycle, 5=Bus, 7=Truck)
-            results = self.base_model(frame, classes=[2,3,5,7], verbose=False, conf=0.4)[0]
-            
-            # Format for Tracker: [[left, top, w, h], conf, detection_class]
-            detections = []
-            for box in results.boxes:
-                x1, y1, x2, y2 = map(int, box.xyxy[0])
-                w, h = x2-x1, y2-y1
-                conf = float(box.conf[0])
-                cls = int(box.cls[0])
-                detections.append([[x1, y1, w, h], conf, cls])
-                
-            # --- LEVEL 2: TRACKING ---
-            tracks = self.tracker.update_tracks(detections, frame=frame)
-            
-            # Update Registry with all tracks
-            for track in tracks:
-                if not track.is_confirmed(): continue
-                
-                track_id = track.track_id
-                ltrb = track.to_ltrb()
-                x1, y1, x2, y2 = map(int, ltrb)
-                w, h = x2 - x1, y2 - y1
-                
-                # Update vehicle state in registry
-                self.registry.update_vehicle(track_id, [x1, y1, w, h])
-            
-            # --- LEVEL 3: SPECIALISTS (Pure Logic Units) ---
-            active_events = []
-            
-            # 3.1 Speed Specialist
-            try:
-                speed_events = self.specialists['speed'].process(
-                    frame, self.status.current_frame, 
-                    registry=self.registry, tracks=tracks
-                )
-                active_events.extend(speed_events)
-            except Exception as e:
-                print(f"[ERROR] SpeedSpecialist: {e}")
-            
-            # 3.2 WrongWay Specialist
-            try:
-                wrongway_events = self.specialists['wrong_way'].process(
-                    frame, self.status.current_frame,
-                    registry=self.registry, tracks=tracks
-                )
-                active_events.extend(wrongway_events)
-            except Exception as e:
-                print(f"[ERROR] WrongWaySpecialist: {e}")
-            
-            # 3.3 Emergency Specialist
-            try:
-                emergency_events = self.specialists['emergency'].process(
-                    frame, self.status.current_frame,
-                    registry=self.registry, tracks=tracks
-                )
-                active_events.extend(emergency_events)
-            except Exception as e:
-                print(f"[ERROR] EmergencySpecialist: {e}")
-            
-            # 3.4 ReID Specialist
-            try:
-                reid_events = self.specialists['reid'].process(
-                    frame, self.status.current_frame,
-                    registry=self.registry, tracks=tracks
+        else:
+            # In-between frame: skip the decode, the tracker will predict it
+            ret, frame = self.cap.grab(), None
+        if not ret: return None
+        self.metrics.record("decode", time.perf_counter() - start)
+        
+        # Nothing moved / frame repeated: the tracker only predicts this frame
+        gated = None
+        if frame is not None:
+            with self.metrics.measure("motion_gate"):
+                gated = self.gate.check(frame)
+            if gated:
+                self.metrics.count(f"frames_gated_{gated}")
+        
+        self._next_frame_id = frame_id
+        return FramePacket(frame_id=frame_id, frame=frame, decoded_at=time.perf_counter(),
+                           timestamp=self.frame_times.stamp(self.cap, frame_id),
+                           run_detection=run_detection and not gated, gated=gated,
+                           context=FrameContext(frame, frame_id) if frame is not None else None)
+
+    def _detect_stage(self, packets):
+        # --- LEVEL 1: BASE DETECTION (Run ONCE per frame, batched across frames) ---
+        to_detect = [p for p in packets if p.run_detection]
+        if not to_detect:
+            return packets
+        
+        start = time.perf_counter()
+        # Letterboxed tensors come from the frame's shared context (and are
+        # reused by any other model that runs at the same size on the same region)
+        roi = self.regions.get("base")
+        inputs = [self.detector.prepare(p.context, *(roi.region(p.frame) if roi else ()))
+                  for p in to_detect]
+        detections = self.detector.detect_batch(inputs)
+        
+        # Per-frame latency (amortised over the batch)
+        per_frame = (time.perf_counter() - start) / len(to_detect)
+        for packet, dets in zip(to_detect, detections):
+            packet.detections = dets
+            self.metrics.record("base_inference", per_frame)
+        self.stride.observe("detect", per_frame)
+        return packets
+
+    def _track_stage(self, packet):
+        # --- LEVEL 2: TRACKING ---
+        if not packet.run_detection:
+            # Motion-only advance: Kalman predict, no association / embedding
+            with self.metrics.measure("tracking_predict"):
+                packet.tracks = self.tracker.predict()
+            self.metrics.count("frames_predicted")
+        else:
+            start = time.perf_counter()
+            with self.metrics.measure("tracking"):
+                # TrackView snapshots: the tracker mutates its tracks on the next
+                # frame while downstream stages are still working on this one.
+                packet.tracks = self.tracker.update(packet.detections, frame=packet.frame)
+            self.stride.observe("track", time.perf_counter() - start)
+        
+        # Columnar geometry of the confirmed tracks, shared by everything downstream
+        packet.snapshot = TrackSnapshot.from_tracks(packet.tracks)
+        
+        # Checkpoint frame: the tracker is already ahead of analyze, so its
+        # state is captured here; analyze adds the rest for the same frame
+        if self.checkpointer and self.checkpointer.due(packet.frame_id):
+            packet.checkpoint = Checkpoint(source=str(self.source), camera_id=self.camera_id,
+                                           frame_id=packet.frame_id,
+                                           clock_origin=self.frame_times.origin if self.frame_times.video else None,
+                                           tracker=self.tracker.get_state())
+        return packet
+
+    def _run_specialist(self, name, frame, frame_id, **kwargs):
+        """Run one specialist, timing it and isolating its failures"""
+        specialist = self.specialists[name]
+        start = time.perf_counter()
+        try:
+            return specialist.process(frame, frame_id, **kwargs)
+        except Exception as e:
+            print(f"[ERROR] {type(specialist).__name__}: {e}")
+            return []
+        finally:
+            elapsed = time.perf_counter() - start
+            self.metrics.record(f"specialist.{name}", elapsed)
+            self.scheduler.record(name, elapsed)
+
+    def _plan_specialists(self, packet):
+        """
+        Cadence, budgets and priority load shedding: see SPECIALIST_POLICIES.
+        Speed / WrongWay are geometry only and also run on predicted frames;
+        Emergency, ReID and Pothole need decoded pixels, and new ones: they
+        are skipped on frames the motion gate found static or duplicated.
+        """
+        backlog = self.pipeline.queues["track"].qsize() if self.pipeline else 0
+        target_fps = self.pacer.target_fps
+        packet.plan = self.scheduler.plan(
+            packet.frame_id,
+            has_pixels=packet.frame is not None and not packet.gated,
+            overloaded=backlog >= settings.SPECIALIST_SHED_BACKLOG,
+            frame_budget_ms=1000.0 / target_fps if target_fps else None,
+        )
+        return packet.plan
+
+    def _offload_stage(self, packet):
+        # Hand the frame to the pooled specialists now; analyze collects the
+        # results once it reaches this frame
+        plan = self._plan_specialists(packet)
+        pooled = [name for name in plan if name in self.pooled_specialists]
+        if pooled:
+            packet.ticket = self.process_pool.submit(packet.frame, packet.frame_id, packet.snapshot,
+                                                     pooled, packet.timestamp)
+        return packet
+
+    def _analyze_stage(self, packet):
+        frame, frame_id, tracks = packet.frame, packet.frame_id, packet.snapshot
+        # Registry and specialists read this frame's time from the shared clock
+        self.clock.advance(packet.timestamp)
+        
+        # Update Registry with all confirmed tracks
+        with self.metrics.measure("registry_update"):
+            self.registry.update_vehicles(tracks.ids, np.hstack([tracks.boxes[:, :2], tracks.sizes]))
+        
+        # --- LEVEL 3: SPECIALISTS (Pure Logic Units) ---
+        active_events = []
+        overlay = Overlay(packet.overlay)
+        start = time.perf_counter()
+        
+        # Planned (and pooled work submitted) by the offload stage if there is one
+        plan = packet.plan if packet.plan is not None else self._plan_specialists(packet)
+        ticket = packet.ticket
+        pooled = ticket[2] if ticket else []
+        
+        for name in plan:
+            if name not in self.pooled_specialists:
+                active_events.extend(self._run_specialist(
+                    name, frame, frame_id, registry=self.registry, tracks=tracks,
+                    overlay=overlay, context=packet.context
+                ))
+        
+        # Merge worker results back in priority order (frame order is implicit:
+        # tickets are collected in the order the offload stage submitted them)
+        if ticket:
+            results = self.process_pool.collect(ticket)
+            for name in pooled:
+                if name not in results: continue
+                events, ops, commands, seconds, error = results[name]
+                if error:
+                    print(f"[ERROR] {name} (worker): {error}")
+                replay_registry_ops(self.registry, ops)
+                active_events.extend(events)
+                overlay.extend(commands)
+                self.metrics.record(f"specialist.{name}", seconds)
+                self.scheduler.record(name, seconds)
+        
+        # --- LEVEL 5: RULE ENGINE (Emergency Override) ---
+        # Get rule-based events from Registry: only vehicles a specialist
+        # updated this frame, or whose alert cooldown just ended
+        with self.metrics.measure("rule_engine"):
+            for e_dict in self.registry.evaluate_rules():
+                evt = Event(
+                    event_type=e_dict['type'],
+                    severity=e_dict['severity'],
+                    description=e_dict['description'],
+                    timestamp=packet.timestamp,
+                    camera_id=self.camera_id,
+                    metadata=e_dict.get('metadata', {})
                 )
-                active_events.extend(reid_events)
-            except Exception as e:
-                print(f"[ERROR] ReIDSpecialist: {e}")
+                active_events.append(evt)
+                packet.publish.append(evt)
             
-            # --- LEVEL 4: POTHOLE (Async / N-th frame) ---
-            if self.status.current_frame % 5 == 0:
+            # Cleanup old vehicles (and the specialists' per-track state)
+            expired = self.registry.cleanup()
+            if expired:
+                for specialist in self.specialists.values():
+                    specialist.forget(expired)
+                if self.process_pool is not None:
+                    self.process_pool.forget(expired)
+        
+        # Specialists don't know which stream / frame they serve
+        for evt in active_events:
+            evt.camera_id = self.camera_id
+            evt.timestamp = packet.timestamp
+            evt.metadata.setdefault("frame_id", frame_id)
+        
+        if packet.run_detection:
+            self.stride.observe("analyze", time.perf_counter() - start)
+        
+        if packet.checkpoint is not None:
+            packet.checkpoint.registry = self.registry.get_state()
+            packet.checkpoint.specialists = {name: s.get_state() for name, s in self.specialists.items()}
+        
+        packet.events = active_events
+        return packet
+
+    def _sink_stage(self, packet):
+        # Resumed run: frames re-processed after the checkpoint only rebuild
+        # state, their events went out before the restart
+        if packet.frame_id <= self._replayed_through:
+            packet.events, packet.publish = [], []
+        
+        # --- LEVEL 6: DISPATCH ---
+        with self.metrics.measure("event_dispatch"):
+            for evt in packet.publish:
+                bus.publish(evt)
+        
+        # Update Stats
+        with self.stats_lock:
+            self.status.current_frame = packet.frame_id
+            self.status.events_detected += len(packet.events)
+            events_detected = self.status.events_detected
+        if packet.publish and self.checkpointer:
+            self.checkpointer.mark_published(packet.frame_id, events_detected)
+        
+        # Events up to this frame are out: safe to checkpoint it
+        if packet.checkpoint is not None:
+            packet.checkpoint.events_detected = self.status.events_detected
+            with self.metrics.measure("checkpoint"):
                 try:
-                    pothole_events = self.specialists['pothole'].process(frame, self.status.current_frame)
-                    active_events.extend(pothole_events)
+                    self.checkpointer.save(packet.checkpoint)
                 except Exception as e:
-                    print(f"[ERROR] PotholeSpecialist: {e}")
-            
-            # --- LEVEL 5: RULE ENGINE (Emergency Override) ---
-            # Get rule-based events from Registry
-            # Only check vehicles that haven't been checked this frame
-            checked_vehicles = set()
-            for track_id in list(self.registry.vehicles.keys()):
-                if track_id in checked_vehicles:
-                    continue
-                checked_vehicles.add(track_id)
-                
-                rule_events = self.registry.check_rules_and_get_events(track_id)
-                for e_dict in rule_events:
-                    evt = Event(
-                        event_type=e_dict['type'],
-                        severity=e_dict['severity'],
-                        description=e_dict['description'],
-                        timestamp=self.status.current_frame,
-                        metadata=e_dict.get('metadata', {})
-                    )
-                    active_events.append(evt)
-                    bus.publish(evt)
-            
-            # Cleanup old vehicles
-            self.registry.cleanup()
-            
-            # Update Stats
-            with self.stats_lock:
-                self.status.events_detected += len(active_events)
-            
-            # Queue frame
-            try:
-                self.frame_queue.put_nowait(frame)
-            except: pass
-            
-            # FPS Control
-            time.sleep(max(0, 1/30 - (time.time() - start)))
+                    print(f"[ERROR] Checkpoint: {e}")
+        self.metrics.record("end_to_end", time.perf_counter() - packet.decoded_at)
+        self.metrics.frame_done()
+        
+        # User hooks (never let them break the pipeline)
+        try:
+            if self.track_callback:
+                self.track_callback(packet.frame_id, packet.tracks)
+            if self.event_callback and packet.events:
+                self.event_callback(packet.events)
+            if self.frame_callback and packet.frame is not None:
+                self.frame_callback(render(packet.frame, packet.overlay), packet.events)
+        except Exception as e:
+            print(f"[ERROR] Processor callback: {e}")
+        
+        # Publish raw frame + draw commands to readers (predicted frames were
+        # never decoded). Overlays are rendered only when a reader asks.
+        if packet.frame is not None:
+            self.frame_ring.write(packet.frame, meta=packet.overlay)
+        return packet
 
-    def get_frame(self):
-        try: return self.frame_queue.get_nowait()
-        except: return None
+    def _annotate(self, seq, frame):
+        commands = self.frame_ring.meta(seq)
+        return render(frame, commands) if commands else frame.copy()
+
+    def get_frame(self, annotated: bool = True):
+        """
+        Newest frame, or None. annotated=False returns a zero-copy view into the
+        frame ring; annotated=True renders the overlays onto a copy.
+        """
+        seq, frame = self.frame_ring.latest()
+        if frame is None or not annotated:
+            return frame
+        return self._annotate(seq, frame)
+    
+    def get_frames_since(self, seq: int, annotated: bool = True):
+        """
+        [(seq, frame)] written after `seq`, oldest first. Raw views stay valid
+        until the ring wraps around; gaps in seq mean the reader fell behind.
+        """
+        frames = self.frame_ring.since(seq)
+        if annotated:
+            frames = [(s, self._annotate(s, frame)) for s, frame in frames]
+        return frames
     
     def get_status(self):
         with self.stats_lock:
-             return self.status
+            if self.pipeline:
+                self.status.fps = self.metrics.current_fps()
+                self.status.processing_time = time.time() - self._started_at
+                self.status.last_update = time.time()
+                self.status.stage_latency = self.metrics.stage_summary()
+                self.status.queue_depths = self.pipeline.queue_depths() if self.pipeline else {}
+                self.status.stage_errors = self._stage_errors()
+            return self.status
+
+    def _stage_errors(self):
+        return sum(self.pipeline.error_counts().values()) if self.pipeline else 0
+
+    def get_metrics(self):
+        """
+        Machine-readable snapshot (JSON-serialisable) of throughput,
+        per-stage latency percentiles, queue depths and stage error counters.
+        """
+        status = self.get_status()
+        snapshot = self.metrics.snapshot()
+        snapshot.update({
+            "camera_id": self.camera_id,
+            "is_processing": status.is_processing,
+            "current_frame": status.current_frame,
+            "total_frames": status.total_frames,
+            "events_detected": status.events_detected,
+            "processing_time": round(status.processing_time, 2),
+            "queue_depths": dict(status.queue_depths),
+            "stage_errors": self.pipeline.error_counts() if self.pipeline else {},
+            "frame_stride": self.stride.stride,
+            "frame_ring": {"slots": self.frame_ring.slots, "bytes": self.frame_ring.nbytes,
+                           "head_seq": self.frame_ring.head},
+            "specialists": self.scheduler.report(),
+            "models": get_model_registry().report(),
+        })
+        return snapshot
 
-_processor_instance = None
 def get_processor():
-    global _processor_instance
-    if not _processor_instance: _processor_instance = UnifiedVideoProcessor()
-    return _processor_instance
+    """Default single-camera processor (kept for the dashboard and main.py)"""
+    from core.stream_manager import get_stream_manager
+    return get_stream_manager().get_or_create_stream("CAM_01")
@@ -1,27 +1,53 @@
+"""
+Vehicle Registry (Master Registry)
+Per-vehicle state is stored struct-of-arrays: each vehicle owns a slot and
+every attribute is a NumPy column indexed by slot (bbox, centroid, speed, flag
+bits, timestamps), plus a fixed-length ring buffer of its last centroids
+(trajectory). Freed slots are reused; the columns double when full.
+
+Vehicles are kept in last-seen order, so cleanup() only inspects the oldest
+ones and stops at the first vehicle still alive: it costs the number of
+expired vehicles, not the number of vehicles.
+
+The rule engine (core/rules.py) is event-driven: update_speed /
+update_wrong_way / mark_emergency mark a vehicle dirty, and evaluate_rules()
+only looks at dirty vehicles plus those whose alert cooldown just ran out
+(a min-heap of cooldown deadlines), never at the whole registry.
+"""
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Dict, Tuple
-import time
+from typing import List, Dict, Optional, Tuple
+import heapq
+import itertools
+
+import numpy as np
+
+from config import settings
+from core.clock import Clock
+from core.rules import EMERGENCY, WRONG_WAY, OVERSPEEDING, RuleSet
+
 
 @dataclass
 class VehicleState:
+    """Read-only view of one vehicle (see VehicleRegistry.get)"""
     id: int
     bbox: List[int] = field(default_factory=list) # [x, y, w, h]
     centroid: Tuple[int, int] = (0, 0)
-    
+
     # Classification
     is_emergency: bool = False
     emergency_type: str = "None" # "Ambulance", "Firetruck"
     vehicle_type: str = "Unknown"
-    
+
     # Analytics
     speed_kmh: float = 0.0
     lane_id: str = "Unknown"
     direction: str = "Unknown"
-    
+
     # Violations (Potential)
     is_wrong_way: bool = False
     is_overspeeding: bool = False
-    
+
     # Cooldowns
     last_alert_time: float = 0.0
     first_seen: float = 0.0
@@ -32,105 +58,263 @@ class VehicleRegistry:
     Central Logic Brain (Master Registry)
     Manages state for all vehicles and enforces Rule Engine Logic.
     """
-    def __init__(self):
-        self.vehicles: Dict[int, VehicleState] = {}
+    def __init__(self, capacity: Optional[int] = None, trajectory_length: Optional[int] = None,
+                 rules: Optional[RuleSet] = None, clock: Optional[Clock] = None):
         self.max_age = 2.0 # seconds to keep lost vehicles
         self.alert_cooldown = 5.0 # seconds between alerts for same vehicle
+        self.speed_limit = settings.RULE_SPEED_LIMIT
+        self.rules = rules or RuleSet.compile(settings.RULES)
+        self.clock = clock or Clock()  # Shared with the specialists (registry.clock)
+        self.trajectory_length = trajectory_length or settings.TRAJECTORY_LENGTH
+        self._reset_storage(capacity or settings.REGISTRY_CAPACITY)
+
+    def _columns(self) -> Dict[str, Tuple]:
+        """column name -> (dtype, per-vehicle shape)"""
+        return {
+            "ids": (object, ()),
+            "bbox": (np.int32, (4,)),
+            "centroid": (np.int32, (2,)),
+            "speed": (np.float32, ()),
+            "flags": (np.uint8, ()),
+            "emergency_type": (object, ()),
+            "vehicle_type": (object, ()),
+            "lane_id": (object, ()),
+            "first_seen": (np.float64, ()),
+            "last_seen": (np.float64, ()),
+            "last_alert": (np.float64, ()),
+            "trail": (np.int32, (self.trajectory_length, 2)),
+            "trail_len": (np.int32, ()),
+            "trail_head": (np.int32, ()),
+        }
+
+    def _reset_storage(self, capacity: int):
+        self.capacity = 0
+        self._slots: "OrderedDict[int, int]" = OrderedDict()  # track_id -> slot, least recently seen first
+        self._free: List[int] = []
+        self._dirty: Dict = {}  # track_ids to evaluate (dict: ordered set)
+        self._timers: List[Tuple[float, int, object]] = []  # heap of (cooldown end, seq, track_id)
+        self._scheduled: Dict = {}  # track_id -> cooldown end already in the heap
+        self._seq = itertools.count()  # heap tie-breaker
+        self._grow(max(1, capacity))
+
+    def _grow(self, capacity: int):
+        old = self.capacity
+        for name, (dtype, shape) in self._columns().items():
+            column = np.zeros((capacity,) + shape, dtype=dtype)
+            if old:
+                column[:old] = getattr(self, name)
+            setattr(self, name, column)
+        # Pop from the end: lowest free slot first
+        self._free.extend(range(capacity - 1, old - 1, -1))
+        self.capacity = capacity
+
+    def _touch(self, track_id, now: float) -> int:
+        """Slot of track_id (allocated if new), moved to the most recently seen end"""
+        slot = self._slots.get(track_id)
+        if slot is not None:
+            self._slots.move_to_end(track_id)
+            return slot
+
+        if not self._free:
+            self._grow(self.capacity * 2)
+        slot = self._free.pop()
+        self._slots[track_id] = slot
+        self.ids[slot] = track_id
+        self.bbox[slot] = 0
+        self.centroid[slot] = 0
+        self.speed[slot] = 0.0
+        self.flags[slot] = 0
+        self.emergency_type[slot] = "None"
+        self.lane_id[slot] = "Unknown"
+        self.first_seen[slot] = now
+        self.last_alert[slot] = 0.0
+        self.trail_len[slot] = 0
+        self.trail_head[slot] = 0
+        return slot
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, track_id):
+        return track_id in self._slots
+
+    def __iter__(self):
+        """Track ids, least recently seen first"""
+        return iter(list(self._slots))
 
     def update_vehicle(self, track_id, bbox, vehicle_type="Unknown"):
         """Update or create vehicle state from Tracker"""
-        now = time.time()
-        
-        if track_id not in self.vehicles:
-            self.vehicles[track_id] = VehicleState(
-                id=track_id, 
-                first_seen=now,
-                last_seen=now
-            )
-            
-        v = self.vehicles[track_id]
-        v.bbox = bbox
-        v.last_seen = now
-        v.vehicle_type = vehicle_type
-        
+        self.update_vehicles([track_id], [bbox], vehicle_type)
+        return self._slots[track_id]
+
+    def update_vehicles(self, track_ids, bboxes, vehicle_type="Unknown"):
+        """Batched update_vehicle for one frame's tracks (bboxes: (N, 4) x, y, w, h)"""
+        if not len(track_ids):
+            return
+        now = self.clock.now()
+        slots = np.fromiter((self._touch(t, now) for t in track_ids), dtype=np.intp, count=len(track_ids))
+        bboxes = np.asarray(bboxes, dtype=np.int32).reshape(-1, 4)
+
         # Calculate centroid
-        x, y, w, h = bbox
-        v.centroid = (int(x + w/2), int(y + h/2))
-        
-        return v
+        centroid = (bboxes[:, :2] + bboxes[:, 2:] / 2).astype(np.int32)
+
+        self.bbox[slots] = bboxes
+        self.centroid[slots] = centroid
+        self.last_seen[slots] = now
+        self.vehicle_type[slots] = vehicle_type
+
+        # Append to the trajectory rings
+        heads = self.trail_head[slots]
+        self.trail[slots, heads] = centroid
+        self.trail_head[slots] = (heads + 1) % self.trajectory_length
+        self.trail_len[slots] = np.minimum(self.trail_len[slots] + 1, self.trajectory_length)
+
+    def trajectory(self, track_id) -> np.ndarray:
+        """(n, 2) last centroids of a vehicle, oldest first (n <= trajectory_length)"""
+        slot = self._slots.get(track_id)
+        if slot is None:
+            return np.empty((0, 2), dtype=np.int32)
+        n, head = int(self.trail_len[slot]), int(self.trail_head[slot])
+        return self.trail[slot, (head - n + np.arange(n)) % self.trajectory_length]
+
+    def get(self, track_id) -> Optional[VehicleState]:
+        """Snapshot of one vehicle (None if unknown)"""
+        slot = self._slots.get(track_id)
+        if slot is None:
+            return None
+        flags = int(self.flags[slot])
+        return VehicleState(
+            id=track_id,
+            bbox=self.bbox[slot].tolist(),
+            centroid=tuple(self.centroid[slot].tolist()),
+            is_emergency=bool(flags & EMERGENCY),
+            emergency_type=self.emergency_type[slot],
+            vehicle_type=self.vehicle_type[slot],
+            speed_kmh=float(self.speed[slot]),
+            lane_id=self.lane_id[slot],
+            is_wrong_way=bool(flags & WRONG_WAY),
+            is_overspeeding=bool(flags & OVERSPEEDING),
+            last_alert_time=float(self.last_alert[slot]),
+            first_seen=float(self.first_seen[slot]),
+            last_seen=float(self.last_seen[slot]),
+        )
+
+    @property
+    def vehicles(self) -> Dict[int, VehicleState]:
+        """All vehicles as VehicleState snapshots (diagnostics; builds every view)"""
+        return {track_id: self.get(track_id) for track_id in self._slots}
 
     def mark_emergency(self, track_id, em_type):
         """Emergency Specialist Marks a vehicle"""
-        if track_id in self.vehicles:
-            self.vehicles[track_id].is_emergency = True
-            self.vehicles[track_id].emergency_type = em_type
+        slot = self._slots.get(track_id)
+        if slot is not None:
+            self.flags[slot] |= EMERGENCY
+            self.emergency_type[slot] = em_type
+            self._dirty[track_id] = None
 
     def update_speed(self, track_id, speed):
         """Speed Specialist updates speed"""
-        if track_id in self.vehicles:
-            self.vehicles[track_id].speed_kmh = speed
-            if speed > 80: # Hardcoded limit for now
-                self.vehicles[track_id].is_overspeeding = True
+        slot = self._slots.get(track_id)
+        if slot is not None:
+            self.speed[slot] = speed
+            if speed > self.speed_limit:
+                self.flags[slot] |= OVERSPEEDING
+            self._dirty[track_id] = None
 
     def update_wrong_way(self, track_id, is_wrong, lane):
         """WrongWay Specialist updates status"""
-        if track_id in self.vehicles:
-            self.vehicles[track_id].is_wrong_way = is_wrong
-            self.vehicles[track_id].lane_id = lane
+        slot = self._slots.get(track_id)
+        if slot is not None:
+            if is_wrong:
+                self.flags[slot] |= WRONG_WAY
+            else:
+                self.flags[slot] &= ~np.uint8(WRONG_WAY)
+            self.lane_id[slot] = lane
+            self._dirty[track_id] = None
 
-    def check_rules_and_get_events(self, track_id):
+    def evaluate_rules(self) -> List[Dict]:
         """
         MASTER RULE ENGINE
-        Returns list of Events to fire, if any.
+        Events of every dirty vehicle (or whose cooldown ended), in marking order.
         """
-        if track_id not in self.vehicles: return []
-        
-        v = self.vehicles[track_id]
+        now = self.clock.now()
+        while self._timers and self._timers[0][0] <= now:
+            due, _, track_id = heapq.heappop(self._timers)
+            if self._scheduled.get(track_id) == due:
+                del self._scheduled[track_id]
+                self._dirty[track_id] = None
+
+        dirty, self._dirty = self._dirty, {}
         events = []
-        now = time.time()
-        
-        # Rule 0: Global Cooldown
-        if now - v.last_alert_time < self.alert_cooldown:
+        for track_id in dirty:
+            events.extend(self._evaluate(track_id, now))
+        return events
+
+    def check_rules_and_get_events(self, track_id):
+        """Rule engine for a single vehicle; returns list of Events to fire, if any."""
+        self._dirty.pop(track_id, None)
+        return self._evaluate(track_id, self.clock.now())
+
+    def _evaluate(self, track_id, now: float) -> List[Dict]:
+        slot = self._slots.get(track_id)
+        if slot is None: return []
+
+        rules = self.rules.match(int(self.flags[slot]))
+        if not rules:
             return []
 
-        # Rule 1: Emergency Logic (Overrides everything)
-        if v.is_emergency:
-            # We ONLY fire Emergency Detected event, ignore others
-            # Update alert time to enforce cooldown
-            v.last_alert_time = now
-            return [{
-                "type": "EMERGENCY_VEHICLE",
-                "severity": "CRITICAL",
-                "description": f"Priority: {v.emergency_type} detected. Allowing passage.",
-                "metadata": {"speed": v.speed_kmh, "wrong_way": v.is_wrong_way, "track_id": track_id}
-            }]
-
-        # Rule 2: Violations (If NOT Emergency)
-        
-        # Wrong Way
-        if v.is_wrong_way:
-            events.append({
-                "type": "WRONG_WAY",
-                "severity": "CRITICAL",
-                "description": f"Vehicle {track_id} wrong way in {v.lane_id}",
-            })
-            
-        # Overspeed
-        if v.is_overspeeding:
-             events.append({
-                "type": "OVERSPEED",
-                "severity": "WARNING",
-                "description": f"Vehicle {track_id} Speeding: {v.speed_kmh:.1f} km/h",
-            })
-            
-        if events:
-            v.last_alert_time = now
-            
-        return events
+        # Global Cooldown: come back once it ends (flags may still be set)
+        if now - self.last_alert[slot] < self.alert_cooldown:
+            self._schedule(track_id, self.last_alert[slot] + self.alert_cooldown)
+            return []
+
+        fields = {
+            "track_id": track_id,
+            "speed": float(self.speed[slot]),
+            "lane": self.lane_id[slot],
+            "emergency_type": self.emergency_type[slot],
+            "wrong_way": bool(self.flags[slot] & WRONG_WAY),
+        }
+        self.last_alert[slot] = now
+        self._schedule(track_id, now + self.alert_cooldown)
+        return [rule.event_dict(fields) for rule in rules]
+
+    def _schedule(self, track_id, due: float):
+        if self._scheduled.get(track_id) != due:
+            self._scheduled[track_id] = due
+            heapq.heappush(self._timers, (due, next(self._seq), track_id))
+
+    def cleanup(self) -> List:
+        """Remove old vehicles; returns the expired track ids"""
+        now = self.clock.now()
+        expired = []
+        while self._slots:
+            track_id, slot = next(iter(self._slots.items()))
+            if now - self.last_seen[slot] <= self.max_age:
+                break  # Everything after it was seen more recently
+            self._slots.popitem(last=False)
+            self._free.append(slot)
+            self._dirty.pop(track_id, None)
+            self._scheduled.pop(track_id, None)  # Its heap entry is skipped when popped
+            expired.append(track_id)
+        return expired
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """Copy of the live rows of every column, in last-seen order (for checkpoints)"""
+        slots = np.fromiter(self._slots.values(), dtype=np.intp, count=len(self._slots))
+        return {name: getattr(self, name)[slots] for name in self._columns()}
 
-    def cleanup(self):
-        """Remove old vehicles"""
-        now = time.time()
-        expired = [vid for vid, v in self.vehicles.items() if now - v.last_seen > self.max_age]
-        for vid in expired:
-            del self.vehicles[vid]
+    def set_state(self, state: Dict[str, np.ndarray], time_shift: float = 0.0):
+        """Restore from get_state(); wall-clock columns move forward by time_shift seconds"""
+        n = len(state["ids"])
+        self.trajectory_length = state["trail"].shape[1]
+        self._reset_storage(max(n, settings.REGISTRY_CAPACITY))
+        for name in self._columns():
+            getattr(self, name)[:n] = state[name]
+        self.first_seen[:n] += time_shift
+        self.last_seen[:n] += time_shift
+        self.last_alert[:n][self.last_alert[:n] > 0] += time_shift
+        self._slots = OrderedDict(zip(self.ids[:n].tolist(), range(n)))
+        self._free = list(range(self.capacity - 1, n - 1, -1))
+        # Flagged vehicles are re-evaluated (and their cooldowns re-armed)
+        self._dirty = {track_id: None for track_id, slot in self._slots.items() if self.flags[slot]}
@@ -0,0 +1,110 @@
+"""
+Background Model Warm-up
+Building the processor loads every model (base YOLO, specialists, DeepSort
+embedder) and the first inference of each pays for predictor setup and memory
+allocation. Warmup does both on a background thread so main.py can set up
+logging and open the source meanwhile, and the dashboard can render a
+"models loading" state instead of blocking.
+
+Startup is timed in phases (imports, model load, warm-up inference) and
+reported by report().
+"""
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from config import settings
+
+IDLE = "idle"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+# Reference point for "time since startup" (this module is imported early)
+PROCESS_START = time.perf_counter()
+
+
+class Warmup:
+    def __init__(self, build: Callable[[], object], imgsz: int = 640):
+        """
+        Args:
+            build: Creates the object to warm (e.g. get_processor); its models
+                   must come from the shared model registry
+            imgsz: Size of the dummy frame run through each model
+        """
+        self.build = build
+        self.imgsz = imgsz
+        self.state = IDLE
+        self.result = None
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self, background: bool = True) -> "Warmup":
+        """Begin loading (idempotent). background=False loads on the calling thread."""
+        with self._lock:
+            if self.state != IDLE:
+                return self
+            self.state = LOADING
+        self.timings["started_after"] = time.perf_counter() - PROCESS_START
+        if background:
+            self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+            self._thread.start()
+        else:
+            self._run()
+        return self
+
+    def _run(self):
+        from core.model_registry import get_model_registry
+
+        try:
+            start = time.perf_counter()
+            self.result = self.build()
+            self.timings["load"] = time.perf_counter() - start
+            self.timings["warmup"] = get_model_registry().warm_up(self.imgsz)
+            self.state = READY
+        except Exception as e:
+            self.error = str(e)
+            self.state = FAILED
+            print(f"[ERROR] Warmup: {e}")
+        self.timings["ready_after"] = time.perf_counter() - PROCESS_START
+        self._ready.set()
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until loading finished; returns the built object (None on failure/timeout)."""
+        if self.state == IDLE:
+            self.start()
+        self._ready.wait(timeout)
+        return self.result if self.state == READY else None
+
+    def report(self) -> Dict:
+        return {
+            "state": self.state,
+            "error": self.error,
+            **{f"{k}_s": round(v, 2) for k, v in self.timings.items()},
+        }
+
+
+_warmup = None
+_warmup_lock = threading.Lock()
+
+
+def get_warmup() -> Warmup:
+    """Process-wide warm-up of the default processor (see get_processor)."""
+    global _warmup
+    with _warmup_lock:
+        if _warmup is None:
+            from core.unified_processor import get_processor
+            _warmup = Warmup(get_processor, imgsz=settings.YOLO_INFERENCE_SIZE)
+    return _warmup
+
+
+def start_warmup() -> Warmup:
+    """Start loading the default processor (in the background if BACKGROUND_WARMUP)."""
+    return get_warmup().start(background=settings.BACKGROUND_WARMUP)
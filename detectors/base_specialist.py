@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, List, Tuple
+import copy
 from core.events import Event
 
 class BaseSpecialist(ABC):
@@ -20,3 +21,39 @@ class BaseSpecialist(ABC):
         Must handle all external-to-internal data conversion here.
         """
         pass
+
+    # Attributes holding per-run state (tracks seen so far, galleries, ...).
+    # Checkpointed by the processor and restored on resume (core/checkpoint.py).
+    STATE_ATTRS: Tuple[str, ...] = ()
+
+    def get_state(self) -> Dict:
+        """Copy of the running state"""
+        return {name: copy.deepcopy(getattr(self, name)) for name in self.STATE_ATTRS}
+
+    def set_state(self, state: Dict, time_shift: float = 0.0):
+        """
+        Restore state from get_state(). time_shift moves clock timestamps
+        forward: the wall-clock downtime since the checkpoint (0 with video time,
+        see core/clock.py), for specialists that keep registry.clock stamps.
+        """
+        for name, value in state.items():
+            if name in self.STATE_ATTRS:
+                setattr(self, name, value)
+
+    # Reads registry.trajectory(): needs the main registry, so the specialist
+    # cannot run in a worker process (core/process_pool.py)
+    USES_TRAJECTORY: bool = False
+
+    # Per-track dicts / sets (keyed by track_id), pruned once the registry
+    # expires a vehicle
+    TRACK_ATTRS: Tuple[str, ...] = ()
+
+    def forget(self, track_ids: List):
+        """Drop per-track state of vehicles the registry expired"""
+        for name in self.TRACK_ATTRS:
+            store = getattr(self, name)
+            for track_id in track_ids:
+                if isinstance(store, dict):
+                    store.pop(track_id, None)
+                else:
+                    store.discard(track_id)
@@ -6,7 +6,10 @@ Updates VehicleRegistry with emergency status.
 import cv2
 import numpy as np
 from detectors.base_specialist import BaseSpecialist, Event
-from ultralytics import YOLO
+from core.overlay import Overlay
+from core.frame_context import FrameContext, run_model
+from core.model_registry import get_model
+from core.pipeline import TrackSnapshot
 import os
 
 class EmergencySpecialist(BaseSpecialist):
@@ -46,23 +49,21 @@ class EmergencySpecialist(BaseSpecialist):
         self.confidence_threshold = 0.95  # Extremely high threshold to eliminate false positives
 
     def load_model(self, model_name):
-        return YOLO(model_name)
+        return get_model(model_name)
     
-    def verify_emergency_features(self, crop):
+    def verify_emergency_features(self, hsv):
         """
         Visual verification: Check for emergency vehicle features.
+        Takes the HSV crop (from the frame's shared FrameContext).
         Returns: (has_features, confidence_boost)
         """
-        if crop is None or crop.size == 0:
+        if hsv is None or hsv.size == 0:
             return False, 0.0
         
-        h, w = crop.shape[:2]
+        h, w = hsv.shape[:2]
         if h < 50 or w < 50:
             return False, 0.0
         
-        # Convert to HSV for color analysis
-        hsv = cv2.cvtColor(crop, cv2.COLOR_BGR2HSV)
-        
         # Check for bright blue/red lights (emergency lights)
         # Blue lights (police)
         blue_mask = cv2.inRange(hsv, np.array([100, 150, 200]), np.array([130, 255, 255]))
@@ -79,10 +80,9 @@ class EmergencySpecialist(BaseSpecialist):
         white_ratio = np.count_nonzero(white_mask) / (h * w)
         
         # Check top portion for light bars (emergency vehicles have lights on top)
-        top_portion = crop[:int(h*0.3), :]
-        top_hsv = cv2.cvtColor(top_portion, cv2.COLOR_BGR2HSV)
+        top_hsv = hsv[:int(h*0.3), :]
         top_bright = cv2.inRange(top_hsv, np.array([0, 0, 220]), np.array([180, 50, 255]))
-        top_bright_ratio = np.count_nonzero(top_bright) / (top_portion.shape[0] * top_portion.shape[1])
+        top_bright_ratio = np.count_nonzero(top_bright) / (top_hsv.shape[0] * top_hsv.shape[1])
         
         # Scoring logic
         has_features = False
@@ -101,22 +101,19 @@ class EmergencySpecialist(BaseSpecialist):
         
         return has_features, confidence_boost
     
-    def classify_vehicle_crop(self, crop):
+    def classify_vehicle_crop(self, context, box):
         """
-        Run emergency model on vehicle crop with visual verification.
+        Run emergency model on a vehicle crop (box = x1, y1, x2, y2 in the
+        frame) with visual verification.
         Returns: (is_emergency, emergency_type, confidence)
         """
-        if crop is None or crop.size == 0:
+        x1, y1, x2, y2 = box
+        if x2 <= x1 or y2 <= y1:
             return False, "None", 0.0
         
-        try:
-            results = self.model(crop, verbose=False, imgsz=640)[0]
-        except:
-            results = self.model(crop, verbose=False)[0]
+        _, confs, classes = run_model(self.model, [context.model_input(640, box)])[0]
         
-        for box in results.boxes:
-            cls_id = int(box.cls[0])
-            conf = float(box.conf[0])
+        for cls_id, conf in zip(classes.tolist(), confs.tolist()):
             
             if cls_id in self.target_indices:
                 class_name = self.model.names[cls_id]
@@ -127,7 +124,7 @@ class EmergencySpecialist(BaseSpecialist):
                 
                 # Secondary check: Visual verification (if confidence is close)
                 if conf > 0.70:  # Lower threshold for visual verification
-                    has_features, boost = self.verify_emergency_features(crop)
+                    has_features, boost = self.verify_emergency_features(context.hsv_crop(*box))
                     if has_features:
                         adjusted_conf = min(1.0, conf + boost)
                         if adjusted_conf > self.confidence_threshold:
@@ -135,7 +132,7 @@ class EmergencySpecialist(BaseSpecialist):
         
         return False, "None", 0.0
 
-    def process(self, frame, frame_id=0, registry=None, tracks=None):
+    def process(self, frame, frame_id=0, registry=None, tracks=None, overlay=None, context=None):
         """
         Process frame with pre-computed tracks and registry.
         Runs emergency detection on vehicle crops.
@@ -144,7 +141,9 @@ class EmergencySpecialist(BaseSpecialist):
             frame: Video frame for visualization
             frame_id: Current frame number
             registry: VehicleRegistry instance (integrated mode)
-            tracks: List of Track objects (integrated mode)
+            tracks: TrackSnapshot (or Track list) of the frame (integrated mode)
+            overlay: Draw-command collector (None = draw directly on frame)
+            context: Shared per-frame preprocessing (core.frame_context)
         
         Returns:
             List of Event objects
@@ -159,36 +158,29 @@ class EmergencySpecialist(BaseSpecialist):
             return []
         
         h_img, w_img, _ = frame.shape
+        draw = overlay if overlay is not None else Overlay.immediate(frame)
+        context = context or FrameContext(frame, frame_id)
         
-        for track in tracks:
-            if not track.is_confirmed():
-                continue
-            
-            track_id = track.track_id
-            ltrb = track.to_ltrb()
-            x1, y1, x2, y2 = map(int, ltrb)
-            w, h = x2 - x1, y2 - y1
-            
-            # Boundary checks
-            x1, y1 = max(0, x1), max(0, y1)
-            x2, y2 = min(w_img, x2), min(h_img, y2)
-            
-            # SIZE FILTER: Emergency vehicles are typically larger
-            # Reject small vehicles (likely sedans/compact cars)
-            MIN_WIDTH = 100   # Increased from 80
-            MIN_HEIGHT = 100  # Increased from 80
-            MIN_AREA = 12000  # Increased from 8000 pixels²
-            
-            vehicle_area = w * h
-            
-            if w < MIN_WIDTH or h < MIN_HEIGHT or vehicle_area < MIN_AREA:
-                continue  # Skip small vehicles
-            
-            # Extract vehicle crop
-            vehicle_crop = frame[y1:y2, x1:x2]
+        tracks = TrackSnapshot.from_tracks(tracks)
+        
+        # SIZE FILTER: Emergency vehicles are typically larger
+        # Reject small vehicles (likely sedans/compact cars)
+        MIN_WIDTH = 100   # Increased from 80
+        MIN_HEIGHT = 100  # Increased from 80
+        MIN_AREA = 12000  # Increased from 8000 pixels²
+        
+        w, h = tracks.sizes[:, 0], tracks.sizes[:, 1]
+        large = np.flatnonzero((w >= MIN_WIDTH) & (h >= MIN_HEIGHT) & (w * h >= MIN_AREA))
+        
+        # Boundary checks
+        boxes = tracks.clipped(w_img, h_img)
+        
+        for i in large.tolist():
+            track_id = tracks.ids[i]
+            x1, y1, x2, y2 = boxes[i].tolist()
             
-            # Classify crop
-            is_emergency, em_type, conf = self.classify_vehicle_crop(vehicle_crop)
+            # Classify crop (preprocessing shared through the frame context)
+            is_emergency, em_type, conf = self.classify_vehicle_crop(context, (x1, y1, x2, y2))
             
             if is_emergency:
                 # Update registry (this is the source of truth)
@@ -204,9 +196,8 @@ class EmergencySpecialist(BaseSpecialist):
                     color = (0, 0, 255)  # Red
                 
                 # Visualize
-                cv2.rectangle(frame, (x1, y1), (x2, y2), color, 3)
-                cv2.putText(frame, f"{em_type} {conf:.0%}", (x1, y1 - 10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                draw.rect((x1, y1), (x2, y2), color, 3)
+                draw.text(f"{em_type} {conf:.0%}", (x1, y1 - 10), color, 0.6, 2)
                 
                 # NOTE: Events are generated by Registry's rule engine
                 # We don't create events here to avoid bypassing cooldown logic
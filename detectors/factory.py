@@ -0,0 +1,28 @@
+"""
+Specialist Factory
+Maps specialist names to their classes by import path, so they can be built
+on demand in the main process or inside a worker process.
+"""
+import importlib
+
+SPECIALIST_PATHS = {
+    "speed": ("detectors.speed_specialist", "SpeedSpecialist"),
+    "wrong_way": ("detectors.wrong_way_specialist", "WrongWaySpecialist"),
+    "emergency": ("detectors.emergency_specialist", "EmergencySpecialist"),
+    "reid": ("detectors.reid_specialist", "ReIDSpecialist"),
+    "pothole": ("detectors.pothole_specialist", "PotholeSpecialist"),
+}
+
+
+def specialist_class(name: str):
+    """Import the specialist class registered under `name` (without building it)."""
+    if name not in SPECIALIST_PATHS:
+        raise KeyError(f"Unknown specialist '{name}'. Expected one of {list(SPECIALIST_PATHS)}")
+    module_path, class_name = SPECIALIST_PATHS[name]
+    module = importlib.import_module(module_path)
+    return getattr(module, class_name)
+
+
+def build_specialist(name: str, **kwargs):
+    """Import and instantiate the specialist registered under `name`."""
+    return specialist_class(name)(**kwargs)
@@ -1,8 +1,9 @@
-import cv2
 from typing import List
 from detectors.base_specialist import BaseSpecialist
 from core.events import Event
-from ultralytics import YOLO
+from core.overlay import Overlay
+from core.frame_context import FrameContext, run_model
+from core.model_registry import get_model
 import numpy as np
 
 class PotholeSpecialist(BaseSpecialist):
@@ -11,11 +12,15 @@ class PotholeSpecialist(BaseSpecialist):
     Target Classes: {D00: Longitudinal Crack, D10: Transverse Crack, D20: Aligator Crack, D40: Pothole}
     """
     
-    def __init__(self, model_path=r"C:\Users\ahadd\OneDrive\Desktop\CAMVIEW-INTEGRATED\best.pt"):
+    def __init__(self, model_path=r"C:\Users\ahadd\OneDrive\Desktop\CAMVIEW-INTEGRATED\best.pt", roi=None,
+                 imgsz=640):
         """
         Initialize with path to the Specialist Model.
+        roi: optional core.roi.RegionOfInterest (e.g. the road surface) to crop to
         """
         self.model_path = model_path
+        self.roi = roi
+        self.imgsz = imgsz
         self.model = None
         self.load_model()
         
@@ -25,22 +30,27 @@ class PotholeSpecialist(BaseSpecialist):
     def load_model(self):
         try:
             print(f"[Specialist] Loading Pothole Model from {self.model_path}...")
-            self.model = YOLO(self.model_path)
+            self.model = get_model(self.model_path)
         except Exception as e:
             print(f"[ERROR] Failed to load Pothole Specialist: {e}")
 
-    def process(self, frame, frame_id: int) -> List[Event]:
+    def process(self, frame, frame_id: int, registry=None, tracks=None, overlay=None,
+                context=None) -> List[Event]:
         if not self.model: return []
+        draw = overlay if overlay is not None else Overlay.immediate(frame)
+        context = context or FrameContext(frame, frame_id)
+        
+        # Road-surface region only (see core/roi.py); the letterboxed tensor is
+        # shared with any other model using the same size and region
+        region = self.roi.region(frame) if self.roi else ()
+        model_input = context.model_input(self.imgsz, *region)
             
         events = []
-        # Inference with custom trained model
-        results = self.model.predict(frame, verbose=False, conf=0.25)
-        
-        if not results: return []
+        # Inference with custom trained model (boxes come back in frame coordinates)
+        xyxy, _, classes = run_model(self.model, [model_input], conf=0.25)[0]
 
-        for box in results[0].boxes:
-            cls_id = int(box.cls[0])
-            label = self.model.names[cls_id]
+        for (x1, y1, x2, y2), cls_id in zip(xyxy, classes):
+            label = self.model.names[int(cls_id)]
             
             is_damage = False
             damage_type = "Unknown"
@@ -52,7 +62,8 @@ class PotholeSpecialist(BaseSpecialist):
                 damage_type = label
             
             if is_damage:
-                x, y, w, h = box.xywh[0].cpu().numpy()
+                w, h = x2 - x1, y2 - y1
+                x, y = x1 + w / 2, y1 + h / 2
                 area = w * h
                 
                 # Severity Grading
@@ -65,13 +76,10 @@ class PotholeSpecialist(BaseSpecialist):
                 elif damage_type == "D20":
                     severity = "WARNING"
                 
-                # Visualization (Draw on frame - optional, usually UI handles it, but good for debug)
-                # Note: passing frame by reference, so drawing here shows up in UI
+                # Visualization (draw commands, rendered only when a consumer asks)
                 color = (0, 0, 255) if severity == "CRITICAL" else (0, 165, 255)
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                cv2.rectangle(frame, (int(x1), int(y1)), (int(x2), int(y2)), color, 2)
-                cv2.putText(frame, f"{damage_type} ({severity})", (int(x1), int(y1)-10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                draw.rect((x1, y1), (x2, y2), color, 2)
+                draw.text(f"{damage_type} ({severity})", (x1, y1 - 10), color, 0.6, 2)
 
                 events.append(Event(
                     event_type="ROAD_DAMAGE",
@@ -6,8 +6,13 @@ Works with VehicleRegistry in integrated mode.
 import cv2
 import numpy as np
 from detectors.base_specialist import BaseSpecialist, Event
+from core.overlay import Overlay
+from core.frame_context import FrameContext
+from core.pipeline import TrackSnapshot
 
 class ReIDSpecialist(BaseSpecialist):
+    STATE_ATTRS = ("lost_vehicles", "next_reid_id", "track_to_reid")
+
     def __init__(self, similarity_threshold=0.85):
         """
         Vehicle Re-Identification using color histogram embeddings.
@@ -21,17 +26,15 @@ class ReIDSpecialist(BaseSpecialist):
         """No model needed - uses color histograms"""
         pass
     
-    def extract_embedding(self, crop):
+    def extract_embedding(self, hsv):
         """
-        Extract color histogram embedding from vehicle crop.
+        Extract color histogram embedding from an HSV vehicle crop
+        (HSV gives better color representation; shared via the FrameContext).
         Returns: normalized histogram (feature vector)
         """
-        if crop is None or crop.size == 0:
+        if hsv is None or hsv.size == 0:
             return None
         
-        # Convert to HSV for better color representation
-        hsv = cv2.cvtColor(crop, cv2.COLOR_BGR2HSV)
-        
         # Calculate histogram (H: 180, S: 256, V: 256)
         hist_h = cv2.calcHist([hsv], [0], None, [180], [0, 180])
         hist_s = cv2.calcHist([hsv], [1], None, [256], [0, 256])
@@ -80,7 +83,7 @@ class ReIDSpecialist(BaseSpecialist):
         
         return best_match
     
-    def process(self, frame, frame_id=0, registry=None, tracks=None):
+    def process(self, frame, frame_id=0, registry=None, tracks=None, overlay=None, context=None):
         """
         Process frame with pre-computed tracks and registry.
         Maintains persistent IDs across occlusion.
@@ -89,7 +92,9 @@ class ReIDSpecialist(BaseSpecialist):
             frame: Video frame for visualization
             frame_id: Current frame number
             registry: VehicleRegistry instance (integrated mode)
-            tracks: List of Track objects (integrated mode)
+            tracks: TrackSnapshot (or Track list) of the frame (integrated mode)
+            overlay: Draw-command collector (None = draw directly on frame)
+            context: Shared per-frame preprocessing (core.frame_context)
         
         Returns:
             List of Event objects
@@ -104,25 +109,20 @@ class ReIDSpecialist(BaseSpecialist):
             return []
         
         h_img, w_img, _ = frame.shape
+        draw = overlay if overlay is not None else Overlay.immediate(frame)
+        context = context or FrameContext(frame, frame_id)
         current_track_ids = set()
         
-        for track in tracks:
-            if not track.is_confirmed():
-                continue
-            
-            track_id = track.track_id
+        tracks = TrackSnapshot.from_tracks(tracks)
+        
+        # Boundary checks
+        boxes = tracks.clipped(w_img, h_img).tolist()
+        
+        for track_id, (x1, y1, x2, y2) in zip(tracks.ids, boxes):
             current_track_ids.add(track_id)
             
-            ltrb = track.to_ltrb()
-            x1, y1, x2, y2 = map(int, ltrb)
-            
-            # Boundary checks
-            x1, y1 = max(0, x1), max(0, y1)
-            x2, y2 = min(w_img, x2), min(h_img, y2)
-            
-            # Extract crop
-            vehicle_crop = frame[y1:y2, x1:x2]
-            embedding = self.extract_embedding(vehicle_crop)
+            # Extract crop (HSV view into the frame's shared conversion)
+            embedding = self.extract_embedding(context.hsv_crop(x1, y1, x2, y2))
             
             if embedding is None:
                 continue
@@ -159,8 +159,7 @@ class ReIDSpecialist(BaseSpecialist):
             }
             
             # Visualize ReID
-            cv2.putText(frame, f"ReID:{reid_id}", (x1, y2 + 20), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 0, 255), 2)
+            draw.text(f"ReID:{reid_id}", (x1, y2 + 20), (255, 0, 255), 0.5, 2)
         
         # Cleanup lost vehicles (remove very old ones)
         to_remove = [rid for rid, data in self.lost_vehicles.items() 
@@ -3,12 +3,15 @@ Speed Specialist - Pure Logic Unit (Gold Standard)
 Consumes VehicleState from Registry, calculates speed using 2-line virtual loop.
 NO internal YOLO or tracking.
 """
-import cv2
-import time
 from detectors.base_specialist import BaseSpecialist, Event
+from core.overlay import Overlay
+from core.pipeline import TrackSnapshot
 from config import settings
 
 class SpeedSpecialist(BaseSpecialist):
+    STATE_ATTRS = ("line1_y", "line2_y", "frame_width", "vehicle_timings", "alerted")
+    TRACK_ATTRS = ("vehicle_timings", "alerted")
+
     def __init__(self):
         """
         Simple 2-line speed detection (Virtual Loop)
@@ -16,6 +19,7 @@ class SpeedSpecialist(BaseSpecialist):
         """
         self.line1_y = None
         self.line2_y = None
+        self.frame_width = None
         self.vehicle_timings = {}  # track_id -> {'entry_time': float, 'speed': float}
         self.alerted = set()
         
@@ -23,6 +27,12 @@ class SpeedSpecialist(BaseSpecialist):
         """No model needed - pure logic"""
         pass
     
+    def set_state(self, state, time_shift=0.0):
+        super().set_state(state, time_shift)
+        for vehicle in self.vehicle_timings.values():
+            if vehicle['entry_time'] is not None:
+                vehicle['entry_time'] += time_shift
+    
     def calculate_speed(self, track_id, cy, current_time):
         """
         Calculate speed using 2-line crossing method.
@@ -54,49 +64,47 @@ class SpeedSpecialist(BaseSpecialist):
         
         return vehicle.get('speed')
     
-    def process(self, frame, frame_id=0, registry=None, tracks=None):
+    def process(self, frame, frame_id=0, registry=None, tracks=None, overlay=None, context=None):
         """
         Process frame with pre-computed tracks and registry.
         
         Args:
-            frame: Video frame for visualization
+            frame: Video frame for visualization (None on predicted frames)
             frame_id: Current frame number
             registry: VehicleRegistry instance (integrated mode)
-            tracks: List of Track objects (integrated mode)
+            tracks: TrackSnapshot (or Track list) of the frame (integrated mode)
+            overlay: Draw-command collector (None = draw directly on frame)
+            context: Shared per-frame preprocessing (unused: geometry only)
         
         Returns:
             List of Event objects
         """
-        if frame is None:
+        # frame may be None on tracker-predicted (non-decoded) frames once the
+        # virtual loop is initialised; only drawing needs pixels.
+        if frame is None and self.line1_y is None:
             return []
         
         events = []
-        height, width, _ = frame.shape
+        draw = overlay if overlay is not None else Overlay.immediate(frame)
         
         # Initialize virtual loop lines
         if self.line1_y is None:
+            height, width, _ = frame.shape
             self.line1_y = int(height * 0.50)
             self.line2_y = int(height * 0.80)
+            self.frame_width = width
         
         # Draw virtual loop lines
-        cv2.line(frame, (0, self.line1_y), (width, self.line1_y), (0, 255, 255), 2)
-        cv2.line(frame, (0, self.line2_y), (width, self.line2_y), (0, 255, 255), 2)
-        cv2.putText(frame, "SPEED ZONE", (10, self.line1_y - 10), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
-        
-        current_time = time.time()
+        draw.line((0, self.line1_y), (self.frame_width, self.line1_y), (0, 255, 255), 2)
+        draw.line((0, self.line2_y), (self.frame_width, self.line2_y), (0, 255, 255), 2)
+        draw.text("SPEED ZONE", (10, self.line1_y - 10), (0, 255, 255), 0.6, 2)
         
         # Process tracks (if provided by integrated mode)
         if tracks is not None and registry is not None:
-            for track in tracks:
-                if not track.is_confirmed():
-                    continue
-                
-                track_id = track.track_id
-                ltrb = track.to_ltrb()
-                x1, y1, x2, y2 = map(int, ltrb)
-                cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
-                
+            current_time = registry.clock.now()  # Video time for files (core/clock.py)
+            tracks = TrackSnapshot.from_tracks(tracks)
+            for track_id, (x1, y1, x2, y2), cy in zip(tracks.ids, tracks.boxes.tolist(),
+                                                     tracks.centroids[:, 1].tolist()):
                 # Calculate speed
                 speed_kmh = self.calculate_speed(track_id, cy, current_time)
                 
@@ -120,12 +128,11 @@ class SpeedSpecialist(BaseSpecialist):
                                 description=f"Vehicle #{track_id} at {speed_kmh:.0f} km/h",
                                 camera_id="CAM_01",
                                 source="speed_specialist",
-                                metadata={"bbox": [x1, y1, x2-x1, y2-y1], "speed": speed_kmh}
+                                metadata={"track_id": track_id, "bbox": [x1, y1, x2-x1, y2-y1], "speed": speed_kmh}
                             ))
                             self.alerted.add(track_id)
                     
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-                    cv2.putText(frame, label, (x1, y1-10), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+                    draw.rect((x1, y1), (x2, y2), color, 2)
+                    draw.text(label, (x1, y1-10), color, 0.6, 2)
         
         return events
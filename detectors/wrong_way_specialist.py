@@ -1,121 +1,113 @@
 """
 Wrong-Way Specialist - Pure Logic Unit (Gold Standard)
 Consumes VehicleState from Registry, detects wrong-way driving using center divider.
+Trajectories come from the registry (VehicleRegistry.trajectory).
 NO internal YOLO or tracking.
 """
-import cv2
-import numpy as np
-import time
 from detectors.base_specialist import BaseSpecialist, Event
+from core.overlay import Overlay
+from core.pipeline import TrackSnapshot
 from config import settings
 
 class WrongWaySpecialist(BaseSpecialist):
+    STATE_ATTRS = ("alerts", "frame_size")
+    TRACK_ATTRS = ("alerts",)
+    USES_TRAJECTORY = True
+
     def __init__(self):
         """
         Center divider-based wrong-way detection.
         Works with VehicleRegistry in integrated mode.
         """
-        self.previous_y = {}  # track_id -> {'history': [], 'alert_count': int, 'last_alert': float}
+        self.alerts = {}  # track_id -> {'alert_count': int, 'last_alert': float}
+        self.frame_size = None  # (h, w) of the last decoded frame
         
     def load_model(self):
         """No model needed - pure logic"""
         pass
     
+    def set_state(self, state, time_shift=0.0):
+        super().set_state(state, time_shift)
+        for alert in self.alerts.values():
+            if alert.get("last_alert"):
+                alert["last_alert"] += time_shift
+    
     def compute_dynamic_divider(self, tracks, frame_width):
         """
         Estimate divider X-coordinate using vehicle clustering.
         """
-        if len(tracks) < 6:
+        tracks = TrackSnapshot.from_tracks(tracks)
+        if tracks.total < 6 or not len(tracks):
             return frame_width // 2  # fallback
         
-        xs = []
-        for track in tracks:
-            if not track.is_confirmed():
-                continue
-            ltrb = track.to_ltrb()
-            x1, y1, x2, y2 = map(int, ltrb)
-            cx = (x1 + x2) // 2
-            xs.append(cx)
+        xs = tracks.centroids[:, 0]
+        left = xs[xs < frame_width // 2]
+        right = xs[xs >= frame_width // 2]
         
-        if not xs:
+        if not left.size or not right.size:
             return frame_width // 2
         
-        left = [v for v in xs if v < frame_width // 2]
-        right = [v for v in xs if v >= frame_width // 2]
-        
-        if not left or not right:
-            return frame_width // 2
-        
-        divider_x = (max(left) + min(right)) // 2
+        divider_x = (int(left.max()) + int(right.min())) // 2
         return divider_x
     
-    def process(self, frame, frame_id=0, registry=None, tracks=None):
+    def process(self, frame, frame_id=0, registry=None, tracks=None, overlay=None, context=None):
         """
         Process frame with pre-computed tracks and registry.
         
         Args:
-            frame: Video frame for visualization
+            frame: Video frame for visualization (None on predicted frames)
             frame_id: Current frame number
             registry: VehicleRegistry instance (integrated mode)
-            tracks: List of Track objects (integrated mode)
+            tracks: TrackSnapshot (or Track list) of the frame (integrated mode)
+            overlay: Draw-command collector (None = draw directly on frame)
+            context: Shared per-frame preprocessing (unused: geometry only)
         
         Returns:
             List of Event objects
         """
-        if frame is None:
+        # frame may be None on tracker-predicted (non-decoded) frames; the
+        # last known frame size is used and nothing is drawn.
+        if frame is not None:
+            self.frame_size = frame.shape[:2]
+        if self.frame_size is None:
             return []
         
         events = []
-        h, w, _ = frame.shape
+        h, w = self.frame_size
+        draw = overlay if overlay is not None else Overlay.immediate(frame)
         
         # Process tracks (if provided by integrated mode)
         if tracks is None or registry is None:
             return []
         
+        tracks = TrackSnapshot.from_tracks(tracks)
+        
         # Compute dynamic divider
         divider_x = self.compute_dynamic_divider(tracks, w)
         
         # Draw divider
-        cv2.line(frame, (divider_x, 0), (divider_x, h), (255, 0, 0), 3)
-        cv2.putText(frame, "MEDIAN", (divider_x + 5, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
+        draw.line((divider_x, 0), (divider_x, h), (255, 0, 0), 3)
+        draw.text("MEDIAN", (divider_x + 5, 30), (255, 0, 0), 0.7, 2)
+        
+        right_side = (tracks.centroids[:, 0] > divider_x).tolist()
+        now = registry.clock.now()  # Video time for files (core/clock.py)
         
         # Track & decide wrong way
-        for track in tracks:
-            if not track.is_confirmed():
-                continue
-            
-            track_id = track.track_id
-            ltrb = track.to_ltrb()
-            x1, y1, x2, y2 = map(int, ltrb)
-            w_box, h_box = x2 - x1, y2 - y1
-            cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
-            
-            is_right_side = cx > divider_x
-            
-            # Initialize tracking history
-            if track_id not in self.previous_y:
-                self.previous_y[track_id] = {
-                    "history": [],
-                    "alert_count": 0,
-                    "last_alert": 0,
-                }
-            
-            history = self.previous_y[track_id]["history"]
-            history.append((cx, cy))
-            if len(history) > 30:
-                history.pop(0)
+        for track_id, (x1, y1, x2, y2), (w_box, h_box), is_right_side in zip(
+                tracks.ids, tracks.boxes.tolist(), tracks.sizes.tolist(), right_side):
+            # Trajectory (registry ring buffer, oldest first)
+            history = registry.trajectory(track_id)
             
             # Draw trajectory
             if len(history) > 1:
-                cv2.polylines(frame, [np.array(history)], False, (0, 165, 255), 2)
+                draw.polyline(history.tolist(), (0, 165, 255), 2)
             
             # Need at least 6 points to determine direction
             if len(history) < 6:
                 continue
             
             # Calculate direction (dy)
-            dy = history[-1][1] - history[-6][1]
+            dy = int(history[-1, 1] - history[-6, 1])
             
             # Wrong-way logic (divided road)
             is_wrong = False
@@ -136,15 +128,15 @@ class WrongWaySpecialist(BaseSpecialist):
             color = (0, 0, 255) if is_wrong else (0, 255, 0)
             label = "WRONG!" if is_wrong else "OK"
             
-            cv2.rectangle(frame, (x1, y1), (x2, y2), color, 2)
-            cv2.putText(frame, label, (x1, y1 - 5), 
-                       cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2)
+            draw.rect((x1, y1), (x2, y2), color, 2)
+            draw.text(label, (x1, y1 - 5), color, 0.6, 2)
             
             # Event debounce
+            alert = self.alerts.setdefault(track_id, {"alert_count": 0, "last_alert": 0})
             if is_wrong:
-                self.previous_y[track_id]["alert_count"] += 1
-                if self.previous_y[track_id]["alert_count"] > 5:
-                    if time.time() - self.previous_y[track_id]["last_alert"] > 5:
+                alert["alert_count"] += 1
+                if alert["alert_count"] > 5:
+                    if now - alert["last_alert"] > 5:
                         events.append(Event(
                             event_type="WRONG_WAY_DRIVING",
                             severity="CRITICAL",
@@ -157,10 +149,8 @@ class WrongWaySpecialist(BaseSpecialist):
                                 "bbox": [x1, y1, w_box, h_box],
                             },
                         ))
-                        self.previous_y[track_id]["last_alert"] = time.time()
+                        alert["last_alert"] = now
             else:
-                self.previous_y[track_id]["alert_count"] = max(
-                    0, self.previous_y[track_id]["alert_count"] - 1
-                )
+                alert["alert_count"] = max(0, alert["alert_count"] - 1)
         
         return events
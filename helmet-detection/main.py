@@ -8,7 +8,7 @@ from src.plate_detector import PlateDetector
 from src.ocr import PlateOCR
 from src.report import HelmetReportManager
 
-from sort.sort import Sort
+from core.sort import Sort
 
 # =========================
 # CONFIG
@@ -1,4 +1,4 @@
-from ultralytics import YOLO
+from core.model_registry import get_model as load_model
 
 class HelmetDetector:
     def __init__(
@@ -8,8 +8,8 @@ class HelmetDetector:
         conf=0.4
     ):
         # Models
-        self.pb_model = YOLO(person_bike_model)
-        self.helmet_model = YOLO(helmet_model)
+        self.pb_model = load_model(person_bike_model)
+        self.helmet_model = load_model(helmet_model)
         self.conf = conf
 
         # COCO classes
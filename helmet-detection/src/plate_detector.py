@@ -1,9 +1,9 @@
-from ultralytics import YOLO
+from core.model_registry import get_model as load_model
 import cv2
 
 class PlateDetector:
     def __init__(self, model_path="models/license_plate.pt", conf=0.4):
-        self.model = YOLO(model_path)
+        self.model = load_model(model_path)
         self.conf = conf
 
     def detect(self, image):
@@ -1,27 +1,56 @@
 import argparse
+import json
 import sys
 import os
 import time
 
+_IMPORT_START = time.perf_counter()
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from core.unified_processor import get_processor
-from detectors.wrong_way_specialist import WrongWaySpecialist
-from detectors.emergency_specialist import EmergencySpecialist
-from detectors.pothole_specialist import PotholeSpecialist
-from detectors.speed_specialist import SpeedSpecialist
-from detectors.reid_specialist import ReIDSpecialist
+# Heavy dependencies (ultralytics, torch, deep_sort_realtime, firebase_admin)
+# are imported lazily, when the models are built / Firebase is initialised
+from core.pacing import PACING_MODES
+from core.model_registry import get_model_registry
+from core.warmup import start_warmup
 from modules.logger import EventLogger
 from config import settings
 
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
 def main():
     parser = argparse.ArgumentParser(description="CAMVIEW.AI Terminal Processing Engine - Video File Analysis Only")
     parser.add_argument("--source", type=str, required=True, help="Video file path (required)")
     parser.add_argument("--demo", action="store_true", help="Run in demo mode with mock events if needed")
     parser.add_argument("--headless", action="store_true", help="Run without GUI (terminal only)")
+    parser.add_argument("--batch-size", type=int, default=None,
+                        help="Throughput mode: run N consecutive frames through the base model as one batch")
+    parser.add_argument("--pacing", choices=PACING_MODES, default=None,
+                        help="realtime = 30 fps, source-fps = video's own frame rate, max = no throttling "
+                             f"(default: {settings.PACING_MODE})")
+    parser.add_argument("--process-pool", type=str, default=None,
+                        help="Comma-separated specialists to run in worker processes, e.g. emergency,reid,pothole")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Split the video into N segments analysed in parallel processes (offline re-analysis)")
+    parser.add_argument("--chunk-overlap", type=int, default=60,
+                        help="Frames of overlap between segments, used to stitch tracks and de-duplicate events")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted run of this video from its last checkpoint")
+    parser.add_argument("--metrics-out", type=str, default=None,
+                        help="Write a JSON snapshot of FPS, per-stage latency and queue depths to this file")
     args = parser.parse_args()
 
+    # Segments run at max pacing in daemonic pool processes (which cannot
+    # start a specialist pool) and keep no checkpoints
+    if args.workers > 1:
+        if args.pacing not in (None, "max"):
+            parser.error("--workers runs segments at max pacing; --pacing is not supported with it")
+        if args.process_pool:
+            parser.error("--process-pool cannot be combined with --workers")
+        if args.resume:
+            parser.error("--resume cannot be combined with --workers")
+
     # Validate source is a file (not webcam)
     if args.source.isdigit() or args.source == "0":
         print("[ERROR] Webcam processing is not supported in terminal mode. Please provide a video file path.")
@@ -32,55 +61,90 @@ def main():
         print(f"[ERROR] Video file not found: {args.source}")
         return
 
-    # 1. Initialize Logger
+    # 1. Start loading + warming up the models in the background (builds the
+    # processor and its specialists; models come from the shared registry)
+    if args.workers <= 1:
+        print("[SYSTEM] Initializing Unified Traffic Safety Processor...")
+        if args.process_pool:
+            settings.PROCESS_POOL_SPECIALISTS = [n.strip() for n in args.process_pool.split(",") if n.strip()]
+        warmup = start_warmup()
+
+    # 1a. Initialize Logger (while the models load)
     logger = EventLogger()
 
-    # 2. Initialize Detectors
-    print("[SYSTEM] Initializing Unified Traffic Safety Processor...")
-    detectors = []
-    
-    try:
-        detectors.append(WrongWaySpecialist())
-        detectors.append(EmergencySpecialist())
-        detectors.append(PotholeSpecialist())
-        detectors.append(SpeedSpecialist())
-        detectors.append(ReIDSpecialist())
-        print(f"[SYSTEM] Loaded {len(detectors)} detection modules")
-    except Exception as e:
-        print(f"[ERROR] Failed to load detectors: {e}")
+    # 1b. Parallel chunked analysis: each segment runs its own pipeline in a
+    # worker process; merged events go through the logger as usual.
+    if args.workers > 1:
+        from core.chunked import analyze_video_parallel
+        from core.event_bus import bus
+        
+        start = time.time()
+        events = analyze_video_parallel(args.source, workers=args.workers, overlap=args.chunk_overlap,
+                                        batch_size=args.batch_size)
+        for event in events:
+            bus.publish(event)
+        print(f"[SYSTEM] Parallel analysis completed: {len(events)} events in {time.time() - start:.1f}s")
         return
 
-    # 3. Initialize Unified Processor
-    processor = get_processor()
-    processor.set_detectors(detectors)
-    
-    # Set up callbacks for terminal output
-    def frame_callback(frame, events):
-        """Handle frame updates (optional for terminal mode)"""
-        pass  # No frame display in headless mode
+    # 2. Wait for the Unified Processor
+    processor = warmup.wait()
+    if processor is None:
+        print(f"[ERROR] Failed to load detectors: {warmup.error}")
+        return
+    if args.batch_size:
+        processor.batch_size = max(1, args.batch_size)
+    processor.set_pacing(args.pacing or settings.PACING_MODE)
+    print(f"[SYSTEM] Loaded {len(processor.specialists) + len(processor.pooled_specialists)} detection modules")
+    for model in get_model_registry().report():
+        print(f"[SYSTEM]   model {model['path']} ({model['backend']}): {model['memory_mb']} MB")
+    timings = warmup.report()
+    print(f"[SYSTEM] Startup: imports {IMPORT_SECONDS:.2f}s, models {timings['load_s']:.2f}s, "
+          f"warm-up {timings['warmup_s']:.2f}s, ready after {timings['ready_after_s']:.2f}s")
     
+    # Set up callbacks for terminal output. No frame callback: frames are
+    # never displayed here, and one would make the sink render every overlay.
     def event_callback(events):
         """Handle event updates"""
         for event in events:
             print(f"[EVENT] {event.event_type} - {event.severity} at {event.time_str}")
     
-    processor.set_callbacks(frame_callback, event_callback)
+    processor.set_callbacks(event_callback=event_callback)
 
-    # 4. Load Video Source
+    # 3. Load Video Source
     source = args.source  # Already validated as file path
 
+    # Periodic checkpoints of the processing state (see core/checkpoint.py)
+    checkpoint = None
+    checkpointer = processor.enable_checkpoints(source) if settings.CHECKPOINTS or args.resume else None
+    if args.resume:
+        checkpoint = checkpointer.load()
+        if checkpoint is None:
+            print(f"[SYSTEM] No checkpoint found for {source}; starting from the beginning")
+    elif checkpointer:
+        checkpointer.clear()  # Fresh run: forget any interrupted one
+    
     print(f"[SYSTEM] Loading video file: {source}")
     
-    if not processor.load_video(source):
+    if not processor.load_video(source, start_frame=checkpoint.frame_id if checkpoint else 0):
         print(f"[ERROR] Failed to load video file: {source}")
         return
+    if checkpoint:
+        processor.restore(checkpoint)
+    if checkpointer:
+        print(f"[SYSTEM] Checkpoint every {checkpointer.interval} frames -> {checkpointer.path}")
 
-    # 5. Start Processing
+    # 4. Start Processing
     print("[SYSTEM] Starting video file processing...")
     print("[SYSTEM] Press Ctrl+C to stop")
     
+    def write_metrics():
+        if args.metrics_out:
+            with open(args.metrics_out, "w") as f:
+                json.dump(processor.get_metrics(), f, indent=2)
+    
     try:
         processor.start_processing()
+        last_report = time.time()
         
         # Monitor processing
         while True:
@@ -90,8 +154,14 @@ def main():
                 break
             
             # Print status every 10 seconds
-            if int(status.current_frame) % 300 == 0:  # Assuming ~30fps
-                print(f"[STATUS] Frame: {status.current_frame}, Events: {status.events_detected}, FPS: {status.fps:.1f}")
+            if time.time() - last_report >= 10:
+                last_report = time.time()
+                stages = {k: v for k, v in status.stage_latency.items() if k != "end_to_end"}
+                slowest = max(stages.items(), key=lambda kv: kv[1]["p95_ms"], default=None)
+                bottleneck = f", Slowest: {slowest[0]} p95={slowest[1]['p95_ms']:.1f}ms" if slowest else ""
+                print(f"[STATUS] Frame: {status.current_frame}, Events: {status.events_detected}, "
+                      f"FPS: {status.fps:.1f}, Queues: {status.queue_depths}{bottleneck}")
+                write_metrics()
             
             time.sleep(0.1)
             
@@ -99,6 +169,8 @@ def main():
         print("\n[SYSTEM] Stopping video processing...")
         processor.stop_processing()
         print("[SYSTEM] Exiting...")
+    finally:
+        write_metrics()
 
 if __name__ == "__main__":
     main()
@@ -12,7 +12,7 @@ from src.plate_detector import PlateDetector
 from src.ocr import read_plate
 from src.reporter import generate_report
 
-from sort.sort import Sort
+from core.sort import Sort
 
 # =========================
 # CONFIG
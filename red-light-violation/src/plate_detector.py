@@ -1,9 +1,9 @@
-from ultralytics import YOLO
+from core.model_registry import get_model as load_model
 import cv2
 
 class PlateDetector:
     def __init__(self, model_path="models/license_plate.pt"):
-        self.model = YOLO(model_path)
+        self.model = load_model(model_path)
 
     def detect_and_crop(self, car_img, save_path):
         results = self.model(car_img, conf=0.4, verbose=False)[0]
@@ -1,9 +1,9 @@
-from ultralytics import YOLO
+from core.model_registry import get_model as load_model
 import numpy as np
 
 class VehicleDetector:
     def __init__(self, model_path="models/yolov8n.pt"):
-        self.model = YOLO(model_path)
+        self.model = load_model(model_path)
         self.vehicle_classes = [2, 3, 5, 7]  # car, bike, bus, truck
 
     def detect(self, frame):
@@ -0,0 +1,81 @@
+"""
+Benchmark the base model on each inference backend (core/model_backend.py).
+
+Runs the same sampled frames through torch / ONNX Runtime / OpenVINO (FP32 and,
+with --int8, INT8) using the pipeline's own preprocessing, and reports load
+time, per-frame latency percentiles and throughput.
+
+Usage:
+    python scripts/benchmark_backends.py --source data/test_video.mp4
+    python scripts/benchmark_backends.py --weights yolo11n.pt --backends torch openvino --int8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from core.frame_context import FrameContext, run_model
+from core.metrics import percentile
+from core.model_backend import BACKENDS, export_model, load_model, sample_frames
+
+
+def benchmark(model, frames, imgsz, warmup=3):
+    inputs = [FrameContext(frame).model_input(imgsz) for frame in frames]
+    for model_input in inputs[:warmup]:
+        run_model(model, [model_input])
+
+    latencies = []
+    for model_input in inputs:
+        start = time.perf_counter()
+        run_model(model, [model_input])
+        latencies.append((time.perf_counter() - start) * 1000.0)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-backend latency of a YOLO model")
+    parser.add_argument("--weights", default=settings.YOLO_MODEL_PATH)
+    parser.add_argument("--source", required=True, help="Video to sample frames from")
+    parser.add_argument("--frames", type=int, default=50)
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--int8", action="store_true", help="Also benchmark INT8 exports (onnx / openvino)")
+    args = parser.parse_args()
+
+    frames = sample_frames(args.source, args.frames)
+    if not frames:
+        print(f"[ERROR] Could not read frames from {args.source}")
+        return
+
+    runs = [(backend, False) for backend in args.backends]
+    if args.int8:
+        runs += [(backend, True) for backend in args.backends if backend != "torch"]
+
+    rows = []
+    for backend, int8 in runs:
+        label = f"{backend}{'-int8' if int8 else ''}"
+        try:
+            if backend != "torch":
+                export_model(args.weights, backend, int8, calibration_frames=frames, imgsz=args.imgsz)
+            start = time.perf_counter()
+            model = load_model(args.weights, backend=backend, int8=int8)
+            load_s = time.perf_counter() - start
+            latencies = benchmark(model, frames, args.imgsz)
+        except Exception as e:
+            print(f"[ERROR] {label}: {e}")
+            continue
+        latencies.sort()
+        mean = sum(latencies) / len(latencies)
+        rows.append((label, load_s, percentile(latencies, 50), percentile(latencies, 95), 1000.0 / mean))
+
+    print(f"\n{os.path.basename(args.weights)} @ {args.imgsz} on {len(frames)} frames")
+    print(f"{'backend':<16}{'load (s)':>10}{'p50 (ms)':>10}{'p95 (ms)':>10}{'fps':>8}")
+    for label, load_s, p50, p95, fps in rows:
+        print(f"{label:<16}{load_s:>10.2f}{p50:>10.1f}{p95:>10.1f}{fps:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
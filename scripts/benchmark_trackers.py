@@ -0,0 +1,113 @@
+"""
+Compare tracker backends (core/tracking.py) on the same clip.
+
+Base detection runs once; the cached detections are then fed to every
+tracker, so only tracking cost is timed. Without ground truth, ID switches
+are estimated: a confirmed track whose box overlaps (IoU > 0.5) the previous
+frame's box of a different track that has just disappeared counts as one.
+
+Usage:
+    python scripts/benchmark_trackers.py --source data/test_video.mp4
+    python scripts/benchmark_trackers.py --source clip.mp4 --frames 600 --trackers bytetrack
+"""
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from core.detection import VehicleDetector
+from core.metrics import percentile
+from core.model_registry import get_model
+from core.tracking import TRACKERS, build_tracker, iou_matrix
+
+
+def read_clip(source, limit):
+    cap = cv2.VideoCapture(source)
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def id_switches(history):
+    """Estimated ID switches over [(ids, ltrb array)] per frame (confirmed tracks only)."""
+    switches = 0
+    for (prev_ids, prev_boxes), (ids, boxes) in zip(history, history[1:]):
+        if not len(prev_ids) or not len(ids):
+            continue
+        iou = iou_matrix(boxes, prev_boxes)
+        best = iou.argmax(axis=1)
+        for i, track_id in enumerate(ids):
+            previous = prev_ids[best[i]]
+            if iou[i, best[i]] > 0.5 and previous != track_id and previous not in ids:
+                switches += 1
+    return switches
+
+
+def run(name, frames, detections):
+    tracker = build_tracker(name)
+    latencies, history = [], []
+    lengths = {}
+    for frame, dets in zip(frames, detections):
+        start = time.perf_counter()
+        tracks = tracker.update(dets, frame=frame)
+        latencies.append((time.perf_counter() - start) * 1000.0)
+        confirmed = [t for t in tracks if t.is_confirmed()]
+        for t in confirmed:
+            lengths[t.track_id] = lengths.get(t.track_id, 0) + 1
+        history.append(([t.track_id for t in confirmed],
+                        np.array([t.to_ltrb() for t in confirmed]).reshape(-1, 4)))
+    latencies.sort()
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "ids": len(lengths),
+        "switches": id_switches(history),
+        "mean_length": sum(lengths.values()) / max(len(lengths), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ID switches and latency per tracker backend")
+    parser.add_argument("--source", required=True, help="Video clip")
+    parser.add_argument("--weights", default=settings.YOLO_MODEL_PATH)
+    parser.add_argument("--frames", type=int, default=300, help="Frames to use from the start of the clip")
+    parser.add_argument("--trackers", nargs="+", choices=list(TRACKERS), default=list(TRACKERS))
+    args = parser.parse_args()
+
+    frames = read_clip(args.source, args.frames)
+    if not frames:
+        print(f"[ERROR] Could not read frames from {args.source}")
+        return
+
+    print(f"[Benchmark] Detecting on {len(frames)} frames...")
+    detector = VehicleDetector.from_settings(get_model(args.weights))
+    detections = []
+    for i in range(0, len(frames), 8):
+        detections.extend(detector.detect_batch(frames[i:i + 8]))
+
+    print(f"\n{os.path.basename(args.source)}: {len(frames)} frames, "
+          f"{sum(len(d) for d in detections)} detections")
+    print(f"{'tracker':<12}{'p50 (ms)':>10}{'p95 (ms)':>10}{'fps':>8}{'IDs':>6}{'ID sw':>7}{'len':>7}")
+    for name in args.trackers:
+        try:
+            r = run(name, frames, detections)
+        except Exception as e:
+            print(f"[ERROR] {name}: {e}")
+            continue
+        print(f"{name:<12}{r['p50']:>10.2f}{r['p95']:>10.2f}{1000.0 / max(r['p50'], 1e-6):>8.0f}"
+              f"{r['ids']:>6}{r['switches']:>7}{r['mean_length']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,8 @@
+"""
+Reference SORT (filterpy), as shipped in red-light-violation/sort/sort.py
+before the subprojects moved to the shared core/sort.py. Kept unchanged as
+the baseline of tests/test_sort.py.
+"""
 import numpy as np
 from filterpy.kalman import KalmanFilter
 
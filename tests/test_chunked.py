@@ -0,0 +1,71 @@
+"""
+Chunked analysis merge test (core/chunked.py)
+Two segments sharing a 10-frame overlap: events in the warm-up window are
+dropped, local track IDs are stitched to the previous segment's global IDs,
+and an alert repeated just after the boundary is not reported twice.
+
+Run with pytest or directly: python tests/test_chunked.py
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.chunked import SegmentResult, merge_segments, plan_segments
+from core.events import Event
+
+OVERLAP = 10
+
+
+def _event(event_type, frame_id, track_id):
+    return Event(event_type=event_type, metadata={"frame_id": frame_id, "track_id": track_id})
+
+
+def _window(frames, tracks):
+    """frame_id -> [(track_id, ltrb)] with each track moving 2 px per frame"""
+    return {f: [(tid, (x + 2 * f, 100, x + 2 * f + 40, 130)) for tid, x in tracks] for f in frames}
+
+
+def _segments():
+    # Segment 0 owns frames 1-100, segment 1 owns 101-200 (warm-up 91-100)
+    first = SegmentResult(index=0, start=0, end=100, events=[
+        _event("OVERSPEED", 95, 7),
+        _event("WRONG_WAY", 50, 3),
+    ], tail_tracks=_window(range(91, 101), [(7, 0), (3, 400)]))
+    # Same vehicles get local IDs 1 and 2 in segment 1; track 4 is new
+    second = SegmentResult(index=1, start=100, end=200, events=[
+        _event("OVERSPEED", 96, 1),    # Warm-up window: owned by segment 0
+        _event("OVERSPEED", 103, 1),   # Repeat right after the boundary
+        _event("WRONG_WAY", 150, 2),   # Well after the boundary: a new alert
+        _event("OVERSPEED", 104, 4),
+    ], head_tracks=_window(range(91, 101), [(1, 0), (2, 400)]))
+    return [second, first]
+
+
+def test_merge_drops_warmup_and_boundary_repeats():
+    events = merge_segments(_segments(), OVERLAP)
+    frames = [e.metadata["frame_id"] for e in events]
+    assert frames == [50, 95, 104, 150]
+
+
+def test_merge_stitches_track_ids():
+    events = merge_segments(_segments(), OVERLAP)
+    by_frame = {e.metadata["frame_id"]: e.metadata["track_id"] for e in events}
+    first_ids = {by_frame[50], by_frame[95]}
+    assert by_frame[150] == by_frame[50]       # Local 2 in segment 1 is the same wrong-way vehicle
+    assert by_frame[104] not in first_ids      # New vehicle gets a new global ID
+    assert len(first_ids) == 2
+
+
+def test_plan_segments_cover_video():
+    segments = plan_segments(1000, 4, OVERLAP)
+    assert [s for _, s, _ in segments] == [0, 250, 500, 750]
+    assert [e for _, _, e in segments] == [250, 500, 750, 1000]
+    assert [w for w, _, _ in segments] == [0, 240, 490, 740]
+
+
+if __name__ == "__main__":
+    test_merge_drops_warmup_and_boundary_repeats()
+    test_merge_stitches_track_ids()
+    test_plan_segments_cover_video()
+    print("OK")
@@ -64,26 +64,33 @@ def main():
     processor.start_processing()
     
     frame_count = 0
+    missed_frames = 0
+    last_seq = 0
     last_frame_time = time.time()
     timeout = 5.0  # 5 seconds without frames = timeout
     
+    def write_new_frames():
+        # Read every frame published since the last one we wrote (zero-copy views)
+        nonlocal frame_count, missed_frames, last_seq
+        frames = processor.get_frames_since(last_seq)
+        for seq, frame in frames:
+            missed_frames += seq - last_seq - 1
+            writer.write(frame)
+            last_seq = seq
+            frame_count += 1
+            
+            # Progress (every 30 frames)
+            if frame_count % 30 == 0:
+                status = processor.get_status()
+                print(f"\rFrame: {status.current_frame}/{status.total_frames} | "
+                      f"Events: {status.events_detected} | "
+                      f"Vehicles: {len(processor.registry.vehicles)}", end="", flush=True)
+        return len(frames)
+    
     try:
         while processor.status.is_processing:
-            # Get processed frame from queue
-            frame = processor.get_frame()
-            
-            if frame is not None:
-                # Write to output
-                writer.write(frame)
-                frame_count += 1
+            if write_new_frames():
                 last_frame_time = time.time()
-                
-                # Progress (every 30 frames)
-                if frame_count % 30 == 0:
-                    status = processor.get_status()
-                    print(f"\rFrame: {status.current_frame}/{status.total_frames} | "
-                          f"Events: {status.events_detected} | "
-                          f"Vehicles: {len(processor.registry.vehicles)}", end="", flush=True)
             else:
                 # No frame available, check timeout
                 if time.time() - last_frame_time > timeout:
@@ -95,6 +102,9 @@ def main():
             status = processor.get_status()
             if not status.is_processing:
                 break
+        
+        # Frames published after the last poll
+        write_new_frames()
                 
     except KeyboardInterrupt:
         print("\n[Stopped] User interrupted.")
@@ -106,6 +116,8 @@ def main():
     print(f"   Output: {os.path.abspath(output_path)}")
     print(f"   Total Events: {processor.status.events_detected}")
     print(f"   Total Frames Processed: {frame_count}")
+    if missed_frames:
+        print(f"   Frames Overwritten Before Writing: {missed_frames}")
     
     # Registry stats
     print(f"\n📊 Vehicle Registry Stats:")
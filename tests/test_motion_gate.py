@@ -0,0 +1,53 @@
+"""
+Motion gate test (core/motion_gate.py)
+A repeated frame is a duplicate, sensor noise is static, a small moving
+vehicle is not, and max_skip forces a frame through detection.
+
+Run with pytest or directly: python tests/test_motion_gate.py
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.motion_gate import DUPLICATE, STATIC, MotionGate
+
+
+def _road(seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(60, 90, size=(720, 1280, 3), dtype=np.uint8)
+
+
+def test_duplicate_and_static_frames_are_gated():
+    gate = MotionGate()
+    frame = _road()
+    assert gate.check(frame) is None          # First frame becomes the reference
+    assert gate.check(frame.copy()) == DUPLICATE
+    noisy = np.clip(frame.astype(np.int16) + 2, 0, 255).astype(np.uint8)
+    assert gate.check(noisy) == STATIC
+
+
+def test_small_vehicle_passes():
+    gate = MotionGate()
+    frame = _road()
+    gate.check(frame)
+    moved = frame.copy()
+    moved[400:440, 600:680] = 255             # ~0.3% of the frame
+    assert gate.check(moved) is None
+
+
+def test_max_skip_forces_detection():
+    gate = MotionGate(max_skip=3)
+    frame = _road()
+    results = [gate.check(frame) for _ in range(6)]
+    assert results == [None, DUPLICATE, DUPLICATE, DUPLICATE, None, DUPLICATE]
+    assert MotionGate(enabled=False).check(frame) is None
+
+
+if __name__ == "__main__":
+    test_duplicate_and_static_frames_are_gated()
+    test_small_vehicle_passes()
+    test_max_skip_forces_detection()
+    print("OK")
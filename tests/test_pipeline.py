@@ -0,0 +1,48 @@
+"""
+Pipeline end-of-stream regression test (core/pipeline.py)
+A fast source finishing while a slow downstream stage keeps its inbox full
+must still deliver END_OF_STREAM, so the sink drains and on_complete fires.
+
+Run with pytest or directly: python tests/test_pipeline.py
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.pipeline import Pipeline
+
+
+def test_end_of_stream_with_full_queue():
+    frames = iter(range(30))
+    received = []
+    done = threading.Event()
+
+    def source():
+        return next(frames, None)
+
+    def slow(item):
+        time.sleep(0.05)  # Much slower than the source: its inbox stays full
+        return item
+
+    pipeline = Pipeline([
+        ("decode", source),
+        ("slow", slow),
+        ("sink", received.append),
+    ], queue_size=2, on_complete=done.set)
+    # Short poll interval: a single timed put of the sentinel would give up
+    for stage in pipeline.stages:
+        stage.poll_interval = 0.01
+    pipeline.start()
+
+    assert done.wait(timeout=10), "on_complete never fired (END_OF_STREAM lost)"
+    assert received == list(range(30))
+    pipeline.stop(timeout=1)
+    assert not pipeline.is_running()
+
+
+if __name__ == "__main__":
+    test_end_of_stream_with_full_queue()
+    print("OK")
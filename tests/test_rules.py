@@ -0,0 +1,90 @@
+"""
+Rule engine test (core/rules.py, core/vehicle_registry.py)
+Checks the compiled lookup table (priority order, emergency override) and
+the event-driven evaluation: one alert per vehicle per cooldown, re-fired by
+the cooldown timer without new updates, nothing for expired vehicles.
+
+Run with pytest or directly: python tests/test_rules.py
+"""
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from core.clock import Clock
+from core.rules import EMERGENCY, WRONG_WAY, OVERSPEEDING, RuleSet
+from core.vehicle_registry import VehicleRegistry
+
+
+def _registry():
+    clock = Clock(1000.0)
+    registry = VehicleRegistry(clock=clock)
+    registry.update_vehicles([1, 2], [[100, 100, 40, 30], [300, 100, 40, 30]])
+    return registry, clock
+
+
+def _types(events):
+    return [e["type"] for e in events]
+
+
+def test_rule_table_priority_and_override():
+    rules = RuleSet.compile(settings.RULES)
+    assert rules.match(0) == ()
+    assert [r.event for r in rules.match(WRONG_WAY | OVERSPEEDING)] == ["WRONG_WAY", "OVERSPEED"]
+    assert [r.event for r in rules.match(EMERGENCY | WRONG_WAY | OVERSPEEDING)] == ["EMERGENCY_VEHICLE"]
+
+
+def test_alert_fires_once_per_cooldown():
+    registry, clock = _registry()
+    registry.update_speed(1, 120.0)
+    events = registry.evaluate_rules()
+    assert _types(events) == ["OVERSPEED"] and events[0]["metadata"]["track_id"] == 1
+    assert registry.evaluate_rules() == []  # Not dirty any more
+
+    clock.advance(1001.0)
+    registry.update_vehicles([1, 2], [[110, 100, 40, 30], [300, 100, 40, 30]])
+    registry.update_speed(1, 125.0)
+    assert registry.evaluate_rules() == []  # Dirty, but still cooling down
+
+    # The cooldown timer brings it back without any new update
+    clock.advance(1000.0 + registry.alert_cooldown)
+    registry.update_vehicles([1, 2], [[120, 100, 40, 30], [300, 100, 40, 30]])
+    assert _types(registry.evaluate_rules()) == ["OVERSPEED"]
+
+
+def test_speed_below_limit_is_silent():
+    registry, _ = _registry()
+    registry.update_speed(2, registry.speed_limit - 1)
+    assert registry.evaluate_rules() == []
+
+
+def test_emergency_overrides_other_rules():
+    registry, _ = _registry()
+    registry.update_speed(1, 120.0)
+    registry.update_wrong_way(1, True, "Lane 1")
+    registry.mark_emergency(1, "Ambulance")
+    registry.update_wrong_way(2, True, "Lane 2")
+    events = registry.evaluate_rules()
+    assert _types(events) == ["EMERGENCY_VEHICLE", "WRONG_WAY"]
+    assert events[1]["metadata"] == {"track_id": 2, "lane": "Lane 2"}
+
+
+def test_expired_vehicle_drops_out():
+    registry, clock = _registry()
+    registry.update_speed(1, 120.0)
+    assert len(registry.evaluate_rules()) == 1
+
+    clock.advance(1000.0 + max(registry.alert_cooldown, registry.max_age) + 1)
+    assert sorted(registry.cleanup()) == [1, 2]
+    assert registry.evaluate_rules() == []  # Its pending cooldown timer is ignored
+    assert 1 not in registry
+
+
+if __name__ == "__main__":
+    test_rule_table_priority_and_override()
+    test_alert_fires_once_per_cooldown()
+    test_speed_below_limit_is_silent()
+    test_emergency_overrides_other_rules()
+    test_expired_vehicle_drops_out()
+    print("OK")
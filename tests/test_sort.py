@@ -0,0 +1,62 @@
+"""
+Shared SORT regression test (core/sort.py)
+The vectorised tracker must reproduce the per-subproject filterpy SORT it
+replaced (tests/reference_sort.py): same track ids, row order and boxes on
+scenes with motion noise and missed detections.
+
+Run with pytest or directly: python tests/test_sort.py
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from core.sort import Sort
+
+
+def _scene(seed, objects=12, frames=300, miss_rate=0.1):
+    """Per frame: (N, 5) detections of boxes moving at constant speed, with noise and misses"""
+    rng = np.random.default_rng(seed)
+    position = rng.uniform(0, 1500, (objects, 2))
+    velocity = rng.uniform(-8, 8, (objects, 2))
+    size = rng.uniform(40, 120, (objects, 2))
+    for _ in range(frames):
+        position += velocity
+        boxes = np.hstack([position, position + size]) + rng.normal(0, 2, (objects, 4))
+        seen = rng.random(objects) > miss_rate
+        yield np.hstack([boxes, np.ones((objects, 1))])[seen]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_matches_reference_sort(seed):
+    reference_sort = pytest.importorskip("reference_sort", reason="needs filterpy")
+    reference_sort.KalmanBoxTracker.count = 0  # Ids restart at 0 like Sort.next_id
+    reference, shared = reference_sort.Sort(), Sort()
+
+    for frame, dets in enumerate(_scene(seed)):
+        expected = reference.update(dets.copy())
+        tracks = shared.update(dets.copy())
+        assert tracks.shape == expected.shape, f"frame {frame}"
+        np.testing.assert_allclose(tracks, expected, atol=1e-6, err_msg=f"frame {frame}")
+
+
+def test_empty_frames_age_out_tracks():
+    tracker = Sort(max_age=2, min_hits=1)
+    dets = np.array([[10, 10, 50, 50, 0.9]])
+    assert tracker.update(dets)[:, 4].tolist() == [0]
+    for _ in range(3):
+        assert len(tracker.update(np.empty((0, 5)))) == 0
+    assert len(tracker) == 0
+    tracker.update(dets)
+    assert tracker.ids.tolist() == [1]  # A new track, not the expired one
+
+
+if __name__ == "__main__":
+    for seed in range(5):
+        test_matches_reference_sort(seed)
+    test_empty_frames_age_out_tracks()
+    print("OK")
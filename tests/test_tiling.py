@@ -0,0 +1,61 @@
+"""
+Tiled inference merge test (core/tiling.py)
+Cross-tile NMS must drop a vehicle cut by a tile edge (low IoU, high
+intersection-over-smaller) but keep a smaller vehicle of another class that
+sits inside a bigger box.
+
+Run with pytest or directly: python tests/test_tiling.py
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.tiling import TilingConfig, merge_boxes
+
+CAR, MOTORCYCLE, BUS = 2, 3, 5
+
+
+def test_tile_edge_duplicate_is_merged():
+    full = [100, 100, 200, 160]
+    half = [150, 100, 200, 160]  # Same car, cut by a tile edge: IoU 0.5, inside the full box
+    xyxy = np.array([half, full], dtype=np.float32)
+    confs = np.array([0.6, 0.9])
+    keep = merge_boxes(xyxy, confs, 0.6, np.array([CAR, CAR]))
+    assert keep.tolist() == [1]  # Highest confidence survives
+
+
+def test_other_class_inside_box_is_kept():
+    bus = [0, 0, 400, 200]
+    motorcycle = [20, 120, 60, 190]  # Entirely inside the bus box
+    xyxy = np.array([bus, motorcycle], dtype=np.float32)
+    confs = np.array([0.9, 0.7])
+    assert merge_boxes(xyxy, confs, 0.6, np.array([BUS, MOTORCYCLE])).tolist() == [0, 1]
+    # Without classes the motorcycle is suppressed (class-agnostic merge)
+    assert merge_boxes(xyxy, confs, 0.6).tolist() == [0]
+
+
+def test_separate_boxes_kept_in_confidence_order():
+    xyxy = np.array([[0, 0, 10, 10], [100, 100, 120, 120], [50, 50, 60, 60]], dtype=np.float32)
+    confs = np.array([0.5, 0.9, 0.7])
+    assert merge_boxes(xyxy, confs, 0.6, np.array([CAR, CAR, CAR])).tolist() == [1, 2, 0]
+    assert merge_boxes(np.empty((0, 4)), np.empty(0), 0.6).tolist() == []
+
+
+def test_tiles_cover_far_field():
+    config = TilingConfig(far_field=(0.25, 0.25, 0.75, 0.5), tile_size=640, overlap=0.2)
+    tiles = config.tiles((1080, 1920, 3), hires_size=1280)
+    extent = 640 * 1920 // 1280  # A tile spans 960 frame pixels at 1280 scale
+    assert tiles and all(x2 - x1 <= extent and y2 - y1 <= extent for x1, y1, x2, y2 in tiles)
+    assert min(t[0] for t in tiles) == 480 and max(t[2] for t in tiles) == 1440
+    assert min(t[1] for t in tiles) == 270 and max(t[3] for t in tiles) == 540
+
+
+if __name__ == "__main__":
+    test_tile_edge_duplicate_is_merged()
+    test_other_class_inside_box_is_kept()
+    test_separate_boxes_kept_in_confidence_order()
+    test_tiles_cover_far_field()
+    print("OK")
@@ -3,7 +3,7 @@ import numpy as np
 
 from src.video_reader import VideoReader
 from src.helmet_detector import HelmetDetector
-from sort.sort import Sort
+from core.sort import Sort
 
 # =========================
 # CONFIG
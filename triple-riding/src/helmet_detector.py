@@ -1,8 +1,8 @@
-from ultralytics import YOLO
+from core.model_registry import get_model as load_model
 
 class HelmetDetector:
     def __init__(self, model_path="models/yolov8n.pt", conf=0.4):
-        self.model = YOLO(model_path)
+        self.model = load_model(model_path)
         self.conf = conf
 
         # COCO classes
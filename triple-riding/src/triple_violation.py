@@ -4,7 +4,7 @@ import numpy as np
 from src.video_reader import VideoReader
 from src.helmet_detector import HelmetDetector
 from src.triple_violation import TripleRidingChecker
-from sort.sort import Sort
+from core.sort import Sort
 
 # =========================
 # CONFIG